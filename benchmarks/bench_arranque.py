@@ -0,0 +1,109 @@
+"""
+Benchmark del tiempo de arranque de la interfaz gráfica.
+
+Lanza la aplicación en procesos nuevos y mide el tiempo desde que se crea
+el proceso hasta que la primera ventana está dibujada:
+
+- en frío: sin bytecode compilado (caché de .pyc vacía)
+- en caliente: con el bytecode ya compilado por una ejecución anterior
+
+Con --sin-ventana solo se mide hasta terminar de importar la aplicación,
+lo que permite usarlo en máquinas sin pantalla. Si se indica un
+presupuesto, termina con código 1 cuando el arranque en caliente lo supera.
+
+Uso:
+    python benchmarks/bench_arranque.py [--repeticiones 5] [--presupuesto 1.5] [--sin-ventana]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Código que corre en el proceso medido: imprime el instante (time.time)
+# en que la ventana quedó dibujada, o en que terminó de importar
+HIJO_VENTANA = """
+import sys, time
+sys.path.insert(0, {src!r})
+import tkinter as tk
+from app import CalorimetriaApp
+root = tk.Tk()
+CalorimetriaApp(root)
+root.update()
+print(time.time())
+print(sorted(m for m in ('matplotlib', 'grapher', 'despejador') if m in sys.modules))
+root.destroy()
+"""
+
+HIJO_IMPORTACION = """
+import sys, time
+sys.path.insert(0, {src!r})
+import app
+print(time.time())
+print(sorted(m for m in ('matplotlib', 'grapher', 'despejador') if m in sys.modules))
+"""
+
+
+def medir(codigo, entorno):
+    """Devuelve (segundos hasta la primera ventana, módulos pesados cargados)."""
+    inicio = time.time()
+    salida = subprocess.run(
+        [sys.executable, '-c', codigo], env=entorno,
+        capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    return float(salida[0]) - inicio, salida[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--presupuesto', type=float,
+                        help="Segundos máximos para el arranque en caliente")
+    parser.add_argument('--sin-ventana', action='store_true',
+                        help="Medir solo la importación de la aplicación")
+    parser.add_argument('--json', help="Guardar los resultados en este archivo")
+    args = parser.parse_args()
+
+    codigo = (HIJO_IMPORTACION if args.sin_ventana else HIJO_VENTANA).format(src=SRC)
+
+    frio, caliente = [], []
+    for _ in range(args.repeticiones):
+        with tempfile.TemporaryDirectory() as cache_pyc:
+            # Caché de bytecode vacía y propia de esta repetición
+            entorno = dict(os.environ, PYTHONPYCACHEPREFIX=cache_pyc)
+            t, cargados = medir(codigo, entorno)
+            frio.append(t)
+            t, _ = medir(codigo, entorno)
+            caliente.append(t)
+
+    resultados = {
+        'modo': 'importacion' if args.sin_ventana else 'primera_ventana',
+        'frio_s': statistics.median(frio),
+        'caliente_s': statistics.median(caliente),
+        'frio_muestras': frio,
+        'caliente_muestras': caliente,
+        'modulos_pesados_cargados': cargados,
+        'presupuesto_s': args.presupuesto,
+    }
+    print(f"Arranque en frío     : {resultados['frio_s']:.3f} s (mediana de {args.repeticiones})")
+    print(f"Arranque en caliente : {resultados['caliente_s']:.3f} s")
+    print(f"Módulos pesados cargados al arrancar: {cargados}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2)
+
+    if args.presupuesto is not None and resultados['caliente_s'] > args.presupuesto:
+        print(f"Supera el presupuesto de {args.presupuesto:.3f} s")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
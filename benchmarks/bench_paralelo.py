@@ -0,0 +1,62 @@
+"""
+Benchmark de escalado del ejecutor paralelo.
+
+Mide el tiempo de EjecutorParalelo.calcular_calor con 1 a N procesos
+sobre un lote aleatorio con todos los materiales mezclados.
+
+Uso:
+    python benchmarks/bench_paralelo.py [--filas 5000000] [--max-trabajadores N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from calculator import CalculadoraCalor  # noqa: E402
+from constants import CONSTANTES_MATERIALES  # noqa: E402
+from paralelo import EjecutorParalelo  # noqa: E402
+
+
+def generar_lote(filas, semilla=0):
+    rng = np.random.default_rng(semilla)
+    nombres = np.array(list(CONSTANTES_MATERIALES))
+    materiales = nombres[rng.integers(0, len(nombres), filas)]
+    masas = rng.uniform(0.1, 10, filas)
+    temps_iniciales = rng.uniform(-50, 1500, filas)
+    temps_finales = rng.uniform(-50, 2000, filas)
+    return materiales, masas, temps_iniciales, temps_finales
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filas', type=int, default=5_000_000)
+    parser.add_argument('--tam-bloque', type=int, default=250_000)
+    parser.add_argument('--max-trabajadores', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    lote = generar_lote(args.filas)
+
+    inicio = time.perf_counter()
+    referencia, _ = CalculadoraCalor().calcular_calor_lote_agrupado(*lote)
+    t_serie = time.perf_counter() - inicio
+    print(f"{'procesos':>9} {'tiempo (s)':>11} {'filas/s':>14} {'aceleración':>12}")
+    print(f"{'serie':>9} {t_serie:11.3f} {args.filas / t_serie:14,.0f} {1:12.2f}")
+
+    for trabajadores in range(1, args.max_trabajadores + 1):
+        with EjecutorParalelo(trabajadores=trabajadores, tam_bloque=args.tam_bloque) as ejecutor:
+            # Arranque de todos los procesos fuera de la medición
+            ejecutor.calentar()
+            inicio = time.perf_counter()
+            Q = ejecutor.calcular_calor(*lote)
+            t = time.perf_counter() - inicio
+        assert np.allclose(Q, referencia)
+        print(f"{trabajadores:>9} {t:11.3f} {args.filas / t:14,.0f} {t_serie / t:12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""
+Suite de benchmarks de las rutas críticas de la calculadora.
+
+Mide calcular_calor_total (agua y otro material, con todas las fases y sin
+cambios de fase), formatear_resultados, las fórmulas del despejador, los
+cálculos por lotes y el dibujo de GraficadorCalor con el backend Agg (sin
+pantalla). Cada resultado se guarda en JSON con su umbral de regresión, y
+'comparar' informa qué casos empeoraron entre dos ejecuciones.
+
+Algunos casos se vigilan además contra una referencia medida en la misma
+corrida (GUARDIAS): calcular_calor_total contra el cálculo de la primera
+versión (calculo_original.py). 'correr' termina con código 1 si un caso
+supera a su referencia en más que el margen.
+
+Uso:
+    python benchmarks/bench_suite.py correr [-o resultados.json] [--filtro texto]
+    python benchmarks/bench_suite.py comparar base.json nuevo.json [--umbral 0.10]
+
+'comparar' termina con código 1 si algún caso supera su umbral.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import matplotlib  # noqa: E402
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+
+import calculo_original  # noqa: E402
+import despejes  # noqa: E402
+import grapher  # noqa: E402
+from calculator import CalculadoraCalor  # noqa: E402
+from constants import CONSTANTES_MATERIALES  # noqa: E402
+
+VERSION_FORMATO = 1
+
+# Umbral de regresión por defecto: 10 % más lento que la base
+UMBRAL_POR_DEFECTO = 0.10
+
+# Tiempo mínimo de cada muestra; se repite la función hasta alcanzarlo
+DURACION_MUESTRA = 0.05
+
+# (caso, referencia, margen): el mínimo del caso no puede superar al de la
+# referencia medida en la misma corrida multiplicado por 1 + margen. La
+# referencia son ramas escritas a mano solo para el agua; el recorrido
+# genérico de la tabla queda a la par, y el margen cubre el ruido
+GUARDIAS = [
+    ('calor_total/agua_todas_las_fases', 'referencia/calor_total_original', 0.20),
+]
+
+# Muestras cortas (unos 2,5 ms) de cada lado de una guardia
+MUESTRAS_GUARDIA = 200
+
+
+def _sin_ventana(clase):
+    """Subclase de un gráfico de grapher que dibuja en un lienzo Agg."""
+    class SinVentana(clase):
+        def _crear_canvas(self, frame_grafico):
+            canvas = FigureCanvasAgg(self.figura)
+            canvas.draw_idle = canvas.draw  # Agg no tiene bucle de eventos
+            return canvas
+    return SinVentana
+
+
+class _Frame:
+    """Sustituto de un frame de tkinter: solo guarda el gráfico asociado."""
+
+
+def casos():
+    """
+    Arma los casos a medir.
+
+    Returns:
+        list: Tuplas (nombre, funcion_sin_argumentos, umbral)
+    """
+    calc = CalculadoraCalor()
+    agua = 'Agua (H₂O)'
+    const_agua = CONSTANTES_MATERIALES[agua]
+    Q_total, resultados, temps, energias = calc.calcular_calor_total(agua, 1, -20, 120)
+
+    rng = np.random.default_rng(0)
+    masas = rng.uniform(0.1, 10, 100_000)
+    Ti = rng.uniform(-50, 150, 100_000)
+    Tf = rng.uniform(-50, 150, 100_000)
+    eje = np.linspace(-50, 150, 2000)
+
+    Diagrama = _sin_ventana(grapher.DiagramaTemperaturaEnergia)
+    Mapa = _sin_ventana(grapher.MapaBarrido)
+    diagrama = Diagrama(_Frame())
+    diagrama.actualizar(temps, energias)
+    diagrama.canvas.draw()
+    mapa = Mapa(_Frame())
+    Q_malla = calc.calcular_barrido_temperaturas(agua, 1, eje, eje)
+
+    def diagrama_nuevo():
+        d = Diagrama(_Frame())
+        d.actualizar(temps, energias)
+        d.canvas.draw()
+
+    return [
+        ('calor_total/agua_todas_las_fases', lambda: calc.calcular_calor_total(agua, 1, -20, 120), None),
+        ('calor_total/agua_sin_cambio_de_fase', lambda: calc.calcular_calor_total(agua, 1, 20, 80), None),
+        ('calor_total/agua_enfriamiento', lambda: calc.calcular_calor_total(agua, 1, 120, -20), None),
+        ('calor_total/aluminio_con_fusion', lambda: calc.calcular_calor_total('Aluminio', 1, 20, 900), None),
+        ('calor_total/aluminio_sin_cambio_de_fase', lambda: calc.calcular_calor_total('Aluminio', 1, 20, 300), None),
+        ('referencia/calor_total_original',
+         lambda: calculo_original.calcular_calor_total(const_agua, 1, -20, 120), None),
+        ('calor_numerico/agua_todas_las_fases', lambda: calc.calcular_calor_numerico(agua, 1, -20, 120), None),
+        ('formatear_resultados/agua_todas_las_fases',
+         lambda: CalculadoraCalor.formatear_resultados(Q_total, resultados), None),
+        ('despeje/masa', lambda: despejes.despejar_masa(41800, 4186, 10), None),
+        ('despeje/calor_especifico', lambda: despejes.despejar_calor_especifico(41800, 1, 10), None),
+        ('despeje/temperatura_final', lambda: despejes.despejar_temperatura_final(41800, 1, 4186, 20), None),
+        ('despeje/temperatura_inicial', lambda: despejes.despejar_temperatura_inicial(41800, 1, 4186, 30), None),
+        ('lote/agua_100k', lambda: calc.calcular_calor_lote(agua, masas, Ti, Tf), None),
+        ('lote/barrido_2000x2000', lambda: calc.calcular_barrido_temperaturas(agua, 1, eje, eje), None),
+        # El dibujo depende más de la máquina: umbral más holgado
+        ('grafico/diagrama_nuevo', diagrama_nuevo, 0.25),
+        ('grafico/diagrama_actualizar', lambda: diagrama.actualizar(temps, energias), 0.25),
+        ('grafico/mapa_barrido', lambda: (mapa.actualizar(eje, eje, Q_malla, 'Tf', 'Ti'),
+                                          mapa.canvas.draw()), 0.25),
+    ]
+
+
+def medir(funcion, repeticiones):
+    """
+    Mide una función con el método de timeit: repite la llamada hasta que
+    cada muestra dure al menos DURACION_MUESTRA.
+
+    Returns:
+        tuple: (segundos por llamada de cada muestra, llamadas por muestra)
+    """
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion >= DURACION_MUESTRA:
+            break
+        llamadas *= 10 if duracion < DURACION_MUESTRA / 10 else 2
+
+    muestras = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        muestras.append((time.perf_counter() - inicio) / llamadas)
+    return muestras, llamadas
+
+
+def _formatear_tiempo(segundos):
+    for unidad, factor in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if segundos >= factor:
+            return f"{segundos / factor:8.3f} {unidad}"
+    return f"{segundos / 1e-9:8.3f} ns"
+
+
+def correr(args):
+    resultados = {}
+    funciones = {}
+    for nombre, funcion, umbral in casos():
+        if args.filtro and args.filtro not in nombre:
+            continue
+        funciones[nombre] = funcion
+        muestras, llamadas = medir(funcion, args.repeticiones)
+        resultados[nombre] = {
+            'mediana_s': statistics.median(muestras),
+            'minimo_s': min(muestras),
+            'muestras_s': muestras,
+            'llamadas_por_muestra': llamadas,
+            'umbral': umbral if umbral is not None else UMBRAL_POR_DEFECTO,
+        }
+        print(f"{nombre:45s} {_formatear_tiempo(resultados[nombre]['mediana_s'])}")
+
+    informe = {
+        'version': VERSION_FORMATO,
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'resultados': resultados,
+    }
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    return 1 if revisar_guardias(funciones) else 0
+
+
+def revisar_guardias(funciones):
+    """
+    Compara cada caso de GUARDIAS con su referencia.
+
+    Se toman muchas muestras cortas del caso y de la referencia, alternadas
+    para que una racha de carga en la máquina afecte a las dos por igual, y
+    se comparan los mínimos.
+
+    Args:
+        funciones (dict): Funciones medidas en esta corrida, por nombre
+
+    Returns:
+        list: Casos que superan a su referencia en más que el margen
+    """
+    superados = []
+    for nombre, referencia, margen in GUARDIAS:
+        if nombre not in funciones or referencia not in funciones:
+            continue
+        minimos = {}
+        for clave in (nombre, referencia):
+            _, llamadas = medir(funciones[clave], 1)
+            minimos[clave] = [float('inf'), max(1, llamadas // 20)]
+        for _ in range(MUESTRAS_GUARDIA):
+            for clave, (minimo, llamadas) in minimos.items():
+                funcion = funciones[clave]
+                inicio = time.perf_counter()
+                for _ in range(llamadas):
+                    funcion()
+                minimos[clave][0] = min(minimo, (time.perf_counter() - inicio) / llamadas)
+        relacion = minimos[nombre][0] / minimos[referencia][0]
+        marca = ''
+        if relacion > 1 + margen:
+            marca = '  REGRESIÓN'
+            superados.append(nombre)
+        print(f"{nombre:45s} {relacion:.2f}× {referencia}{marca}")
+    return superados
+
+
+def comparar(args):
+    with open(args.base, encoding='utf-8') as archivo:
+        base = json.load(archivo)['resultados']
+    with open(args.nuevo, encoding='utf-8') as archivo:
+        nuevo = json.load(archivo)['resultados']
+
+    regresiones = []
+    for nombre in sorted(set(base) | set(nuevo)):
+        if nombre not in base or nombre not in nuevo:
+            print(f"{nombre:45s} {'solo en ' + ('la base' if nombre in base else 'la nueva')}")
+            continue
+        antes = base[nombre]['mediana_s']
+        despues = nuevo[nombre]['mediana_s']
+        cambio = despues / antes - 1
+        umbral = args.umbral if args.umbral is not None else nuevo[nombre].get('umbral', UMBRAL_POR_DEFECTO)
+        marca = ''
+        if cambio > umbral:
+            marca = '  REGRESIÓN'
+            regresiones.append(nombre)
+        elif cambio < -umbral:
+            marca = '  mejora'
+        print(f"{nombre:45s} {_formatear_tiempo(antes)} -> {_formatear_tiempo(despues)} "
+              f"({cambio:+7.1%}){marca}")
+
+    if regresiones:
+        print(f"\n{len(regresiones)} caso(s) superan su umbral de regresión")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    parser_correr = subparsers.add_parser('correr', help="Medir todos los casos")
+    parser_correr.add_argument('-o', '--salida', help="Guardar los resultados en este JSON")
+    parser_correr.add_argument('--repeticiones', type=int, default=7)
+    parser_correr.add_argument('--filtro', help="Medir solo los casos que contengan este texto")
+    parser_correr.set_defaults(funcion=correr)
+
+    parser_comparar = subparsers.add_parser('comparar', help="Comparar dos ejecuciones")
+    parser_comparar.add_argument('base')
+    parser_comparar.add_argument('nuevo')
+    parser_comparar.add_argument('--umbral', type=float,
+                                 help="Umbral común (por defecto, el de cada caso)")
+    parser_comparar.set_defaults(funcion=comparar)
+
+    args = parser.parse_args()
+    return args.funcion(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
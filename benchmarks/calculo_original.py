@@ -0,0 +1,103 @@
+"""
+Cálculo de calor del agua tal como lo hacía la primera versión de la calculadora.
+
+Cada fase se evalúa con ramas escritas a mano y los textos se arman en la
+misma pasada. bench_suite lo mide junto a calcular_calor_total como
+referencia fija: la ruta actual no debe quedar más lenta que esta.
+"""
+
+
+def calcular_agua(masa, Ti, Tf, const_mat, resultados):
+    """Calor del agua con todas las fases, como lo calculaba la versión original."""
+    temperaturas = [Ti]
+    energias = [0]
+    Q_total = 0
+
+    # Fase 1: Calentar hielo (si T < 0)
+    if Ti < 0 and Tf > 0:
+        Q1 = masa * const_mat['c_solido'] * (0 - Ti)
+        resultados.append({
+            'fase': "Calentar Hielo",
+            'formula': f"Q = m · c_hielo · ΔT = {masa} kg · {const_mat['c_solido']} J/(kg·°C) · {(0-Ti):.2f} °C",
+            'valor': Q1,
+            'rango': f"{Ti}°C → 0°C"
+        })
+        Q_total += Q1
+        temperaturas.append(0)
+        energias.append(Q_total)
+    elif Ti < 0 and Tf <= 0:
+        Q1 = masa * const_mat['c_solido'] * (Tf - Ti)
+        resultados.append({
+            'fase': "Calentar/Enfriar Hielo",
+            'formula': f"Q = m · c_hielo · ΔT = {masa} kg · {const_mat['c_solido']} J/(kg·°C) · {(Tf-Ti):.2f} °C",
+            'valor': Q1,
+            'rango': f"{Ti}°C → {Tf}°C"
+        })
+        Q_total += Q1
+        temperaturas.append(Tf)
+        energias.append(Q_total)
+
+    # Fase 2: Fusión (0°C)
+    if Ti <= 0 and Tf > 0:
+        Q2 = masa * const_mat['Lf']
+        resultados.append({
+            'fase': "Fusión del Hielo",
+            'formula': f"Q = m · L_f = {masa} kg · {const_mat['Lf']} J/kg",
+            'valor': Q2,
+            'rango': "0°C (cambio de fase)"
+        })
+        Q_total += Q2
+        temperaturas.append(0)
+        energias.append(Q_total)
+
+    # Fase 3: Calentar agua líquida (0 < T < 100)
+    if Ti < 100 and Tf > 0:
+        T_inicio = max(0, Ti)
+        T_fin = min(100, Tf)
+        if T_fin > T_inicio:
+            Q3 = masa * const_mat['c_liquido'] * (T_fin - T_inicio)
+            resultados.append({
+                'fase': "Calentar Agua Líquida",
+                'formula': f"Q = m · c_agua · ΔT = {masa} kg · {const_mat['c_liquido']} J/(kg·°C) · {(T_fin-T_inicio):.2f} °C",
+                'valor': Q3,
+                'rango': f"{T_inicio}°C → {T_fin}°C"
+            })
+            Q_total += Q3
+            temperaturas.append(T_fin)
+            energias.append(Q_total)
+
+    # Fase 4: Vaporización (100°C)
+    if Ti < 100 and Tf > 100:
+        Q4 = masa * const_mat['Lv']
+        resultados.append({
+            'fase': "Vaporización del Agua",
+            'formula': f"Q = m · L_v = {masa} kg · {const_mat['Lv']} J/kg",
+            'valor': Q4,
+            'rango': "100°C (cambio de fase)"
+        })
+        Q_total += Q4
+        temperaturas.append(100)
+        energias.append(Q_total)
+
+    # Fase 5: Calentar vapor (T > 100)
+    if Tf > 100:
+        T_inicio = max(100, Ti)
+        Q5 = masa * const_mat['c_gas'] * (Tf - T_inicio)
+        resultados.append({
+            'fase': "Calentar Vapor",
+            'formula': f"Q = m · c_vapor · ΔT = {masa} kg · {const_mat['c_gas']} J/(kg·°C) · {(Tf-T_inicio):.2f} °C",
+            'valor': Q5,
+            'rango': f"{T_inicio}°C → {Tf}°C"
+        })
+        Q_total += Q5
+        temperaturas.append(Tf)
+        energias.append(Q_total)
+
+    return Q_total, temperaturas, energias
+
+
+def calcular_calor_total(const_mat, masa, temp_inicial, temp_final):
+    """(Q_total, resultados, temperaturas, energias) como calcular_calor_total."""
+    resultados = []
+    Q_total, temperaturas, energias = calcular_agua(masa, temp_inicial, temp_final, const_mat, resultados)
+    return Q_total, resultados, temperaturas, energias
@@ -0,0 +1,277 @@
+"""
+Estimación de calores específicos y latentes a partir de mediciones.
+
+Cada medición (Q, m, Ti, Tf) de un material con temperaturas de cambio de
+fase conocidas cumple
+
+    Q / m = c_solido·ΔT_solido + Lf·s_fusion + c_liquido·ΔT_liquido
+            + Lv·s_vaporizacion + c_gas·ΔT_gas
+
+donde ΔT_fase es la parte de [Ti, Tf] que cae en cada fase (con signo) y
+s vale ±1 si se cruza el cambio de fase (0 si no). El modelo es lineal en
+las constantes, así que se ajusta por mínimos cuadrados sobre todas las
+mediciones a la vez, con errores estándar e intervalos de confianza t de
+Student. Las constantes que ninguna medición toca no se estiman.
+"""
+
+import argparse
+import csv
+import math
+import sys
+from collections import namedtuple
+from statistics import NormalDist
+
+import numpy as np
+
+
+def _cuantil_t(probabilidad, grados_libertad):
+    """
+    Cuantil de la t de Student.
+    
+    Exacto para 1 y 2 grados de libertad; para más, desarrollo de
+    Cornish-Fisher alrededor de la normal (error relativo < 0.2 % con 3
+    grados y < 1e-5 desde 10).
+    """
+    if grados_libertad == 1:
+        return math.tan(math.pi * (probabilidad - 0.5))
+    if grados_libertad == 2:
+        return (2 * probabilidad - 1) / math.sqrt(2 * probabilidad * (1 - probabilidad))
+    z = NormalDist().inv_cdf(probabilidad)
+    n = grados_libertad
+    return (z
+            + (z**3 + z) / (4 * n)
+            + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * n**2)
+            + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * n**3)
+            + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * n**4))
+
+
+def columnas_modelo(masas, temps_iniciales, temps_finales, T_fusion, T_ebullicion=None):
+    """
+    Matriz de diseño del ajuste: Q = X · constantes.
+    
+    Args:
+        masas, temps_iniciales, temps_finales (array_like): Datos de cada medición
+        T_fusion (float): Temperatura de fusión en °C
+        T_ebullicion (float): Temperatura de ebullición en °C (None = sin fase gaseosa)
+    
+    Returns:
+        tuple: (nombres, X) con nombres de las constantes y X de forma (n, len(nombres))
+    """
+    masas = np.asarray(masas, dtype=float)
+    Ti = np.asarray(temps_iniciales, dtype=float)
+    Tf = np.asarray(temps_finales, dtype=float)
+    
+    transiciones = [T_fusion] if T_ebullicion is None else [T_fusion, T_ebullicion]
+    fases = ['c_solido', 'c_liquido', 'c_gas'][:len(transiciones) + 1]
+    latentes = ['Lf', 'Lv'][:len(transiciones)]
+    limites = [-np.inf] + transiciones + [np.inf]
+    
+    nombres = []
+    columnas = []
+    for k, fase in enumerate(fases):
+        # Mismos recortes que TablaEntalpia.calores_por_fase_lote, con constantes unitarias
+        T_desde, T_hasta = limites[k], limites[k + 1]
+        nombres.append(fase)
+        columnas.append(masas * (np.clip(Tf, T_desde, T_hasta) - np.clip(Ti, T_desde, T_hasta)))
+        if k < len(transiciones):
+            nombres.append(latentes[k])
+            cruce = (Tf > transiciones[k]).astype(float) - (Ti > transiciones[k]).astype(float)
+            columnas.append(masas * cruce)
+    return nombres, np.column_stack(columnas)
+
+
+class AjusteConstantes(namedtuple('AjusteConstantes',
+                                  'valores errores intervalos residuos rmse r2 n grados_libertad '
+                                  'nivel T_fusion T_ebullicion')):
+    """
+    Resultado de ajustar_constantes.
+    
+    valores, errores e intervalos son dicts por constante ('c_solido', 'Lf',
+    ...) con el valor estimado, su error estándar y el intervalo (bajo,
+    alto) al nivel de confianza pedido; solo incluyen las constantes que
+    las mediciones permiten estimar. residuos = Q medido - Q ajustado (J).
+    """
+    
+    __slots__ = ()
+    
+    def a_material(self, base=None):
+        """
+        Entrada compatible con CONSTANTES_MATERIALES.
+        
+        Args:
+            base (dict): Constantes a usar para lo que no se pudo estimar
+        
+        Returns:
+            dict: Constantes del material
+        
+        Raises:
+            ValueError: Si falta alguna constante obligatoria
+        """
+        const_mat = {k: v for k, v in (base or {}).items() if k != 'alias'}
+        const_mat.update(self.valores)
+        const_mat['T_fusion'] = self.T_fusion
+        if self.T_ebullicion is not None:
+            const_mat['T_ebullicion'] = self.T_ebullicion
+        
+        faltantes = [k for k in ('c_solido', 'c_liquido', 'Lf') if k not in const_mat]
+        if faltantes:
+            raise ValueError(f"Las mediciones no permiten estimar: {', '.join(faltantes)}")
+        return const_mat
+
+
+def ajustar_constantes(masas, temps_iniciales, temps_finales, calores, T_fusion,
+                       T_ebullicion=None, nivel=0.95):
+    """
+    Estima calores específicos por fase y calores latentes por mínimos cuadrados.
+    
+    Args:
+        masas (array_like): Masa de cada medición en kg
+        temps_iniciales (array_like): Temperaturas iniciales en °C
+        temps_finales (array_like): Temperaturas finales en °C
+        calores (array_like): Calor medido de cada medición en J
+        T_fusion (float): Temperatura de fusión conocida en °C
+        T_ebullicion (float): Temperatura de ebullición en °C (None = sin fase gaseosa)
+        nivel (float): Nivel de confianza de los intervalos
+    
+    Returns:
+        AjusteConstantes: Constantes estimadas con sus incertidumbres
+    
+    Raises:
+        ValueError: Si los datos no alcanzan para estimar las constantes tocadas
+    """
+    Q = np.asarray(calores, dtype=float)
+    nombres, X = columnas_modelo(masas, temps_iniciales, temps_finales, T_fusion, T_ebullicion)
+    if X.shape[0] != Q.shape[0]:
+        raise ValueError("Todas las mediciones deben tener Q, m, Ti y Tf")
+    validas = np.isfinite(Q) & np.all(np.isfinite(X), axis=1)
+    Q, X = Q[validas], X[validas]
+    
+    # Solo se estiman las constantes que alguna medición toca
+    escalas = np.sqrt(np.einsum('ij,ij->j', X, X))
+    usadas = np.flatnonzero(escalas > 0)
+    n, p = len(Q), len(usadas)
+    if p == 0:
+        raise ValueError("No hay mediciones válidas")
+    if n <= p:
+        raise ValueError(f"Se necesitan más de {p} mediciones para estimar {p} constantes")
+    
+    # Columnas normalizadas: ΔT (decenas de °C) y cruces (±1) tienen escalas muy distintas
+    A = X[:, usadas] / escalas[usadas]
+    coeficientes, _, rango, _ = np.linalg.lstsq(A, Q, rcond=None)
+    if rango < p:
+        raise ValueError("Las mediciones no separan todas las constantes "
+                         "(por ejemplo, todas cruzan la misma fase con el mismo ΔT)")
+    
+    residuos = Q - A @ coeficientes
+    gl = n - p
+    sigma2 = residuos @ residuos / gl
+    covarianza = sigma2 * np.linalg.inv(A.T @ A)
+    valores_ = coeficientes / escalas[usadas]
+    errores_ = np.sqrt(np.diag(covarianza)) / escalas[usadas]
+    t = _cuantil_t(0.5 + nivel / 2, gl)
+    
+    valores, errores, intervalos = {}, {}, {}
+    for j, k in enumerate(usadas):
+        nombre = nombres[k]
+        valores[nombre] = float(valores_[j])
+        errores[nombre] = float(errores_[j])
+        intervalos[nombre] = (float(valores_[j] - t * errores_[j]), float(valores_[j] + t * errores_[j]))
+    
+    total = np.sum((Q - Q.mean()) ** 2)
+    r2 = 1 - residuos @ residuos / total if total > 0 else 1.0
+    return AjusteConstantes(valores, errores, intervalos, residuos, float(np.sqrt(sigma2)),
+                            float(r2), n, gl, nivel, T_fusion, T_ebullicion)
+
+
+def leer_mediciones(ruta):
+    """
+    Lee mediciones de un CSV con columnas Q, masa (o m), temp_inicial (o Ti)
+    y temp_final (o Tf).
+    
+    Returns:
+        tuple: (masas, Ti, Tf, Q) como ndarrays
+    """
+    alias = {'Q': ('Q', 'calor'), 'masa': ('masa', 'm'),
+             'temp_inicial': ('temp_inicial', 'Ti'), 'temp_final': ('temp_final', 'Tf')}
+    with open(ruta, encoding='utf-8', newline='') as archivo:
+        lector = csv.reader(archivo)
+        encabezado = next(lector, [])
+        posiciones = []
+        for campo, nombres in alias.items():
+            posicion = next((encabezado.index(a) for a in nombres if a in encabezado), None)
+            if posicion is None:
+                raise ValueError(f"falta la columna '{campo}'")
+            posiciones.append(posicion)
+        datos = np.array([[fila[p] for p in posiciones] for fila in lector if fila], dtype=float)
+    datos = datos.reshape(-1, 4)
+    return datos[:, 1], datos[:, 2], datos[:, 3], datos[:, 0]
+
+
+def formatear_ajuste(ajuste):
+    """Texto con las constantes estimadas, sus intervalos y la calidad del ajuste."""
+    lineas = [f"{'Constante':12s} {'Valor':>14s} {'Error est.':>12s}   Intervalo {ajuste.nivel:.0%}"]
+    for nombre, valor in ajuste.valores.items():
+        bajo, alto = ajuste.intervalos[nombre]
+        lineas.append(f"{nombre:12s} {valor:14.6g} {ajuste.errores[nombre]:12.4g}   [{bajo:.6g}, {alto:.6g}]")
+    lineas.append(f"Mediciones: {ajuste.n}   RMSE: {ajuste.rmse:.6g} J   R²: {ajuste.r2:.6f}")
+    return "\n".join(lineas)
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py ajustar',
+        description="Estima calores específicos y latentes de un material a partir de mediciones."
+    )
+    parser.add_argument('mediciones', help="CSV con columnas Q, masa, temp_inicial y temp_final")
+    parser.add_argument('--material',
+                        help="Material conocido del que se toman las temperaturas de cambio de fase "
+                             "y las constantes que no se puedan estimar")
+    parser.add_argument('--materiales', help="Archivo JSON o CSV con la base de materiales a usar")
+    parser.add_argument('--T-fusion', type=float, dest='T_fusion')
+    parser.add_argument('--T-ebullicion', type=float, dest='T_ebullicion')
+    parser.add_argument('--nivel', type=float, default=0.95, help="Nivel de confianza")
+    parser.add_argument('--guardar', metavar='RUTA',
+                        help="Agregar el material ajustado a este archivo JSON o CSV de materiales")
+    parser.add_argument('--nombre', help="Nombre del material guardado (por defecto, --material)")
+    return parser
+
+
+def main_ajuste(argv=None):
+    """Punto de entrada del ajuste de constantes."""
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    
+    base = {}
+    if args.material:
+        if args.materiales:
+            from materiales import cargar_materiales
+            constantes = cargar_materiales(args.materiales)
+        else:
+            from constants import CONSTANTES_MATERIALES as constantes
+        if args.material not in constantes:
+            parser.error(f"material desconocido: {args.material}")
+        base = dict(constantes[args.material])
+    T_fusion = args.T_fusion if args.T_fusion is not None else base.get('T_fusion')
+    T_ebullicion = args.T_ebullicion if args.T_ebullicion is not None else base.get('T_ebullicion')
+    if T_fusion is None:
+        parser.error("indica --T-fusion o un --material conocido")
+    
+    try:
+        ajuste = ajustar_constantes(*leer_mediciones(args.mediciones), T_fusion, T_ebullicion, args.nivel)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(formatear_ajuste(ajuste))
+    
+    if args.guardar:
+        nombre = args.nombre or args.material
+        if not nombre:
+            parser.error("indica --nombre para guardar el material")
+        from materiales import guardar_material
+        try:
+            guardar_material(args.guardar, nombre, ajuste.a_material(base))
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Material '{nombre}' guardado en {args.guardar}")
+    return 0
@@ -0,0 +1,298 @@
+"""
+Interfaz gráfica (tkinter) de la calculadora de calorimetría.
+"""
+
+import time
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk, messagebox, filedialog
+
+from constants import CONSTANTES_MATERIALES
+from calculator import CalculadoraCalor
+from perfilado import PERFILADOR
+from ui import TabConfigurator
+
+# grapher (matplotlib), despejador, barrido y tabla_lote se importan la primera vez que se usan,
+# para que la ventana aparezca sin esperar a cargar matplotlib
+
+# Espera tras la última edición antes de recalcular, y cada cuánto se
+# revisa si el trabajador terminó (milisegundos)
+RETARDO_RECALCULO_MS = 250
+INTERVALO_REVISION_MS = 20
+
+# Etapas de un cálculo que se muestran en la barra de estado al perfilar
+ETAPAS_CALCULO = (
+    ('leer_datos', "lectura"),
+    ('calcular_calor_total', "cálculo"),
+    ('formatear_resultados', "formato"),
+    ('insertar_texto', "texto"),
+    ('graficar', "gráfico"),
+    ('calculo_completo', "total"),
+)
+
+
+class CalorimetriaApp:
+    """Aplicación principal de calorimetría."""
+    
+    def __init__(self, root, constantes=None):
+        self.root = root
+        self.root.title("Calculadora de Calorimetría Completa")
+        self.root.geometry("1400x900")
+        self.root.configure(bg='#f0f0f0')
+        
+        # Inicializar módulos
+        self.constantes = constantes or CONSTANTES_MATERIALES
+        self.calculadora = CalculadoraCalor(self.constantes)
+        self.tab_configurator = TabConfigurator(None, self.constantes)
+        
+        # Los cálculos corren en un único hilo trabajador; la calculadora y
+        # sus cachés solo se usan desde ese hilo
+        self._trabajador = ThreadPoolExecutor(max_workers=1)
+        self._futuro = None
+        self._generacion = 0
+        self._recalculo_pendiente = None
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        
+        # Crear interfaz
+        self.crear_interfaz()
+    
+    def crear_interfaz(self):
+        """Crea la interfaz principal con pestañas."""
+        # Barra de estado con los tiempos por etapa (solo al perfilar)
+        self.estado_var = None
+        if PERFILADOR.activo:
+            self._crear_barra_estado()
+        
+        # Notebook (pestañas)
+        notebook = ttk.Notebook(self.root)
+        notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        # Crear pestañas
+        tab_calculadora = ttk.Frame(notebook)
+        tab_formulas = ttk.Frame(notebook)
+        tab_constantes = ttk.Frame(notebook)
+        
+        notebook.add(tab_calculadora, text='Calculadora')
+        notebook.add(tab_formulas, text='Fórmulas y Despejes')
+        notebook.add(tab_constantes, text='Constantes')
+        
+        # Las pestañas de referencia se construyen la primera vez que se abren
+        self._pestanas_pendientes = {
+            str(tab_formulas): lambda: self.tab_configurator.configurar_tab_formulas(tab_formulas),
+            str(tab_constantes): lambda: self.tab_configurator.configurar_tab_constantes(tab_constantes),
+        }
+        notebook.bind('<<NotebookTabChanged>>', self._construir_pestana)
+        
+        # Configurar la pestaña inicial
+        self.tab_config = self.tab_configurator.configurar_tab_calculadora(
+            tab_calculadora, 
+            {
+                'calcular': self.calcular,
+                'actualizar': self.actualizar_constantes,
+                'despeje': self.abrir_despeje,
+                'barrido': self.abrir_barrido,
+                'lote': self.abrir_lote
+            }
+        )
+        
+        # Recalcular en segundo plano cuando cambien los datos de entrada
+        for nombre in ('material_var', 'masa_var', 'temp_inicial_var', 'temp_final_var'):
+            self.tab_config[nombre].trace_add('write', self._programar_recalculo)
+        
+        # Actualizar constantes iniciales
+        self.actualizar_constantes()
+    
+    def _crear_barra_estado(self):
+        barra = ttk.Frame(self.root)
+        barra.pack(side='bottom', fill='x', padx=10, pady=(0, 5))
+        self.estado_var = tk.StringVar(value="Perfilado activo: calcula para ver los tiempos")
+        ttk.Label(barra, textvariable=self.estado_var, font=('Consolas', 9)).pack(side='left')
+        ttk.Button(barra, text="Exportar traza…", command=self.exportar_traza).pack(side='right')
+    
+    def _mostrar_tiempos(self):
+        """Muestra en la barra de estado la duración de cada etapa del último cálculo."""
+        tiempos = PERFILADOR.ultimos([nombre for nombre, _ in ETAPAS_CALCULO])
+        self.estado_var.set("   ".join(
+            f"{etiqueta}: {tiempos[nombre] * 1000:.2f} ms"
+            for nombre, etiqueta in ETAPAS_CALCULO if nombre in tiempos
+        ))
+    
+    def exportar_traza(self):
+        """Guarda los tramos medidos como traza JSON de Chrome."""
+        ruta = filedialog.asksaveasfilename(
+            parent=self.root, title="Exportar traza", defaultextension='.json',
+            filetypes=[("Traza de Chrome", "*.json")]
+        )
+        if ruta:
+            PERFILADOR.exportar_chrome(ruta)
+    
+    def _construir_pestana(self, event):
+        """Construye la pestaña seleccionada si aún no se había construido."""
+        construir = self._pestanas_pendientes.pop(event.widget.select(), None)
+        if construir is not None:
+            construir()
+    
+    def actualizar_constantes(self, event=None):
+        """Actualiza el texto de constantes para el material seleccionado."""
+        material = self.tab_config['material_var'].get()
+        if material not in self.constantes:
+            return  # Texto a medio escribir en el filtro de materiales
+        TabConfigurator.actualizar_texto_constantes(
+            self.tab_config['text_constantes'], 
+            material, 
+            self.constantes
+        )
+    
+    def _leer_datos(self):
+        """
+        Lee los datos de entrada de la pestaña calculadora.
+        
+        Returns:
+            tuple: (material, masa, Ti, Tf)
+        
+        Raises:
+            KeyError: Si el material no existe
+            ValueError: Si algún valor no es numérico
+        """
+        material = self.tab_config['material_var'].get()
+        if material not in self.constantes:
+            raise KeyError(material)
+        masa = float(self.tab_config['masa_var'].get())
+        Ti = float(self.tab_config['temp_inicial_var'].get())
+        Tf = float(self.tab_config['temp_final_var'].get())
+        return material, masa, Ti, Tf
+    
+    def calcular(self):
+        """Realiza el cálculo de calor total."""
+        inicio = time.perf_counter_ns()
+        try:
+            with PERFILADOR.tramo('leer_datos', 'gui'):
+                datos = self._leer_datos()
+        except KeyError as e:
+            messagebox.showerror("Error", f"Material desconocido: {e.args[0]}")
+            return
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingresa valores numéricos válidos.")
+            return
+        
+        self._cancelar_recalculo()
+        self._lanzar(datos, mostrar_errores=True, inicio=inicio)
+    
+    def _programar_recalculo(self, *args):
+        """Reprograma el recálculo automático tras cada edición (debounce)."""
+        if not self.tab_config['en_vivo_var'].get():
+            return
+        self._cancelar_recalculo()
+        self._recalculo_pendiente = self.root.after(RETARDO_RECALCULO_MS, self._recalcular)
+    
+    def _cancelar_recalculo(self):
+        if self._recalculo_pendiente is not None:
+            self.root.after_cancel(self._recalculo_pendiente)
+            self._recalculo_pendiente = None
+    
+    def _recalcular(self):
+        self._recalculo_pendiente = None
+        inicio = time.perf_counter_ns()
+        try:
+            with PERFILADOR.tramo('leer_datos', 'gui'):
+                datos = self._leer_datos()
+        except (KeyError, ValueError):
+            return  # Datos a medio escribir: se espera a la siguiente edición
+        self._lanzar(datos, mostrar_errores=False, inicio=inicio)
+    
+    def _calcular(self, datos):
+        """Cálculo que corre en el hilo trabajador."""
+        with PERFILADOR.tramo('calcular_calor_total'):
+            return self.calculadora.calcular_calor_total(*datos)
+    
+    def _lanzar(self, datos, mostrar_errores, inicio):
+        """
+        Envía un cálculo al hilo trabajador.
+        
+        Un cálculo anterior que aún no empezó se cancela; si ya está en curso,
+        su resultado se descarta al terminar (su generación ya no es la actual).
+        """
+        if self._futuro is not None:
+            self._futuro.cancel()
+        self._generacion += 1
+        self._futuro = self._trabajador.submit(self._calcular, datos)
+        self.root.after(INTERVALO_REVISION_MS, self._revisar, self._futuro,
+                        self._generacion, mostrar_errores, inicio)
+    
+    def _revisar(self, futuro, generacion, mostrar_errores, inicio):
+        """Espera (sin bloquear) el resultado del trabajador y lo muestra en el hilo de Tk."""
+        if generacion != self._generacion or futuro.cancelled():
+            return  # Cálculo obsoleto
+        if not futuro.done():
+            self.root.after(INTERVALO_REVISION_MS, self._revisar, futuro,
+                            generacion, mostrar_errores, inicio)
+            return
+        
+        try:
+            Q_total, resultados, temperaturas, energias = futuro.result()
+        except Exception as e:
+            if mostrar_errores:
+                messagebox.showerror("Error", f"Error en el cálculo: {str(e)}")
+            return
+        self.mostrar_resultado(Q_total, resultados, temperaturas, energias)
+        
+        if PERFILADOR.activo:
+            # Desde la lectura de datos hasta el gráfico dibujado, incluida la espera al trabajador
+            PERFILADOR.registrar('calculo_completo', inicio, time.perf_counter_ns(), 'gui')
+            self._mostrar_tiempos()
+    
+    def mostrar_resultado(self, Q_total, resultados, temperaturas, energias):
+        """Muestra el texto de resultados y actualiza el diagrama."""
+        with PERFILADOR.tramo('formatear_resultados', 'gui'):
+            texto = CalculadoraCalor.formatear_resultados(Q_total, resultados)
+        with PERFILADOR.tramo('insertar_texto', 'gui'):
+            self.tab_config['text_resultados'].delete('1.0', tk.END)
+            self.tab_config['text_resultados'].insert('1.0', texto)
+            if PERFILADOR.activo:
+                # Tk redibuja en tareas ociosas: se fuerzan aquí para medirlas en su etapa
+                self.root.update_idletasks()
+        
+        # Graficar
+        with PERFILADOR.tramo('graficar', 'gui'):
+            from grapher import GraficadorCalor
+            GraficadorCalor.crear_diagrama_temperatura_energia(
+                self.tab_config['frame_grafico'], 
+                temperaturas, 
+                energias
+            )
+            if PERFILADOR.activo:
+                self.root.update_idletasks()  # draw_idle de matplotlib
+    
+    def cerrar(self):
+        """Descarta los cálculos pendientes y cierra la ventana."""
+        self._cancelar_recalculo()
+        self._generacion += 1
+        self._trabajador.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
+    def abrir_despeje(self):
+        """Abre la ventana para despejar variables."""
+        from despejador import VentanaDespejador
+        VentanaDespejador(self.root)
+    
+    def abrir_barrido(self):
+        """Abre la ventana de barrido de parámetros para el material actual."""
+        material = self.tab_config['material_var'].get()
+        if material not in self.constantes:
+            messagebox.showerror("Error", f"Material desconocido: {material}")
+            return
+        from barrido import VentanaBarrido
+        # Calculadora propia: la de la ventana principal se usa desde el hilo trabajador
+        VentanaBarrido(self.root, CalculadoraCalor(self.constantes), material)
+    
+    def abrir_lote(self):
+        """Abre la ventana de resultados por lote."""
+        from tabla_lote import VentanaLote
+        VentanaLote(self.root, CalculadoraCalor(self.constantes))
+
+
+def ejecutar_interfaz(constantes=None):
+    """Abre la ventana principal y entra en el bucle de eventos."""
+    root = tk.Tk()
+    app = CalorimetriaApp(root, constantes)
+    root.mainloop()
\ No newline at end of file
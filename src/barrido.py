@@ -0,0 +1,208 @@
+"""
+Barrido de parámetros: calor total sobre una malla de dos variables.
+
+Dos tipos de barrido para un material:
+
+- 'temperaturas': Q(Ti, Tf) con masa fija
+- 'masa': Q(m, ΔT) con temperatura inicial fija
+
+Los resultados se guardan a resolución completa en un archivo .npz de NumPy
+(claves Q, eje_x, eje_y, tipo, material y fijo).
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+import numpy as np
+
+
+TIPOS_BARRIDO = {
+    # tipo: (texto, eje y, eje x, valor fijo)
+    'temperaturas': ('Q(Ti, Tf)', 'Temperatura inicial (°C)', 'Temperatura final (°C)', 'Masa (kg)'),
+    'masa': ('Q(m, ΔT)', 'Masa (kg)', 'ΔT (°C)', 'Temperatura inicial (°C)'),
+}
+
+# Valores iniciales de la ventana por tipo: (fijo, y mín, y máx, x mín, x máx)
+VALORES_INICIALES = {
+    'temperaturas': ('1', '-50', '150', '-50', '150'),
+    'masa': ('20', '0.1', '10', '-50', '150'),
+}
+
+# Puntos por eje permitidos en la ventana
+MAX_PUNTOS_EJE = 5000
+
+
+def calcular_barrido(calculadora, material, tipo, eje_y, eje_x, fijo):
+    """
+    Calcula un barrido de parámetros en una sola pasada vectorizada.
+    
+    Args:
+        calculadora (CalculadoraCalor): Calculadora a usar
+        material (str): Nombre del material
+        tipo (str): 'temperaturas' o 'masa'
+        eje_y (array_like): Ti o masas (filas de la malla)
+        eje_x (array_like): Tf o ΔT (columnas de la malla)
+        fijo (float): Masa (tipo 'temperaturas') o Ti (tipo 'masa')
+    
+    Returns:
+        ndarray: Q en J de forma (len(eje_y), len(eje_x))
+    
+    Raises:
+        ValueError: Si alguna masa no es mayor que cero o el tipo no existe
+    """
+    masas = fijo if tipo == 'temperaturas' else eje_y
+    if tipo in TIPOS_BARRIDO and not np.all(np.asarray(masas) > 0):
+        raise ValueError("Las masas deben ser mayores que cero")
+    if tipo == 'temperaturas':
+        return calculadora.calcular_barrido_temperaturas(material, fijo, eje_y, eje_x)
+    if tipo == 'masa':
+        return calculadora.calcular_barrido_masa(material, eje_y, eje_x, fijo)
+    raise ValueError(f"Tipo de barrido desconocido: {tipo}")
+
+
+def guardar_barrido(ruta, Q, eje_x, eje_y, tipo, material, fijo):
+    """Guarda un barrido completo (sin reducir) en un archivo .npz."""
+    np.savez_compressed(ruta, Q=Q, eje_x=eje_x, eje_y=eje_y,
+                        tipo=tipo, material=material, fijo=fijo)
+
+
+def cargar_barrido(ruta):
+    """
+    Lee un barrido guardado con guardar_barrido.
+    
+    Returns:
+        dict: Claves Q, eje_x, eje_y, tipo, material y fijo
+    """
+    with np.load(ruta) as datos:
+        return {
+            'Q': datos['Q'],
+            'eje_x': datos['eje_x'],
+            'eje_y': datos['eje_y'],
+            'tipo': str(datos['tipo']),
+            'material': str(datos['material']),
+            'fijo': float(datos['fijo']),
+        }
+
+
+class VentanaBarrido:
+    """Ventana para calcular, ver y exportar barridos de parámetros."""
+    
+    def __init__(self, parent, calculadora, material):
+        self.parent = parent
+        self.calculadora = calculadora
+        self.material = material
+        self.resultado = None
+        
+        self.ventana = tk.Toplevel(parent)
+        self.ventana.title(f"🗺️ Barrido de Parámetros - {material}")
+        self.ventana.geometry("1000x750")
+        self.ventana.configure(bg='#f0f0f0')
+        
+        # Variables de entrada
+        self.tipo_var = tk.StringVar(value='temperaturas')
+        self.fijo_var = tk.StringVar()
+        self.y_min_var = tk.StringVar()
+        self.y_max_var = tk.StringVar()
+        self.x_min_var = tk.StringVar()
+        self.x_max_var = tk.StringVar()
+        self._poner_valores_iniciales()
+        self.puntos_var = tk.StringVar(value='500')
+        
+        self.crear_interfaz()
+    
+    def crear_interfaz(self):
+        """Crea la interfaz de la ventana."""
+        frame_datos = ttk.LabelFrame(self.ventana, text="Datos del Barrido", padding=10)
+        frame_datos.pack(fill='x', padx=10, pady=10)
+        
+        ttk.Label(frame_datos, text="Tipo:").grid(row=0, column=0, sticky='w', pady=3)
+        for i, (tipo, (texto, *_)) in enumerate(TIPOS_BARRIDO.items()):
+            ttk.Radiobutton(frame_datos, text=texto, value=tipo, variable=self.tipo_var,
+                            command=self._cambiar_tipo).grid(row=0, column=1 + i, sticky='w')
+        
+        self.etiqueta_fijo = ttk.Label(frame_datos)
+        self.etiqueta_fijo.grid(row=1, column=0, sticky='w', pady=3)
+        ttk.Entry(frame_datos, textvariable=self.fijo_var, width=10).grid(row=1, column=1, sticky='w')
+        
+        self.etiqueta_y = ttk.Label(frame_datos)
+        self.etiqueta_y.grid(row=2, column=0, sticky='w', pady=3)
+        ttk.Entry(frame_datos, textvariable=self.y_min_var, width=10).grid(row=2, column=1, sticky='w')
+        ttk.Entry(frame_datos, textvariable=self.y_max_var, width=10).grid(row=2, column=2, sticky='w')
+        
+        self.etiqueta_x = ttk.Label(frame_datos)
+        self.etiqueta_x.grid(row=3, column=0, sticky='w', pady=3)
+        ttk.Entry(frame_datos, textvariable=self.x_min_var, width=10).grid(row=3, column=1, sticky='w')
+        ttk.Entry(frame_datos, textvariable=self.x_max_var, width=10).grid(row=3, column=2, sticky='w')
+        
+        ttk.Label(frame_datos, text="Puntos por eje:").grid(row=4, column=0, sticky='w', pady=3)
+        ttk.Entry(frame_datos, textvariable=self.puntos_var, width=10).grid(row=4, column=1, sticky='w')
+        
+        ttk.Button(frame_datos, text="Calcular",
+                  command=self.calcular).grid(row=5, column=0, pady=10, sticky='w')
+        ttk.Button(frame_datos, text="Exportar (.npz)",
+                  command=self.exportar).grid(row=5, column=1, pady=10, sticky='w')
+        
+        self.frame_grafico = ttk.Frame(self.ventana)
+        self.frame_grafico.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        self._actualizar_etiquetas()
+    
+    def _poner_valores_iniciales(self):
+        """Carga valores válidos para el tipo de barrido elegido."""
+        valores = VALORES_INICIALES[self.tipo_var.get()]
+        variables = (self.fijo_var, self.y_min_var, self.y_max_var, self.x_min_var, self.x_max_var)
+        for variable, valor in zip(variables, valores):
+            variable.set(valor)
+    
+    def _cambiar_tipo(self):
+        """Al cambiar de tipo, los ejes cambian de significado: se reinician sus valores."""
+        self._poner_valores_iniciales()
+        self._actualizar_etiquetas()
+    
+    def _actualizar_etiquetas(self):
+        """Cambia las etiquetas de los ejes según el tipo de barrido."""
+        _, nombre_y, nombre_x, nombre_fijo = TIPOS_BARRIDO[self.tipo_var.get()]
+        self.etiqueta_fijo['text'] = f"{nombre_fijo}:"
+        self.etiqueta_y['text'] = f"{nombre_y} mín/máx:"
+        self.etiqueta_x['text'] = f"{nombre_x} mín/máx:"
+    
+    def calcular(self):
+        """Calcula el barrido y lo dibuja."""
+        try:
+            fijo = float(self.fijo_var.get())
+            puntos = int(self.puntos_var.get())
+            eje_y = np.linspace(float(self.y_min_var.get()), float(self.y_max_var.get()), puntos)
+            eje_x = np.linspace(float(self.x_min_var.get()), float(self.x_max_var.get()), puntos)
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingresa valores numéricos válidos.",
+                                 parent=self.ventana)
+            return
+        if not 2 <= puntos <= MAX_PUNTOS_EJE:
+            messagebox.showerror("Error", f"Los puntos por eje deben estar entre 2 y {MAX_PUNTOS_EJE}.",
+                                 parent=self.ventana)
+            return
+        
+        tipo = self.tipo_var.get()
+        try:
+            Q = calcular_barrido(self.calculadora, self.material, tipo, eje_y, eje_x, fijo)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e), parent=self.ventana)
+            return
+        self.resultado = (Q, eje_x, eje_y, tipo, fijo)
+        
+        texto, nombre_y, nombre_x, _ = TIPOS_BARRIDO[tipo]
+        from grapher import GraficadorCalor
+        GraficadorCalor.crear_mapa_barrido(self.frame_grafico, eje_x, eje_y, Q,
+                                           nombre_x, nombre_y, f"{texto} - {self.material}")
+    
+    def exportar(self):
+        """Guarda el último barrido a resolución completa."""
+        if self.resultado is None:
+            messagebox.showinfo("Exportar", "Primero calcula un barrido.", parent=self.ventana)
+            return
+        ruta = filedialog.asksaveasfilename(parent=self.ventana, defaultextension='.npz',
+                                            filetypes=[('Arreglos NumPy', '*.npz')])
+        if not ruta:
+            return
+        Q, eje_x, eje_y, tipo, fijo = self.resultado
+        guardar_barrido(ruta, Q, eje_x, eje_y, tipo, self.material, fijo)
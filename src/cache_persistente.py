@@ -0,0 +1,247 @@
+"""
+Caché persistente de resultados en SQLite.
+
+Guarda Q_total y el calor de cada fase por (material, huella, m, Ti, Tf),
+donde la huella es un hash de las constantes del material: si cambia una
+entrada de CONSTANTES_MATERIALES, sus filas viejas dejan de coincidir y
+las de los demás materiales siguen sirviendo.
+
+Las consultas y escrituras son por lotes (una tabla temporal y un JOIN,
+no una consulta por fila). La base usa el modo WAL de SQLite, así que
+varios procesos pueden leer mientras otro escribe; las escrituras se
+serializan con BEGIN IMMEDIATE y esperan a que se libere el bloqueo.
+Cuando se supera max_filas se descartan las filas usadas hace más tiempo.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from entalpia import huella_material
+
+
+FASES_CACHE = ('solido', 'fusion', 'liquido', 'vaporizacion', 'gas')
+
+# Al desalojar se baja hasta esta fracción de max_filas, para no desalojar en cada escritura
+FRACCION_TRAS_DESALOJO = 0.9
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS resultados (
+    material TEXT NOT NULL,
+    huella TEXT NOT NULL,
+    masa REAL NOT NULL,
+    Ti REAL NOT NULL,
+    Tf REAL NOT NULL,
+    Q_total REAL NOT NULL,
+    {', '.join(f'Q_{fase} REAL NOT NULL' for fase in FASES_CACHE)},
+    usado REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS resultados_clave ON resultados (material, huella, masa, Ti, Tf);
+CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado);
+"""
+
+_COLUMNAS_VALORES = ['Q_total'] + [f'Q_{fase}' for fase in FASES_CACHE]
+
+
+def huella_constantes(const_mat):
+    """Hash corto y estable de las constantes de un material."""
+    return hashlib.sha256(repr(huella_material(const_mat)).encode('utf-8')).hexdigest()[:16]
+
+
+class CachePersistente:
+    """Caché de resultados por lotes en un archivo SQLite compartido."""
+    
+    def __init__(self, ruta, max_filas=1_000_000, espera=30.0):
+        """
+        Args:
+            ruta (str): Archivo de la base (se crea si no existe)
+            max_filas (int): Máximo de filas guardadas antes de desalojar
+            espera (float): Segundos que se espera un bloqueo de otro proceso
+        """
+        self.ruta = ruta
+        self.max_filas = max_filas
+        self.espera = espera
+        self._conexion = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+    
+    def __getstate__(self):
+        # Cada proceso abre su propia conexión
+        estado = self.__dict__.copy()
+        estado.update(_conexion=None, _pid=None, _lock=None)
+        return estado
+    
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock = threading.Lock()
+    
+    def _conectar(self):
+        """Conexión de este proceso (una conexión no se comparte entre procesos)."""
+        if self._conexion is None or self._pid != os.getpid():
+            conexion = sqlite3.connect(self.ruta, timeout=self.espera, isolation_level=None,
+                                       check_same_thread=False)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.executescript(_ESQUEMA)
+            conexion.execute("CREATE TEMP TABLE IF NOT EXISTS consulta "
+                             "(i INTEGER PRIMARY KEY, masa REAL, Ti REAL, Tf REAL)")
+            self._conexion = conexion
+            self._pid = os.getpid()
+        return self._conexion
+    
+    def cerrar(self):
+        if self._conexion is not None and self._pid == os.getpid():
+            self._conexion.close()
+        self._conexion = None
+    
+    def obtener(self, material, huella, masas, temps_iniciales, temps_finales):
+        """
+        Busca un lote de casos de un material.
+        
+        Los casos con masa o temperaturas no finitas nunca se encuentran.
+        
+        Returns:
+            tuple: (encontrados, valores) con encontrados como máscara booleana
+                   y valores de forma (n, 6): Q_total y el calor de cada fase
+                   de FASES_CACHE en J (sin sentido donde no se encontró)
+        """
+        masas, Ti, Tf = (np.ravel(np.asarray(x, dtype=float)) for x in (masas, temps_iniciales, temps_finales))
+        n = len(masas)
+        encontrados = np.zeros(n, dtype=bool)
+        valores = np.zeros((n, len(_COLUMNAS_VALORES)))
+        if n == 0:
+            return encontrados, valores
+        
+        finitos = np.flatnonzero(np.isfinite(masas) & np.isfinite(Ti) & np.isfinite(Tf))
+        with self._lock:
+            conexion = self._conectar()
+            conexion.execute("BEGIN IMMEDIATE")
+            try:
+                conexion.execute("DELETE FROM consulta")
+                conexion.executemany("INSERT INTO consulta VALUES (?, ?, ?, ?)",
+                                     zip(finitos.tolist(), masas[finitos].tolist(),
+                                         Ti[finitos].tolist(), Tf[finitos].tolist()))
+                filas = conexion.execute(
+                    f"SELECT c.i, r.rowid, {', '.join('r.' + c for c in _COLUMNAS_VALORES)} "
+                    # CROSS JOIN fija el orden: recorrer la consulta y buscar cada caso en el índice
+                    "FROM consulta c CROSS JOIN resultados r "
+                    "ON r.material = ? AND r.huella = ? AND r.masa = c.masa AND r.Ti = c.Ti AND r.Tf = c.Tf",
+                    (material, huella)
+                ).fetchall()
+                if filas:
+                    # Las filas encontradas pasan a ser las más recientes (desalojo LRU)
+                    conexion.executemany("UPDATE resultados SET usado = ? WHERE rowid = ?",
+                                         ((time.time(), fila[1]) for fila in filas))
+                conexion.execute("COMMIT")
+            except BaseException:
+                conexion.execute("ROLLBACK")
+                raise
+        
+        if filas:
+            datos = np.array(filas, dtype=float)
+            indices = datos[:, 0].astype(np.intp)
+            encontrados[indices] = True
+            valores[indices] = datos[:, 2:]
+        self.aciertos += len(filas)
+        self.fallos += n - len(filas)
+        return encontrados, valores
+    
+    def guardar(self, material, huella, masas, temps_iniciales, temps_finales, valores):
+        """
+        Guarda un lote de resultados de un material.
+        
+        Las filas con datos o resultados no finitos no se guardan (SQLite
+        guardaría NaN como NULL).
+        
+        Args:
+            valores (array_like): Forma (n, 6), como la devuelve obtener
+        """
+        masas, Ti, Tf = (np.ravel(np.asarray(x, dtype=float)) for x in (masas, temps_iniciales, temps_finales))
+        valores = np.asarray(valores, dtype=float).reshape(len(masas), len(_COLUMNAS_VALORES))
+        finitas = np.isfinite(masas) & np.isfinite(Ti) & np.isfinite(Tf) & np.isfinite(valores).all(axis=1)
+        if not finitas.all():
+            masas, Ti, Tf, valores = masas[finitas], Ti[finitas], Tf[finitas], valores[finitas]
+        if len(masas) == 0:
+            return
+        
+        usado = time.time()
+        filas = (
+            (material, huella, m, ti, tf, *fila, usado)
+            for m, ti, tf, fila in zip(masas.tolist(), Ti.tolist(), Tf.tolist(), valores.tolist())
+        )
+        marcadores = ', '.join('?' * (6 + len(_COLUMNAS_VALORES)))
+        with self._lock:
+            conexion = self._conectar()
+            conexion.execute("BEGIN IMMEDIATE")
+            try:
+                conexion.executemany(f"INSERT OR REPLACE INTO resultados VALUES ({marcadores})", filas)
+                total = conexion.execute("SELECT count(*) FROM resultados").fetchone()[0]
+                if total > self.max_filas:
+                    sobrantes = total - int(self.max_filas * FRACCION_TRAS_DESALOJO)
+                    conexion.execute("DELETE FROM resultados WHERE rowid IN "
+                                     "(SELECT rowid FROM resultados ORDER BY usado LIMIT ?)", (sobrantes,))
+                    self.desalojos += sobrantes
+                conexion.execute("COMMIT")
+            except BaseException:
+                conexion.execute("ROLLBACK")
+                raise
+    
+    def invalidar(self, material, huella=None):
+        """
+        Borra las filas de un material; con huella, solo las de otras huellas.
+        """
+        with self._lock:
+            conexion = self._conectar()
+            if huella is None:
+                conexion.execute("DELETE FROM resultados WHERE material = ?", (material,))
+            else:
+                conexion.execute("DELETE FROM resultados WHERE material = ? AND huella <> ?",
+                                 (material, huella))
+    
+    def calcular_lote(self, calculadora, material, masas, temps_iniciales, temps_finales):
+        """
+        Como CalculadoraCalor.calcular_calor_lote, calculando solo lo que no está guardado.
+        
+        Returns:
+            tuple: (Q_total, calores_por_fase) con calores_por_fase como
+                   {fase: ndarray} para cada fase de FASES_CACHE
+        """
+        masas, Ti, Tf = np.broadcast_arrays(*(np.ravel(np.asarray(x, dtype=float))
+                                              for x in (masas, temps_iniciales, temps_finales)))
+        huella = huella_constantes(calculadora.constantes[material])
+        encontrados, valores = self.obtener(material, huella, masas, Ti, Tf)
+        
+        faltan = np.flatnonzero(~encontrados)
+        if len(faltan):
+            Q_total, por_fase = calculadora.calcular_calor_lote(material, masas[faltan], Ti[faltan], Tf[faltan])
+            nuevos = np.column_stack([Q_total] + [por_fase.get(fase, np.zeros(len(faltan)))
+                                                  for fase in FASES_CACHE])
+            valores[faltan] = nuevos
+            self.guardar(material, huella, masas[faltan], Ti[faltan], Tf[faltan], nuevos)
+        
+        return valores[:, 0], {fase: valores[:, 1 + k] for k, fase in enumerate(FASES_CACHE)}
+    
+    def estadisticas(self):
+        """Aciertos, fallos y desalojos de este proceso, y filas guardadas en total."""
+        with self._lock:
+            filas = self._conectar().execute("SELECT count(*) FROM resultados").fetchone()[0]
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'filas': filas,
+            'max_filas': self.max_filas,
+        }
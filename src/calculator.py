@@ -2,185 +2,837 @@
 Lógica de cálculo para calorimetría.
 """
 
+import io
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+
+import numpy as np
+
 from constants import CONSTANTES_MATERIALES
+from entalpia import TablaEntalpia, huella_material
+from informe import InformeTexto
+from perfilado import PERFILADOR
+from simulacion import simular
+
+
+# Nombres para mostrar de cada fase: (al calentar, al enfriar, símbolo)
+NOMBRES_FASES = {
+    'solido': ("Calentar Sólido", "Enfriar Sólido", "c_sólido"),
+    'fusion': ("Fusión", "Solidificación", "L_f"),
+    'liquido': ("Calentar Líquido", "Enfriar Líquido", "c_líquido"),
+    'vaporizacion': ("Vaporización", "Condensación", "L_v"),
+    'gas': ("Calentar Gas", "Enfriar Gas", "c_gas"),
+}
+
+NOMBRES_FASES_MATERIAL = {
+    'Agua (H₂O)': {
+        'solido': ("Calentar Hielo", "Enfriar Hielo", "c_hielo"),
+        'fusion': ("Fusión del Hielo", "Solidificación del Agua", "L_f"),
+        'liquido': ("Calentar Agua Líquida", "Enfriar Agua Líquida", "c_agua"),
+        'vaporizacion': ("Vaporización del Agua", "Condensación del Vapor", "L_v"),
+        'gas': ("Calentar Vapor", "Enfriar Vapor", "c_vapor"),
+    }
+}
+
+FASES_LATENTES = ('fusion', 'vaporizacion')
+
+# Etapas de un lote en forma compacta (29 bytes por etapa): fila del lote,
+# código de fase (índice en fases_material), temperaturas y calor en J
+DTYPE_ETAPAS = np.dtype([
+    ('fila', np.int32),
+    ('fase', np.int8),
+    ('T_inicio', np.float64),
+    ('T_fin', np.float64),
+    ('Q', np.float64),
+])
+
+
+def _numero(valor):
+    """Muestra una constante sin decimales de más (c medio de un c(T), p. ej.)."""
+    return f"{round(valor, 2):.10g}"
+
+
+@lru_cache(maxsize=4096)
+def _temperatura(T):
+    """
+    Muestra una temperatura igual venga como int, float o de NumPy.
+    
+    660, 660.0 y np.float64(660) dan '660', así que el cálculo por lotes
+    y el de un caso escriben los mismos rangos.
+    """
+    return f"{T + 0.0:.10g}"
+
+
+def _textos_fase(nombres, fase, constante, T_inicio):
+    """
+    Partes de los textos de una etapa que no dependen de la masa.
+    
+    Para las fases con c constante no dependen del caso, así que se arman
+    una vez por tabla (ver CalculadoraCalor._compilado).
+    
+    Args:
+        nombres (dict): NOMBRES_FASES o el de NOMBRES_FASES_MATERIAL del material
+        fase (str): Identificador de la fase ('solido', 'fusion', ...)
+        constante (float): c en J/(kg·°C) o L en J/kg
+        T_inicio (float): Temperatura del cambio de fase en °C (solo latentes)
+    
+    Returns:
+        tuple: (nombre_calentar, nombre_enfriar, inicios, medio, rango) con
+               inicios el comienzo de la fórmula al calentar y al enfriar, y
+               rango None en las fases sensibles
+    """
+    calentar, enfriar, simbolo = nombres[fase]
+    if fase in FASES_LATENTES:
+        return (calentar, enfriar, (f"Q = m · {simbolo} = ", f"Q = -m · {simbolo} = -"),
+                f" kg · {_numero(constante)} J/kg", f"{_temperatura(T_inicio)}°C (cambio de fase)")
+    inicio = f"Q = m · {simbolo} · ΔT = "
+    return calentar, enfriar, (inicio, inicio), f" kg · {_numero(constante)} J/(kg·°C) · ", None
+
+
+def _etapa_a_dict(textos, T_inicio, T_fin, texto_masa, valor):
+    """
+    Arma el dict de una etapa en el formato de la interfaz.
+    
+    Args:
+        textos (tuple): Partes fijas de la fase, de _textos_fase
+        T_inicio (float): Temperatura al inicio de la etapa en °C
+        T_fin (float): Temperatura al final de la etapa en °C
+        texto_masa (str): Masa ya formateada
+        valor (float): Calor de la etapa en J
+    
+    Returns:
+        dict: fase, formula, valor y rango de la etapa
+    """
+    calentar, enfriar, inicios, medio, rango = textos
+    enfriando = valor < 0
+    if rango is None:
+        formula = f"{inicios[enfriando]}{texto_masa}{medio}{(T_fin - T_inicio):.2f} °C"
+        rango = f"{_temperatura(T_inicio)}°C → {_temperatura(T_fin)}°C"
+    else:
+        formula = f"{inicios[enfriando]}{texto_masa}{medio}"
+    return {
+        'fase': enfriar if enfriando else calentar,
+        'formula': formula,
+        'valor': valor,
+        'rango': rango
+    }
+
+
+class EtapaCalor(namedtuple('EtapaCalor', 'material fase T_inicio T_fin masa constante valor')):
+    """
+    Registro numérico compacto de una etapa del cálculo.
+    
+    Solo guarda números y referencias; el nombre, la fórmula y el rango
+    se generan cuando se piden (por ejemplo en formatear_resultados).
+    """
+    
+    __slots__ = ()
+    
+    @property
+    def es_latente(self):
+        return self.fase in FASES_LATENTES
+    
+    @property
+    def delta(self):
+        """ΔT en °C para etapas sensibles, o el término latente m·L en J."""
+        if self.es_latente:
+            return self.valor
+        return self.T_fin - self.T_inicio
+    
+    @property
+    def nombre(self):
+        return self.a_dict()['fase']
+    
+    @property
+    def formula(self):
+        return self.a_dict()['formula']
+    
+    @property
+    def rango(self):
+        return self.a_dict()['rango']
+    
+    def a_dict(self):
+        """Convierte la etapa al formato de diccionario usado por la interfaz."""
+        nombres = NOMBRES_FASES_MATERIAL.get(self.material, NOMBRES_FASES)
+        textos = _textos_fase(nombres, self.fase, self.constante, self.T_inicio)
+        return _etapa_a_dict(textos, self.T_inicio, self.T_fin, f"{self.masa}", self.valor)
+
+
+class ResultadoCalor:
+    """
+    Resultado compacto de un cálculo: datos de entrada, Q_total y etapas.
+    
+    Guarda solo números y EtapaCalor; los dicts con textos y los puntos del
+    diagrama se generan cuando se piden.
+    """
+    
+    __slots__ = ('material', 'masa', 'temp_inicial', 'temp_final', 'Q_total', 'etapas')
+    
+    def __init__(self, material, masa, temp_inicial, temp_final, Q_total, etapas):
+        self.material = material
+        self.masa = masa
+        self.temp_inicial = temp_inicial
+        self.temp_final = temp_final
+        self.Q_total = Q_total
+        self.etapas = tuple(etapas)
+    
+    def resultados(self):
+        """Etapas en el formato de diccionario usado por la interfaz."""
+        return [etapa.a_dict() for etapa in self.etapas]
+    
+    def puntos_diagrama(self):
+        """(temperaturas, energias) del diagrama temperatura-energía."""
+        return CalculadoraCalor.puntos_diagrama(self.temp_inicial, self.etapas)
+    
+    def a_tupla(self):
+        """Forma devuelta por calcular_calor_total: (Q_total, resultados, temperaturas, energias)."""
+        return (self.Q_total, self.resultados()) + self.puntos_diagrama()
 
 
 class CalculadoraCalor:
     """Clase para realizar cálculos de calorimetría."""
     
-    def __init__(self, constantes=None):
+    def __init__(self, constantes=None, tam_cache=0):
+        """
+        Args:
+            constantes (dict): Constantes de materiales (por defecto las de constants.py)
+            tam_cache (int): Máximo de resultados de calcular_calor_total que se
+                             memorizan (0 desactiva la caché)
+        """
         self.constantes = constantes or CONSTANTES_MATERIALES
+        self._tablas = {}
+        self.tam_cache = tam_cache
+        self._cache = OrderedDict()
+        self._aciertos = 0
+        self._fallos = 0
+        self._desalojos = 0
+        self._invalidaciones = 0
     
     def calcular_calor_total(self, material, masa, temp_inicial, temp_final):
         """
         Calcula el calor total necesario para cambiar la temperatura de un material.
         
+        Sirve tanto para calentar como para enfriar (Tf < Ti); al enfriar
+        el calor total y el de cada etapa son negativos.
+        
         Args:
             material (str): Nombre del material
             masa (float): Masa en kg
             temp_inicial (float): Temperatura inicial en °C
             temp_final (float): Temperatura final en °C
-            
+        
         Returns:
             tuple: (Q_total, resultados_por_etapa, temperaturas, energias)
         """
-        const_mat = self.constantes[material]
-        resultados = []
-        temperaturas = [temp_inicial]
-        energias = [0]
-        Q_total = 0
+        if not self.tam_cache:
+            return self._calcular_calor_total(material, masa, temp_inicial, temp_final)
         
-        # Para agua: manejo completo de fases
-        if material == 'Agua (H₂O)':
-            Q_total, temperaturas, energias = self._calcular_agua(
-                masa, temp_inicial, temp_final, const_mat, resultados
-            )
+        # La tabla se recompila si cambian las constantes del material, así
+        # que un resultado guardado con otra tabla ya no es válido
+        tabla = self._tabla(material)
+        clave = (material, masa, temp_inicial, temp_final)
+        entrada = self._cache.get(clave)
+        if entrada is not None and entrada[0] is not tabla:
+            del self._cache[clave]
+            self._invalidaciones += 1
+            entrada = None
+        
+        if entrada is None:
+            self._fallos += 1
+            resultado = self._calcular_calor_total(material, masa, temp_inicial, temp_final)
+            self._cache[clave] = (tabla, resultado)
+            if len(self._cache) > self.tam_cache:
+                self._cache.popitem(last=False)
+                self._desalojos += 1
         else:
-            # Para otros materiales
-            Q_total, temperaturas, energias = self._calcular_otro_material(
-                masa, temp_inicial, temp_final, const_mat, resultados
-            )
+            self._aciertos += 1
+            self._cache.move_to_end(clave)
+            resultado = entrada[1]
         
-        return Q_total, resultados, temperaturas, energias
+        # Se guardan los textos ya armados; cada llamada recibe copias para
+        # que quien llama no pueda alterar lo guardado
+        Q_total, resultados, temperaturas, energias = resultado
+        return Q_total, [dict(r) for r in resultados], list(temperaturas), list(energias)
     
-    def _calcular_agua(self, masa, Ti, Tf, const_mat, resultados):
-        """Calcula calor para una sustancia con todas las fases (agua)."""
-        temperaturas = [Ti]
+    def _calcular_calor_total(self, material, masa, temp_inicial, temp_final):
+        # Dicts y puntos del diagrama en una sola pasada por las etapas; las
+        # partes fijas de los textos se arman al compilar la tabla y cada
+        # dict sale como en _etapa_a_dict, sin la llamada por etapa
+        _, _, tabla, textos = self._compilado(material)
+        resultados = []
+        temperaturas = [temp_inicial]
         energias = [0]
         Q_total = 0
-        
-        # Fase 1: Calentar hielo (si T < 0)
-        if Ti < 0 and Tf > 0:
-            Q1 = masa * const_mat['c_solido'] * (0 - Ti)
-            resultados.append({
-                'fase': "Calentar Hielo",
-                'formula': f"Q = m · c_hielo · ΔT = {masa} kg · {const_mat['c_solido']} J/(kg·°C) · {(0-Ti):.2f} °C",
-                'valor': Q1,
-                'rango': f"{Ti}°C → 0°C"
-            })
-            Q_total += Q1
-            temperaturas.append(0)
-            energias.append(Q_total)
-        elif Ti < 0 and Tf <= 0:
-            Q1 = masa * const_mat['c_solido'] * (Tf - Ti)
+        texto_masa = f"{masa}"
+        for fase, T_inicio, T_fin, constante, q in tabla.etapas(temp_inicial, temp_final):
+            valor = masa * q
+            textos_fase = textos.get(fase)
+            if textos_fase is None:
+                # c(T) variable: la constante es el c medio de esta etapa
+                nombres = NOMBRES_FASES_MATERIAL.get(material, NOMBRES_FASES)
+                textos_fase = _textos_fase(nombres, fase, constante, T_inicio)
+            calentar, enfriar, inicios, medio, rango = textos_fase
+            enfriando = valor < 0
+            if rango is None:
+                formula = f"{inicios[enfriando]}{texto_masa}{medio}{(T_fin - T_inicio):.2f} °C"
+                rango = f"{_temperatura(T_inicio)}°C → {_temperatura(T_fin)}°C"
+            else:
+                formula = f"{inicios[enfriando]}{texto_masa}{medio}"
             resultados.append({
-                'fase': "Calentar/Enfriar Hielo",
-                'formula': f"Q = m · c_hielo · ΔT = {masa} kg · {const_mat['c_solido']} J/(kg·°C) · {(Tf-Ti):.2f} °C",
-                'valor': Q1,
-                'rango': f"{Ti}°C → {Tf}°C"
+                'fase': enfriar if enfriando else calentar,
+                'formula': formula,
+                'valor': valor,
+                'rango': rango
             })
-            Q_total += Q1
-            temperaturas.append(Tf)
+            Q_total += valor
+            temperaturas.append(T_fin)
             energias.append(Q_total)
         
-        # Fase 2: Fusión (0°C)
-        if Ti <= 0 and Tf > 0:
-            Q2 = masa * const_mat['Lf']
-            resultados.append({
-                'fase': "Fusión del Hielo",
-                'formula': f"Q = m · L_f = {masa} kg · {const_mat['Lf']} J/kg",
-                'valor': Q2,
-                'rango': "0°C (cambio de fase)"
-            })
-            Q_total += Q2
-            temperaturas.append(0)
-            energias.append(Q_total)
+        return Q_total, resultados, temperaturas, energias
+    
+    def calcular_resultado(self, material, masa, temp_inicial, temp_final):
+        """
+        Calcula el calor total y devuelve el resultado en forma compacta.
         
-        # Fase 3: Calentar agua líquida (0 < T < 100)
-        if Ti < 100 and Tf > 0:
-            T_inicio = max(0, Ti)
-            T_fin = min(100, Tf)
-            if T_fin > T_inicio:
-                Q3 = masa * const_mat['c_liquido'] * (T_fin - T_inicio)
-                resultados.append({
-                    'fase': "Calentar Agua Líquida",
-                    'formula': f"Q = m · c_agua · ΔT = {masa} kg · {const_mat['c_liquido']} J/(kg·°C) · {(T_fin-T_inicio):.2f} °C",
-                    'valor': Q3,
-                    'rango': f"{T_inicio}°C → {T_fin}°C"
-                })
-                Q_total += Q3
-                temperaturas.append(T_fin)
-                energias.append(Q_total)
-        
-        # Fase 4: Vaporización (100°C)
-        if Ti < 100 and Tf > 100:
-            Q4 = masa * const_mat['Lv']
-            resultados.append({
-                'fase': "Vaporización del Agua",
-                'formula': f"Q = m · L_v = {masa} kg · {const_mat['Lv']} J/kg",
-                'valor': Q4,
-                'rango': "100°C (cambio de fase)"
-            })
-            Q_total += Q4
-            temperaturas.append(100)
-            energias.append(Q_total)
+        Args:
+            material (str): Nombre del material
+            masa (float): Masa en kg
+            temp_inicial (float): Temperatura inicial en °C
+            temp_final (float): Temperatura final en °C
         
-        # Fase 5: Calentar vapor (T > 100)
-        if Tf > 100:
-            T_inicio = max(100, Ti)
-            Q5 = masa * const_mat['c_gas'] * (Tf - T_inicio)
-            resultados.append({
-                'fase': "Calentar Vapor",
-                'formula': f"Q = m · c_vapor · ΔT = {masa} kg · {const_mat['c_gas']} J/(kg·°C) · {(Tf-T_inicio):.2f} °C",
-                'valor': Q5,
-                'rango': f"{T_inicio}°C → {Tf}°C"
-            })
-            Q_total += Q5
-            temperaturas.append(Tf)
-            energias.append(Q_total)
+        Returns:
+            ResultadoCalor: Resultado con sus etapas como EtapaCalor
+        """
+        Q_total, etapas = self.calcular_calor_numerico(
+            material, masa, temp_inicial, temp_final
+        )
+        return ResultadoCalor(material, masa, temp_inicial, temp_final, Q_total, etapas)
+    
+    def estadisticas_cache(self):
+        """
+        Devuelve los contadores de la caché de calcular_calor_total.
+        
+        Returns:
+            dict: aciertos, fallos, desalojos, invalidaciones, tamaño y tam_max
+        """
+        return {
+            'aciertos': self._aciertos,
+            'fallos': self._fallos,
+            'desalojos': self._desalojos,
+            'invalidaciones': self._invalidaciones,
+            'tamaño': len(self._cache),
+            'tam_max': self.tam_cache,
+        }
+    
+    def limpiar_cache(self):
+        """Vacía la caché y reinicia sus contadores."""
+        self._cache.clear()
+        self._aciertos = self._fallos = self._desalojos = self._invalidaciones = 0
+    
+    def calcular_calor_numerico(self, material, masa, temp_inicial, temp_final):
+        """
+        Calcula el calor total sin generar textos.
+        
+        Args:
+            material (str): Nombre del material
+            masa (float): Masa en kg
+            temp_inicial (float): Temperatura inicial en °C
+            temp_final (float): Temperatura final en °C
+        
+        Returns:
+            tuple: (Q_total, etapas) con etapas como lista de EtapaCalor
+        """
+        tabla = self._tabla(material)
+        Q_total = masa * (tabla.entalpia(temp_final) - tabla.entalpia(temp_inicial))
+        etapas = [
+            EtapaCalor(material, fase, T_inicio, T_fin, masa, constante, masa * q)
+            for fase, T_inicio, T_fin, constante, q in tabla.etapas(temp_inicial, temp_final)
+        ]
+        
+        return Q_total, etapas
+    
+    def calcular_calor(self, material, masa, temp_inicial, temp_final):
+        """
+        Calcula solo el calor total, sin desglose por etapas.
+        
+        Args:
+            material (str): Nombre del material
+            masa (float): Masa en kg
+            temp_inicial (float): Temperatura inicial en °C
+            temp_final (float): Temperatura final en °C
+        
+        Returns:
+            float: Calor total en Joules (negativo al enfriar)
+        """
+        tabla = self._tabla(material)
+        return masa * (tabla.entalpia(temp_final) - tabla.entalpia(temp_inicial))
+    
+    def calcular_temperatura_final(self, material, masa, temp_inicial, calor):
+        """
+        Calcula la temperatura final tras aportar (o quitar) un calor dado.
+        
+        Invierte la curva de entalpía del material, por lo que tiene en cuenta
+        los cambios de fase que se crucen. Si el calor no alcanza para completar
+        un cambio de fase, la temperatura queda en la meseta y se informa la
+        fracción transformada (por ejemplo, hielo a 0 °C con 40 % fundido).
+        
+        Args:
+            material (str): Nombre del material
+            masa (float): Masa en kg
+            temp_inicial (float): Temperatura inicial en °C
+            calor (float): Calor aportado en J (negativo si se extrae)
+        
+        Returns:
+            tuple: (temp_final, fase, fraccion) con fraccion entre 0 y 1 si
+                   termina en un cambio de fase, o None en otro caso
+        """
+        if masa <= 0:
+            raise ValueError("La masa debe ser mayor que cero")
+        
+        tabla = self._tabla(material)
+        return tabla.temperatura(tabla.entalpia(temp_inicial) + calor / masa)
+    
+    def calcular_temperatura_final_lote(self, material, masas, temps_iniciales, calores):
+        """
+        Calcula temperaturas finales para muchos casos de un mismo material.
+        
+        Args:
+            material (str): Nombre del material
+            masas (array_like): Masas en kg
+            temps_iniciales (array_like): Temperaturas iniciales en °C
+            calores (array_like): Calores aportados en J
+        
+        Returns:
+            tuple: (temps_finales, codigos_fase, fracciones) como ndarrays;
+                   codigos_fase indexa fases_material(material) y fracciones
+                   es NaN fuera de los cambios de fase
+        """
+        masas = np.asarray(masas, dtype=float)
+        Ti = np.asarray(temps_iniciales, dtype=float)
+        calores = np.asarray(calores, dtype=float)
+        if np.any(masas <= 0):
+            raise ValueError("Las masas deben ser mayores que cero")
+        
+        tabla = self._tabla(material)
+        return tabla.temperatura_lote(tabla.entalpia_lote(Ti) + calores / masas)
+    
+    def simular_calentamiento(self, material, masa, temp_inicial, potencia, t_max, **opciones):
+        """
+        Simula la temperatura en el tiempo con una potencia y pérdidas al ambiente.
+        
+        Es un generador: los estados salen a medida que se calculan. Las
+        opciones (coef_perdidas, T_ambiente, paso_salida, temp_objetivo,
+        paso_temperatura) se describen en simulacion.simular.
         
-        return Q_total, temperaturas, energias
+        Args:
+            material (str): Nombre del material
+            masa (float): Masa en kg
+            temp_inicial (float): Temperatura inicial en °C
+            potencia (float | list): Potencia en W, o escalones [(t_inicio, P), ...]
+            t_max (float): Tiempo máximo a simular en s
+        
+        Returns:
+            generator: EstadoSimulacion en orden de tiempo
+        """
+        return simular(self._tabla(material), masa, temp_inicial, potencia, t_max, **opciones)
     
-    def _calcular_otro_material(self, masa, Ti, Tf, const_mat, resultados):
-        """Calcula calor para materiales sin todas las fases."""
-        temperaturas = [Ti]
+    def fases_material(self, material):
+        """
+        Lista las fases del material en orden de temperatura.
+        
+        Returns:
+            list: Identificadores de fase, alternando tramos sensibles y
+                  cambios de fase (por ejemplo 'solido', 'fusion', 'liquido')
+        """
+        return list(self._tabla(material).fases)
+    
+    def invalidar(self, material=None):
+        """
+        Avisa que las constantes de un material se modificaron en el lugar.
+        
+        Si se reemplaza el dict de un material el cambio se detecta solo;
+        si se cambian sus claves hay que llamar a este método. La tabla se
+        recompila al volver a usarla, solo si la huella de las constantes
+        es distinta.
+        
+        Args:
+            material (str): Material modificado (por defecto, todos)
+        """
+        nombres = list(self._tablas) if material is None else [material]
+        for nombre in nombres:
+            entrada = self._tablas.get(nombre)
+            if entrada is not None:
+                self._tablas[nombre] = (None,) + entrada[1:]
+    
+    def _tabla(self, material):
+        """Devuelve la tabla de entalpía del material, compilándola si cambió."""
+        return self._compilado(material)[2]
+    
+    def _compilado(self, material):
+        """(constantes, huella, tabla, textos por fase) del material, al día."""
+        const_mat = self.constantes[material]
+        entrada = self._tablas.get(material)
+        if entrada is not None and entrada[0] is const_mat:
+            return entrada
+        
+        # Dict nuevo o invalidado: la huella decide si hace falta recompilar
+        huella = huella_material(const_mat)
+        if entrada is None or entrada[1] != huella:
+            tabla = TablaEntalpia(const_mat)
+            nombres = NOMBRES_FASES_MATERIAL.get(material, NOMBRES_FASES)
+            textos = {
+                fase: _textos_fase(nombres, fase, tramo.c, None)
+                for fase, tramo in zip(tabla.fases_sensibles, tabla.tramos) if tramo.constante
+            }
+            textos.update(
+                (fase, _textos_fase(nombres, fase, L, T_cambio))
+                for fase, L, T_cambio in zip(tabla.fases_latentes, tabla.latentes, tabla.transiciones)
+            )
+            entrada = (const_mat, huella, tabla, textos)
+        else:
+            entrada = (const_mat,) + entrada[1:]
+        self._tablas[material] = entrada
+        return entrada
+    
+    @staticmethod
+    def puntos_diagrama(temp_inicial, etapas):
+        """
+        Obtiene los puntos del diagrama temperatura-energía de un cálculo.
+        
+        Args:
+            temp_inicial (float): Temperatura inicial en °C
+            etapas (list): Lista de EtapaCalor
+        
+        Returns:
+            tuple: (temperaturas, energias) acumuladas etapa por etapa
+        """
+        temperaturas = [temp_inicial]
         energias = [0]
-        Q_total = 0
+        Q_acumulado = 0
+        for etapa in etapas:
+            Q_acumulado += etapa.valor
+            temperaturas.append(etapa.T_fin)
+            energias.append(Q_acumulado)
+        return temperaturas, energias
+    
+    def calcular_calor_lote(self, material, masas, temps_iniciales, temps_finales):
+        """
+        Calcula el calor total para muchos casos de un mismo material.
         
-        T_fus = const_mat['T_fusion']
+        El calor total sale de la tabla de entalpía del material y el desglose
+        se evalúa con recortes de NumPy sobre todo el lote, sin ramas por fila.
+        Los enfriamientos (Tf < Ti) dan calores negativos.
         
-        # Calentar sólido hasta fusión
-        if Ti < T_fus and Tf > Ti:
-            T_fin = min(T_fus, Tf)
-            Q1 = masa * const_mat['c_solido'] * (T_fin - Ti)
-            resultados.append({
-                'fase': "Calentar Sólido",
-                'formula': f"Q = m · c_sólido · ΔT = {masa} kg · {const_mat['c_solido']} J/(kg·°C) · {(T_fin-Ti):.2f} °C",
-                'valor': Q1,
-                'rango': f"{Ti}°C → {T_fin}°C"
-            })
-            Q_total += Q1
-            temperaturas.append(T_fin)
-            energias.append(Q_total)
+        Args:
+            material (str): Nombre del material
+            masas (array_like): Masas en kg
+            temps_iniciales (array_like): Temperaturas iniciales en °C
+            temps_finales (array_like): Temperaturas finales en °C
         
-        # Fusión
-        if Ti <= T_fus and Tf > T_fus:
-            Q2 = masa * const_mat['Lf']
-            resultados.append({
-                'fase': "Fusión",
-                'formula': f"Q = m · L_f = {masa} kg · {const_mat['Lf']} J/kg",
-                'valor': Q2,
-                'rango': f"{T_fus}°C (cambio de fase)"
-            })
-            Q_total += Q2
-            temperaturas.append(T_fus)
-            energias.append(Q_total)
+        Returns:
+            tuple: (Q_total, calores_por_fase) donde Q_total es un ndarray y
+                   calores_por_fase un dict {fase: ndarray} en J
+        """
+        masas = np.asarray(masas, dtype=float)
+        Ti = np.asarray(temps_iniciales, dtype=float)
+        Tf = np.asarray(temps_finales, dtype=float)
+        masas, Ti, Tf = np.broadcast_arrays(masas, Ti, Tf)
         
-        # Calentar líquido
-        if Tf > T_fus:
-            T_inicio = max(T_fus, Ti)
-            Q3 = masa * const_mat['c_liquido'] * (Tf - T_inicio)
-            resultados.append({
-                'fase': "Calentar Líquido",
-                'formula': f"Q = m · c_líquido · ΔT = {masa} kg · {const_mat['c_liquido']} J/(kg·°C) · {(Tf-T_inicio):.2f} °C",
-                'valor': Q3,
-                'rango': f"{T_inicio}°C → {Tf}°C"
-            })
-            Q_total += Q3
-            temperaturas.append(Tf)
-            energias.append(Q_total)
+        tabla = self._tabla(material)
+        with PERFILADOR.tramo('entalpia_lote', 'lote'):
+            Q_total = masas * (tabla.entalpia_lote(Tf) - tabla.entalpia_lote(Ti))
+        with PERFILADOR.tramo('calores_por_fase_lote', 'lote'):
+            calores_por_fase = {
+                fase: masas * q for fase, q in tabla.calores_por_fase_lote(Ti, Tf).items()
+            }
+        
+        return Q_total, calores_por_fase
+    
+    def calcular_etapas_lote(self, material, masas, temps_iniciales, temps_finales):
+        """
+        Calcula el desglose por etapas de muchos casos de un mismo material.
+        
+        Las etapas de todo el lote quedan en un único arreglo estructurado
+        (DTYPE_ETAPAS) en lugar de una lista de dicts por caso.
+        
+        Args:
+            material (str): Nombre del material
+            masas (array_like): Masas en kg
+            temps_iniciales (array_like): Temperaturas iniciales en °C
+            temps_finales (array_like): Temperaturas finales en °C
+        
+        Returns:
+            tuple: (Q_total, etapas) donde Q_total es un ndarray por caso y
+                   etapas un arreglo DTYPE_ETAPAS ordenado por fila y en
+                   orden de recorrido
+        """
+        masas, Ti, Tf = np.broadcast_arrays(
+            np.asarray(masas, dtype=float),
+            np.asarray(temps_iniciales, dtype=float),
+            np.asarray(temps_finales, dtype=float)
+        )
+        masas, Ti, Tf = masas.ravel(), Ti.ravel(), Tf.ravel()
+        
+        tabla = self._tabla(material)
+        Q_total = masas * (tabla.entalpia_lote(Tf) - tabla.entalpia_lote(Ti))
+        filas, codigos, T_inicio, T_fin, q = tabla.etapas_lote(Ti, Tf)
+        etapas = np.empty(len(filas), dtype=DTYPE_ETAPAS)
+        etapas['fila'] = filas
+        etapas['fase'] = codigos
+        etapas['T_inicio'] = T_inicio
+        etapas['T_fin'] = T_fin
+        etapas['Q'] = masas[filas] * q
+        
+        return Q_total, etapas
+    
+    def etapas_desde_lote(self, material, masa, etapas):
+        """
+        Convierte las etapas compactas de un caso en EtapaCalor.
         
-        return Q_total, temperaturas, energias
+        Args:
+            material (str): Nombre del material
+            masa (float): Masa del caso en kg
+            etapas (ndarray): Filas DTYPE_ETAPAS de ese caso
+                              (por ejemplo etapas[etapas['fila'] == i])
+        
+        Returns:
+            list: EtapaCalor en orden de recorrido; a_dict() da el formato
+                  de la interfaz
+        """
+        tabla = self._tabla(material)
+        salida = []
+        for codigo, T_inicio, T_fin, Q in zip(etapas['fase'].tolist(), etapas['T_inicio'].tolist(),
+                                              etapas['T_fin'].tolist(), etapas['Q'].tolist()):
+            fase = tabla.fases[codigo]
+            if codigo % 2:
+                constante = tabla.latentes[codigo // 2]
+            else:
+                tramo = tabla.tramos[codigo // 2]
+                constante = tramo.c if tramo.constante else Q / (masa * (T_fin - T_inicio))
+            salida.append(EtapaCalor(material, fase, T_inicio, T_fin, masa, constante, Q))
+        return salida
+    
+    def calcular_calor_lote_agrupado(self, materiales, masas, temps_iniciales, temps_finales):
+        """
+        Calcula el calor total para un lote con materiales mezclados.
+        
+        Las filas se agrupan por material y cada grupo se resuelve con
+        calcular_calor_lote; sus resultados vuelven a las filas del grupo.
+        
+        Args:
+            materiales (array_like): Nombre del material de cada fila
+            masas (array_like): Masas en kg
+            temps_iniciales (array_like): Temperaturas iniciales en °C
+            temps_finales (array_like): Temperaturas finales en °C
+        
+        Returns:
+            tuple: (Q_total, calores_por_fase) como en calcular_calor_lote, en
+                   el orden de entrada; una fase que el material de una fila
+                   no tiene (por ejemplo 'gas') vale 0 en esa fila
+        """
+        materiales = np.asarray(materiales)
+        masas = np.asarray(masas, dtype=float)
+        Ti = np.asarray(temps_iniciales, dtype=float)
+        Tf = np.asarray(temps_finales, dtype=float)
+        
+        Q_total = np.empty(materiales.shape)
+        por_fase = {}
+        with PERFILADOR.tramo('agrupar_materiales', 'lote'):
+            grupos = self._grupos_material(materiales)
+        for material, filas in grupos:
+            with PERFILADOR.tramo('calcular_calor_lote', 'lote', material=material):
+                Q_total[filas], calores = self.calcular_calor_lote(
+                    material, masas[filas], Ti[filas], Tf[filas]
+                )
+            for fase, calor in calores.items():
+                if fase not in por_fase:
+                    por_fase[fase] = np.zeros(materiales.shape)
+                por_fase[fase][filas] = calor
+        
+        # Mismo orden de fases que calcular_calor_lote
+        calores_por_fase = {fase: por_fase[fase] for fase in NOMBRES_FASES if fase in por_fase}
+        return Q_total, calores_por_fase
+    
+    def calcular_barrido_temperaturas(self, material, masa, temps_iniciales, temps_finales):
+        """
+        Calcula el calor total sobre una malla de temperaturas iniciales y finales.
+        
+        H(T) se evalúa una sola vez por valor de cada eje y la malla sale de
+        la diferencia exterior, así que una malla de 2000×2000 cuesta 4000
+        evaluaciones de entalpía.
+        
+        Args:
+            material (str): Nombre del material
+            masa (float): Masa en kg
+            temps_iniciales (array_like): Eje de temperaturas iniciales en °C
+            temps_finales (array_like): Eje de temperaturas finales en °C
+        
+        Returns:
+            ndarray: Q[i, j] en J para temps_iniciales[i] y temps_finales[j]
+        """
+        tabla = self._tabla(material)
+        H_inicial = tabla.entalpia_lote(np.asarray(temps_iniciales, dtype=float))
+        H_final = tabla.entalpia_lote(np.asarray(temps_finales, dtype=float))
+        return masa * np.subtract.outer(H_final, H_inicial).T
+    
+    def calcular_barrido_masa(self, material, masas, deltas, temp_inicial):
+        """
+        Calcula el calor total sobre una malla de masas y cambios de temperatura.
+        
+        Args:
+            material (str): Nombre del material
+            masas (array_like): Eje de masas en kg
+            deltas (array_like): Eje de cambios de temperatura ΔT en °C
+            temp_inicial (float): Temperatura inicial común en °C
+        
+        Returns:
+            ndarray: Q[i, j] en J para masas[i] y deltas[j]
+        """
+        tabla = self._tabla(material)
+        deltas = np.asarray(deltas, dtype=float)
+        q = tabla.entalpia_lote(temp_inicial + deltas) - tabla.entalpia(temp_inicial)
+        return np.multiply.outer(np.asarray(masas, dtype=float), q)
+    
+    @staticmethod
+    def _grupos_material(materiales):
+        """Agrupa las filas de un lote por material: [(material, máscara), ...]."""
+        nombres, grupos = np.unique(materiales, return_inverse=True)
+        grupos = grupos.reshape(np.shape(materiales))
+        return [(str(material), grupos == i) for i, material in enumerate(nombres)]
+    
+    def calcular_equilibrio(self, cuerpos):
+        """
+        Calcula la temperatura de equilibrio al poner varios cuerpos en contacto.
+        
+        Aplica la conservación de la energía (Q_cedido + Q_absorbido = 0)
+        teniendo en cuenta los cambios de fase; si el equilibrio queda en una
+        meseta (por ejemplo, hielo a 0 °C parcialmente fundido) se informa la
+        fracción transformada de cada cuerpo afectado.
+        
+        Args:
+            cuerpos (iterable): Tuplas (material, masa, temp_inicial)
+        
+        Returns:
+            tuple: (temp_equilibrio, estados) con estados como lista de
+                   (fase, fraccion) por cuerpo; fraccion es None fuera de
+                   los cambios de fase
+        """
+        cuerpos = list(cuerpos)
+        if not cuerpos:
+            raise ValueError("Se necesita al menos un cuerpo")
+        
+        materiales, masas, temps_iniciales = zip(*cuerpos)
+        T_eq, codigos, fracciones = self.calcular_equilibrio_lote(
+            materiales, masas, temps_iniciales, np.zeros(len(cuerpos), dtype=int)
+        )
+        
+        estados = []
+        for material, codigo, fraccion in zip(materiales, codigos, fracciones):
+            fase = self._tabla(material).fases[codigo]
+            estados.append((fase, None if np.isnan(fraccion) else float(fraccion)))
+        return float(T_eq[0]), estados
+    
+    def calcular_equilibrio_lote(self, materiales, masas, temps_iniciales, problemas,
+                                 tolerancia=1e-9, max_iteraciones=200):
+        """
+        Resuelve muchos problemas de mezcla independientes a la vez.
+        
+        La entalpía total de cada problema es monótona en T, así que se acota
+        la temperatura de equilibrio entre la menor y la mayor temperatura
+        inicial y se biseca sobre la suma de las curvas de entalpía, con todos
+        los problemas avanzando juntos en operaciones vectorizadas.
+        
+        Args:
+            materiales (array_like): Material de cada cuerpo
+            masas (array_like): Masa de cada cuerpo en kg
+            temps_iniciales (array_like): Temperatura inicial de cada cuerpo en °C
+            problemas (array_like): Índice (0..P-1) del problema de cada cuerpo
+            tolerancia (float): Ancho relativo del intervalo al que se detiene la bisección
+            max_iteraciones (int): Límite de iteraciones de bisección
+        
+        Returns:
+            tuple: (temps_equilibrio, codigos_fase, fracciones); la primera con
+                   una temperatura por problema y las otras con un valor por
+                   cuerpo, como en calcular_temperatura_final_lote
+        """
+        materiales = np.asarray(materiales)
+        masas = np.asarray(masas, dtype=float)
+        Ti = np.asarray(temps_iniciales, dtype=float)
+        problemas = np.asarray(problemas, dtype=int)
+        if np.any(masas <= 0):
+            raise ValueError("Las masas deben ser mayores que cero")
+        
+        n_problemas = problemas.max() + 1
+        # Índices, masas y problema de cada grupo se extraen una sola vez
+        grupos = []
+        for material, filas in self._grupos_material(materiales):
+            filas = np.flatnonzero(filas)
+            grupos.append((self._tabla(material), filas, masas[filas], problemas[filas]))
+        
+        def sumar(valores, p):
+            return np.bincount(p, valores, minlength=n_problemas)
+        
+        def entalpia_total(T):
+            # Entalpía de cada problema si todos sus cuerpos estuvieran a T[problema]
+            total = np.zeros(n_problemas)
+            for tabla, _, m, p in grupos:
+                total += sumar(m * tabla.entalpia_lote(T[p]), p)
+            return total
+        
+        E = np.zeros(n_problemas)
+        for tabla, filas, m, p in grupos:
+            E += sumar(m * tabla.entalpia_lote(Ti[filas]), p)
+        
+        # Problemas sin cuerpos: se dejan en 0 °C y se marcan al final
+        vacios = np.bincount(problemas, minlength=n_problemas) == 0
+        bajo = np.full(n_problemas, np.inf)
+        alto = np.full(n_problemas, -np.inf)
+        np.minimum.at(bajo, problemas, Ti)
+        np.maximum.at(alto, problemas, Ti)
+        bajo[vacios] = alto[vacios] = 0.0
+        
+        for _ in range(max_iteraciones):
+            if np.all(alto - bajo <= tolerancia * (1 + np.abs(alto))):
+                break
+            medio = (bajo + alto) / 2
+            debajo = entalpia_total(medio) < E
+            bajo = np.where(debajo, medio, bajo)
+            alto = np.where(debajo, alto, medio)
+        
+        # Si un punto de cambio de fase quedó dentro del intervalo final,
+        # el equilibrio está en esa meseta
+        margen = tolerancia * (1 + np.abs(alto))
+        T_eq = alto.copy()
+        T_meseta = np.full(n_problemas, np.nan)
+        for tabla, _, _, p in grupos:
+            for T_cambio in tabla.transiciones:
+                dentro = (bajo[p] - margen[p] <= T_cambio) & (T_cambio <= alto[p] + margen[p])
+                T_meseta[p[dentro]] = T_cambio
+        en_meseta = ~np.isnan(T_meseta)
+        T_eq[en_meseta] = T_meseta[en_meseta]
+        
+        # Entalpía final de cada cuerpo: la del lado inferior de la meseta más
+        # la parte del calor sobrante que le toca según su calor latente
+        H_final = np.zeros(len(masas))
+        capacidad = np.zeros(len(masas))
+        for tabla, filas, m, p in grupos:
+            H_final[filas] = tabla.entalpia_lote(T_eq[p])
+            for T_cambio, L in zip(tabla.transiciones, tabla.latentes):
+                capacidad[filas] += np.where(T_meseta[p] == T_cambio, m * L, 0.0)
+        sobrante = E - sumar(masas * H_final, problemas)
+        capacidad_total = sumar(capacidad, problemas)
+        fraccion = np.zeros(n_problemas)
+        np.divide(sobrante, capacidad_total, out=fraccion, where=capacidad_total > 0)
+        fraccion = np.clip(fraccion, 0.0, 1.0)
+        H_final += capacidad / masas * fraccion[problemas]
+        
+        codigos = np.zeros(len(masas), dtype=int)
+        fracciones = np.full(len(masas), np.nan)
+        for tabla, filas, _, _ in grupos:
+            _, codigos[filas], fracciones[filas] = tabla.temperatura_lote(H_final[filas])
+        
+        T_eq[vacios] = np.nan
+        return T_eq, codigos, fracciones
     
     @staticmethod
     def formatear_resultados(Q_total, resultados):
@@ -189,28 +841,12 @@ class CalculadoraCalor:
         
         Args:
             Q_total (float): Calor total en Joules
-            resultados (list): Lista de resultados por etapa
-            
+            resultados (list): Lista de resultados por etapa (dicts o EtapaCalor)
+        
         Returns:
             str: Texto formateado para mostrar
         """
-        texto = "═" * 80 + "\n"
-        texto += "RESULTADOS DEL CÁLCULO\n"
-        texto += "═" * 80 + "\n\n"
-        
-        for i, r in enumerate(resultados, 1):
-            texto += f"Etapa {i}: {r['fase']}\n"
-            texto += f"Rango: {r['rango']}\n"
-            texto += f"Fórmula: {r['formula']}\n"
-            texto += f"Q{i} = {r['valor']:.2f} J = {r['valor']/1000:.2f} kJ\n"
-            texto += "-" * 80 + "\n\n"
-        
-        texto += "═" * 80 + "\n"
-        texto += "CALOR TOTAL:\n"
-        texto += f"Q_total = {' + '.join([f'Q{i+1}' for i in range(len(resultados))])}\n"
-        texto += f"Q_total = {Q_total:.2f} J\n"
-        texto += f"Q_total = {Q_total/1000:.2f} kJ\n"
-        texto += f"Q_total = {Q_total/1000000:.2f} MJ\n"
-        texto += "═" * 80 + "\n"
-        
-        return texto
+        # Usa el mismo informe que los reportes por lotes, escrito en memoria
+        salida = io.StringIO()
+        InformeTexto(salida).escribir(Q_total, resultados)
+        return salida.getvalue()
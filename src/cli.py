@@ -0,0 +1,354 @@
+"""
+Modo por lotes sin interfaz gráfica.
+
+Lee casos (material, masa, temperatura inicial y final) desde un archivo
+CSV o JSONL, o desde la entrada estándar, y escribe un resultado por fila
+a medida que los calcula. Nunca carga el archivo completo en memoria.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from itertools import chain, islice
+
+import numpy as np
+
+from cache_persistente import CachePersistente
+from calculator import CalculadoraCalor
+from informe import INFORMES, escribir_informe
+from materiales import cargar_materiales
+from perfilado import PERFILADOR
+
+
+# Nombres aceptados para cada campo de entrada
+ALIAS_CAMPOS = {
+    'material': ('material',),
+    'masa': ('masa', 'm'),
+    'temp_inicial': ('temp_inicial', 'Ti'),
+    'temp_final': ('temp_final', 'Tf'),
+}
+
+FASES_SALIDA = ('solido', 'fusion', 'liquido', 'vaporizacion', 'gas')
+
+COLUMNAS_DISPONIBLES = (
+    ('material', 'masa', 'temp_inicial', 'temp_final', 'Q_total')
+    + tuple(f'Q_{fase}' for fase in FASES_SALIDA)
+    + ('quiebres',)
+)
+
+COLUMNAS_POR_DEFECTO = ('material', 'masa', 'temp_inicial', 'temp_final', 'Q_total')
+
+# Filas que se consultan y guardan juntas en la caché persistente
+TAM_BLOQUE_CACHE = 4096
+
+
+class FilaInvalida(ValueError):
+    """Línea de entrada que no se pudo interpretar."""
+
+
+def leer_filas(archivo, formato='auto'):
+    """
+    Genera las filas de entrada como diccionarios, una a la vez.
+    
+    Una línea JSONL mal formada no corta la lectura: en lugar del
+    diccionario se produce una FilaInvalida, que leer_caso vuelve a lanzar
+    para que se informe como cualquier otra fila con error.
+    
+    Args:
+        archivo: Archivo de texto abierto
+        formato (str): 'csv', 'jsonl' o 'auto' (según la primera línea)
+    
+    Yields:
+        tuple: (numero_de_linea, fila)
+    """
+    if formato == 'auto':
+        primera = archivo.readline()
+        formato = 'jsonl' if primera.lstrip().startswith('{') else 'csv'
+        lineas = chain([primera], archivo)
+    else:
+        lineas = archivo
+    
+    if formato == 'jsonl':
+        for numero, linea in enumerate(lineas, 1):
+            if linea.strip():
+                try:
+                    fila = json.loads(linea)
+                except json.JSONDecodeError as e:
+                    fila = FilaInvalida(f"JSON inválido: {e}")
+                if not isinstance(fila, (dict, FilaInvalida)):
+                    fila = FilaInvalida("la línea no es un objeto JSON")
+                yield numero, fila
+    else:
+        lector = csv.DictReader(lineas)
+        for fila in lector:
+            yield lector.line_num, fila
+
+
+def _campo(fila, nombre):
+    for alias in ALIAS_CAMPOS[nombre]:
+        if alias in fila:
+            return fila[alias]
+    raise KeyError(f"falta la columna '{nombre}'")
+
+
+def leer_caso(calculadora, fila):
+    """Devuelve (material, masa, Ti, Tf) de una fila de entrada."""
+    if isinstance(fila, FilaInvalida):
+        raise fila
+    material = _campo(fila, 'material')
+    if material not in calculadora.constantes:
+        raise ValueError(f"material desconocido: {material}")
+    masa = float(_campo(fila, 'masa'))
+    Ti = float(_campo(fila, 'temp_inicial'))
+    Tf = float(_campo(fila, 'temp_final'))
+    return material, masa, Ti, Tf
+
+
+def calcular_fila(calculadora, fila, columnas):
+    """
+    Calcula una fila de entrada y devuelve solo las columnas pedidas.
+    
+    Args:
+        calculadora (CalculadoraCalor): Calculadora a usar
+        fila (dict): Fila de entrada
+        columnas (sequence): Columnas de salida
+    
+    Returns:
+        dict: Valores de salida por columna
+    """
+    material, masa, Ti, Tf = leer_caso(calculadora, fila)
+    Q_total, etapas = calculadora.calcular_calor_numerico(material, masa, Ti, Tf)
+    
+    salida = {
+        'material': material,
+        'masa': masa,
+        'temp_inicial': Ti,
+        'temp_final': Tf,
+        'Q_total': Q_total,
+    }
+    for fase in FASES_SALIDA:
+        salida[f'Q_{fase}'] = 0.0
+    for etapa in etapas:
+        salida[f'Q_{etapa.fase}'] += etapa.valor
+    if 'quiebres' in columnas:
+        salida['quiebres'] = list(zip(*CalculadoraCalor.puntos_diagrama(Ti, etapas)))
+    
+    return {columna: salida[columna] for columna in columnas}
+
+
+class EscritorCSV:
+    """Escribe resultados como CSV, una fila por resultado."""
+    
+    def __init__(self, archivo, columnas):
+        self.columnas = columnas
+        self.escritor = csv.writer(archivo, lineterminator='\n')
+        self.escritor.writerow(columnas)
+    
+    def escribir(self, resultado):
+        fila = []
+        for columna in self.columnas:
+            valor = resultado[columna]
+            if columna == 'quiebres':
+                # T:E separados por ';' para mantener una sola celda
+                valor = ';'.join(f'{T}:{E}' for T, E in valor)
+            fila.append(valor)
+        self.escritor.writerow(fila)
+
+
+class EscritorJSONL:
+    """Escribe resultados como un objeto JSON por línea."""
+    
+    def __init__(self, archivo, columnas):
+        self.archivo = archivo
+    
+    def escribir(self, resultado):
+        self.archivo.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+
+
+ESCRITORES = {
+    'csv': EscritorCSV,
+    'jsonl': EscritorJSONL,
+}
+
+
+def procesar(entrada, salida, columnas=COLUMNAS_POR_DEFECTO, formato_entrada='auto',
+             formato_salida='csv', calculadora=None, errores=sys.stderr, cache=None):
+    """
+    Procesa un flujo de casos y escribe los resultados fila por fila.
+    
+    Las filas con errores se informan en `errores` y se omiten. Con una
+    CachePersistente las filas se calculan por bloques y solo se calculan
+    las que no estaban guardadas (no admite la columna 'quiebres').
+    
+    Returns:
+        tuple: (filas_procesadas, filas_con_error)
+    """
+    calculadora = calculadora or CalculadoraCalor()
+    escritor = ESCRITORES[formato_salida](salida, columnas)
+    if cache is not None:
+        if 'quiebres' in columnas:
+            raise ValueError("la caché persistente no guarda la columna 'quiebres'")
+        return _procesar_con_cache(leer_filas(entrada, formato_entrada), escritor, columnas,
+                                   calculadora, cache, errores)
+    procesadas = 0
+    fallidas = 0
+    
+    for numero, fila in leer_filas(entrada, formato_entrada):
+        try:
+            with PERFILADOR.tramo('calcular_fila', 'lote', linea=numero):
+                resultado = calcular_fila(calculadora, fila, columnas)
+        except (KeyError, ValueError, TypeError) as e:
+            fallidas += 1
+            errores.write(f"Línea {numero}: {e}\n")
+            continue
+        with PERFILADOR.tramo('escribir_fila', 'lote'):
+            escritor.escribir(resultado)
+        procesadas += 1
+    
+    return procesadas, fallidas
+
+
+def _procesar_con_cache(filas, escritor, columnas, calculadora, cache, errores):
+    procesadas = 0
+    fallidas = 0
+    
+    for bloque in iter(lambda: list(islice(filas, TAM_BLOQUE_CACHE)), []):
+        casos = []
+        for numero, fila in bloque:
+            try:
+                casos.append(leer_caso(calculadora, fila))
+            except (KeyError, ValueError, TypeError) as e:
+                fallidas += 1
+                errores.write(f"Línea {numero}: {e}\n")
+        
+        por_material = {}
+        for i, caso in enumerate(casos):
+            por_material.setdefault(caso[0], []).append(i)
+        
+        salidas = [None] * len(casos)
+        with PERFILADOR.tramo('calcular_bloque', 'lote', filas=len(casos)):
+            for material, indices in por_material.items():
+                masas, Ti, Tf = np.array([casos[i][1:] for i in indices]).T
+                Q_total, por_fase = cache.calcular_lote(calculadora, material, masas, Ti, Tf)
+                for k, i in enumerate(indices):
+                    salida = dict(zip(('material', 'masa', 'temp_inicial', 'temp_final'), casos[i]))
+                    salida['Q_total'] = float(Q_total[k])
+                    for fase in FASES_SALIDA:
+                        salida[f'Q_{fase}'] = float(por_fase[fase][k])
+                    salidas[i] = {columna: salida[columna] for columna in columnas}
+        
+        with PERFILADOR.tramo('escribir_bloque', 'lote', filas=len(salidas)):
+            for resultado in salidas:
+                escritor.escribir(resultado)
+        procesadas += len(salidas)
+    
+    return procesadas, fallidas
+
+
+def procesar_informe(entrada, salida, formato='texto', formato_entrada='auto',
+                     calculadora=None, errores=sys.stderr):
+    """
+    Escribe un informe con el desglose por etapas de cada fila de entrada.
+    
+    Las filas se calculan y se escriben de a una, así que el informe nunca
+    se arma completo en memoria. Las filas con errores se informan en
+    `errores` y se omiten.
+    
+    Returns:
+        tuple: (filas_procesadas, filas_con_error)
+    """
+    calculadora = calculadora or CalculadoraCalor()
+    fallidas = 0
+    
+    def resultados():
+        nonlocal fallidas
+        for numero, fila in leer_filas(entrada, formato_entrada):
+            try:
+                material, masa, Ti, Tf = leer_caso(calculadora, fila)
+                with PERFILADOR.tramo('calcular_fila', 'lote', linea=numero):
+                    Q_total, etapas = calculadora.calcular_calor_numerico(material, masa, Ti, Tf)
+            except (KeyError, ValueError, TypeError) as e:
+                fallidas += 1
+                errores.write(f"Línea {numero}: {e}\n")
+                continue
+            yield f"{material}, {masa} kg, {Ti} °C → {Tf} °C", Q_total, etapas
+    
+    procesadas = escribir_informe(salida, resultados(), formato)
+    return procesadas, fallidas
+
+
+def _columnas(texto):
+    columnas = tuple(c.strip() for c in texto.split(',') if c.strip())
+    desconocidas = [c for c in columnas if c not in COLUMNAS_DISPONIBLES]
+    if desconocidas:
+        raise argparse.ArgumentTypeError(
+            f"columnas desconocidas: {', '.join(desconocidas)} "
+            f"(disponibles: {', '.join(COLUMNAS_DISPONIBLES)})"
+        )
+    return columnas
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py lote',
+        description="Calcula el calor total de cada fila de un archivo CSV o JSONL."
+    )
+    parser.add_argument('entrada', nargs='?', default='-',
+                        help="Archivo de entrada ('-' para la entrada estándar)")
+    parser.add_argument('-o', '--salida', default='-',
+                        help="Archivo de salida ('-' para la salida estándar)")
+    parser.add_argument('--formato-entrada', choices=('auto', 'csv', 'jsonl'), default='auto')
+    parser.add_argument('--formato-salida', choices=tuple(ESCRITORES), default='csv')
+    parser.add_argument('--materiales',
+                        help="Archivo JSON o CSV con la base de materiales a usar")
+    parser.add_argument('-c', '--columnas', type=_columnas, default=COLUMNAS_POR_DEFECTO,
+                        help="Columnas de salida separadas por comas. Disponibles: "
+                             + ', '.join(COLUMNAS_DISPONIBLES))
+    parser.add_argument('--informe', choices=tuple(INFORMES),
+                        help="Escribir un informe con el desglose por etapas de cada fila "
+                             "en lugar de una tabla de columnas")
+    parser.add_argument('--cache', metavar='RUTA',
+                        help="Base SQLite donde guardar y reutilizar resultados entre ejecuciones")
+    parser.add_argument('--cache-max-filas', type=int, default=1_000_000,
+                        help="Filas máximas de la caché antes de descartar las menos usadas")
+    parser.add_argument('--perfil', metavar='TRAZA',
+                        help="Medir cada fila y guardar una traza JSON de Chrome en este archivo")
+    return parser
+
+
+def main_lote(argv=None):
+    """Punto de entrada del modo por lotes."""
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    if args.cache and (args.informe or 'quiebres' in args.columnas):
+        parser.error("--cache no admite --informe ni la columna 'quiebres'")
+    if args.perfil:
+        PERFILADOR.activar()
+    
+    calculadora = None
+    if args.materiales:
+        calculadora = CalculadoraCalor(cargar_materiales(args.materiales))
+    
+    entrada = sys.stdin if args.entrada == '-' else open(args.entrada, encoding='utf-8', newline='')
+    salida = sys.stdout if args.salida == '-' else open(args.salida, 'w', encoding='utf-8', newline='')
+    cache = CachePersistente(args.cache, args.cache_max_filas) if args.cache else None
+    try:
+        if args.informe:
+            _, fallidas = procesar_informe(entrada, salida, args.informe,
+                                           args.formato_entrada, calculadora)
+        else:
+            _, fallidas = procesar(entrada, salida, args.columnas,
+                                   args.formato_entrada, args.formato_salida, calculadora,
+                                   cache=cache)
+    finally:
+        if cache is not None:
+            cache.cerrar()
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+        if args.perfil:
+            PERFILADOR.exportar_chrome(args.perfil)
+    
+    return 1 if fallidas else 0
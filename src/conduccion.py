@@ -0,0 +1,575 @@
+"""
+Conducción de calor transitoria en 1D con cambio de fase (método de entalpía).
+
+Una barra (o placa delgada) de longitud L se divide en n volúmenes finitos.
+La incógnita de cada volumen es su entalpía específica h, de modo que los
+frentes de fusión y vaporización aparecen solos donde h cruza una meseta
+de la curva H(T) del material (problema de Stefan):
+
+    ρ · ∂h/∂t = ∂/∂x (k · ∂T/∂x),    T = T(h)
+
+Cada paso de tiempo es implícito: h + A·T(h) = b, con A la matriz
+tridiagonal de la conducción y b la entalpía anterior más los aportes de
+los bordes. T(h) es lineal por tramos y creciente (pendiente 1/c en fase
+sensible y 0 en una meseta), así que resolverlo equivale a minimizar una
+función convexa de h, y se hace por Newton: cada iteración linealiza T
+alrededor de h y resuelve un sistema tridiagonal en O(n). Un volumen puede
+cruzar varios quiebres de H(T) en una misma iteración; cuando el paso
+completo de Newton no hace bajar esa función (el frente avanza mucho más
+que dx en el paso), se busca a lo largo de la misma dirección el punto donde
+deja de bajar. Así la iteración siempre converge sin recortar h, y la
+energía que entra por los bordes queda entera en la barra.
+
+El punto de partida sale de resolver el mismo paso en una malla con la mitad
+de los volúmenes (recursivamente hasta unos pocos), de modo que en mallas
+finas bastan unas pocas iteraciones por paso. Partir en cambio de la
+solución del paso anterior (tal cual o sumándole el cambio de ese paso)
+resulta más lento: cuando los frentes avanzan decenas de volúmenes por paso,
+Newton necesita desde ahí cientos de iteraciones en la malla fina.
+
+Costo: cada iteración resuelve un sistema tridiagonal (unos 5 ms con 10⁵
+volúmenes) y todas las mallas gruesas juntas cuestan más o menos lo mismo
+que la fina. Con 10⁵ volúmenes, un borde a 120 °C sobre hielo y dt = 1 s los
+frentes cruzan cientos de volúmenes por paso y un paso lleva en promedio
+≈0.5 s: unos 0.15 s cuando la malla fina converge en cinco o seis
+iteraciones y varios segundos cuando algún frente obliga a partirlo. Mil
+pasos así llevan minutos; con 2·10⁴ volúmenes y dt = 5 s, unos 0.1 s por paso.
+
+La densidad y la conductividad no forman parte de CONSTANTES_MATERIALES y
+se pasan al crear la barra.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+# Tipos de condición de borde: ('temperatura', T en °C) o ('flujo', q en W/m²
+# hacia dentro de la barra); ('flujo', 0) es un borde aislado
+AISLADO = ('flujo', 0.0)
+
+# Con hasta tantos volúmenes un paso se resuelve sin malla más gruesa
+_NODOS_MINIMOS = 32
+
+# Veces que un paso que no converge puede partirse a la mitad
+_SUBDIVISIONES = 10
+
+# Sistemas tridiagonales de menos filas se resuelven sin reducción cíclica
+_FILAS_DIRECTAS = 64
+
+
+PerfilConduccion = namedtuple('PerfilConduccion', 't x T fraccion frentes')
+PerfilConduccion.__doc__ = """
+Estado de la barra en un instante.
+
+t (s), x (posiciones de los nodos en m), T (°C), fraccion (parte fundida o
+vaporizada en cada nodo, de 0 a 1 por cada cambio de fase atravesado) y
+frentes ({fase: posiciones en m donde esa fracción cruza 0.5}).
+"""
+
+
+def resolver_tridiagonal(a, b, c, d):
+    """
+    Resuelve un sistema tridiagonal a·x[i-1] + b·x[i] + c·x[i+1] = d.
+    
+    Usa reducción cíclica: cada nivel elimina la mitad de las incógnitas
+    con operaciones de NumPy sobre arreglos completos, así que el trabajo
+    total es O(n) igual que el algoritmo de Thomas, pero sin un bucle de
+    Python por fila. El último nivel, de menos de _FILAS_DIRECTAS filas, se
+    resuelve como sistema denso. Es estable para matrices diagonalmente dominantes
+    (por filas o por columnas), como las de este módulo.
+    
+    Args:
+        a (ndarray): Subdiagonal (a[0] se ignora)
+        b (ndarray): Diagonal
+        c (ndarray): Superdiagonal (c[-1] se ignora)
+        d (ndarray): Término independiente
+    
+    Returns:
+        ndarray: Solución x
+    """
+    n = len(b)
+    # Con s·2^k - 1 filas todos los niveles hasta el directo tienen largo
+    # impar; las filas agregadas son x = 0 y no se acoplan con las reales.
+    # Con s entre _FILAS_DIRECTAS / 2 y _FILAS_DIRECTAS sobran pocas filas
+    k = max(0, (n + 1).bit_length() - _FILAS_DIRECTAS.bit_length() + 1)
+    m = -(-(n + 1) // (1 << k)) * (1 << k) - 1
+    A = np.zeros(m)
+    B = np.ones(m)
+    C = np.zeros(m)
+    D = np.zeros(m)
+    A[1:n] = a[1:n]
+    B[:n] = b
+    C[:n - 1] = c[:n - 1]
+    D[:n] = d
+    return _reduccion_ciclica(A, B, C, D)[:n]
+
+
+def _reduccion_ciclica(a, b, c, d):
+    if len(b) < _FILAS_DIRECTAS:
+        matriz = np.diag(b) + np.diag(a[1:], -1) + np.diag(c[:-1], 1)
+        return np.linalg.solve(matriz, d)
+    
+    # Eliminar las incógnitas pares de las ecuaciones impares
+    b_izq = b[0:-1:2]
+    b_der = b[2::2]
+    alfa = a[1::2] / b_izq
+    alfa *= -1
+    gamma = c[1::2] / b_der
+    gamma *= -1
+    
+    a2 = alfa * a[0:-1:2]
+    c2 = gamma * c[2::2]
+    b2 = alfa * c[0:-1:2]
+    b2 += b[1::2]
+    b2 += gamma * a[2::2]
+    d2 = alfa * d[0:-1:2]
+    d2 += d[1::2]
+    d2 += gamma * d[2::2]
+    x_impar = _reduccion_ciclica(a2, b2, c2, d2)
+    
+    # Sustituir hacia atrás las incógnitas pares
+    x_par = d[0::2].copy()
+    x_par[1:] -= a[2::2] * x_impar
+    x_par[:-1] -= c[0:-1:2] * x_impar
+    x_par /= b[0::2]
+    
+    x = np.empty(len(b))
+    x[0::2] = x_par
+    x[1::2] = x_impar
+    return x
+
+
+def _remapear(h, m):
+    """
+    Promedia h (n volúmenes iguales) sobre m volúmenes iguales de la misma barra.
+    
+    Conserva la integral: sum(h) / n == sum(resultado) / m.
+    """
+    n = len(h)
+    acumulado = np.concatenate(([0.0], np.cumsum(h)))
+    caras = np.linspace(0, n, m + 1)
+    return np.diff(np.interp(caras, np.arange(n + 1), acumulado)) * (m / n)
+
+
+class BarraConduccion:
+    """
+    Barra 1D de un material con conducción transitoria y cambios de fase.
+    
+    Ejemplo: barra de hielo a -10 °C con un extremo a 20 °C
+        
+        barra = BarraConduccion(tabla_agua, longitud=0.1, nodos=1000,
+                                densidad=917, conductividad=2.2, temp_inicial=-10,
+                                borde_izquierdo=('temperatura', 20))
+        for perfil in barra.simular(dt=1.0, pasos=3600, cada=600):
+            print(perfil.t, perfil.frentes)
+    """
+    
+    def __init__(self, tabla, longitud, nodos, densidad, conductividad, temp_inicial,
+                 borde_izquierdo=AISLADO, borde_derecho=AISLADO):
+        """
+        Args:
+            tabla (TablaEntalpia): Tabla de entalpía del material
+            longitud (float): Longitud de la barra en m
+            nodos (int): Número de volúmenes finitos
+            densidad (float): Densidad en kg/m³
+            conductividad (float): Conductividad térmica en W/(m·°C)
+            temp_inicial (float | array_like): Temperatura inicial en °C
+            borde_izquierdo (tuple): ('temperatura', T) o ('flujo', q)
+            borde_derecho (tuple): ('temperatura', T) o ('flujo', q)
+        """
+        if nodos < 1 or longitud <= 0 or densidad <= 0 or conductividad <= 0:
+            raise ValueError("Longitud, nodos, densidad y conductividad deben ser positivos")
+        for borde in (borde_izquierdo, borde_derecho):
+            if borde[0] not in ('temperatura', 'flujo'):
+                raise ValueError(f"Condición de borde desconocida: {borde[0]}")
+        
+        self.tabla = tabla
+        self.longitud = longitud
+        self.dx = longitud / nodos
+        self.x = (np.arange(nodos) + 0.5) * self.dx
+        self.densidad = densidad
+        self.conductividad = conductividad
+        self.borde_izquierdo = borde_izquierdo
+        self.borde_derecho = borde_derecho
+        self.t = 0.0
+        
+        T0 = np.broadcast_to(np.asarray(temp_inicial, dtype=float), (nodos,))
+        self.h = tabla.entalpia_lote(T0)
+        
+        # Quiebres de H(T) con extremos infinitos: la región p va de
+        # _quiebres[p] a _quiebres[p + 1]
+        self._quiebres = np.concatenate(([-np.inf], tabla._H_quiebres, [np.inf]))
+        if tabla.constante:
+            # Con c constante T(h) es exactamente lineal en cada región
+            n_regiones = len(tabla.fases)
+            self._alfa = np.empty(n_regiones)
+            self._beta = np.zeros(n_regiones)
+            for p in range(n_regiones):
+                k = p // 2
+                if p % 2:
+                    self._alfa[p] = tabla.transiciones[k]
+                else:
+                    self._beta[p] = 1 / tabla.tramos[k].c
+                    self._alfa[p] = tabla.T_ref[k] - tabla.H_base[k] * self._beta[p]
+    
+    def _linealizar(self, h, subiendo):
+        """
+        Linealiza T(h) en cada nodo: T ≈ α + β·h dentro de su región.
+        
+        En un quiebre exacto se toma la región hacia donde se mueve el nodo.
+        
+        Returns:
+            tuple: (alfa, beta, region)
+        """
+        p = np.searchsorted(self._quiebres, h, side='left') - 1
+        p += subiendo & (h == self._quiebres[p + 1])
+        if self.tabla.constante:
+            return self._alfa[p], self._beta[p], p
+        
+        T, _, _ = self.tabla.temperatura_lote(h)
+        beta = np.zeros(h.shape)
+        for i, tramo in enumerate(self.tabla.tramos):
+            en_tramo = p == 2 * i
+            beta[en_tramo] = 1 / tramo.valor(T[en_tramo])
+        return T - beta * h, beta, p
+    
+    def _borde(self, borde, lam, dt, dx):
+        """
+        Aporte de un borde a la ecuación de su nodo.
+        
+        Returns:
+            tuple: (peso extra sobre T del nodo, término constante)
+        """
+        tipo, valor = borde
+        if tipo == 'temperatura':
+            # La cara está a medio volumen del centro del nodo
+            return 2 * lam, 2 * lam * valor
+        return 0.0, valor * dt / (self.densidad * dx)
+    
+    def _limites(self, h):
+        """
+        Rango de h en el que se usa la curva T(h) del material.
+        
+        Con c(T) de Shomate la curva solo se usa entre las temperaturas del
+        problema: las de h y las de los bordes a temperatura fija. Fuera de
+        ese rango T(h) sigue por la tangente en el límite, porque lejos del
+        rango de la fórmula H(T) puede no crecer, y Newton pasa por valores
+        lejanos en el camino a la solución.
+        
+        Args:
+            h (ndarray): Entalpías que el rango debe incluir
+        
+        Returns:
+            tuple: (h_min, beta_min, h_max, beta_max), con beta la pendiente
+                   dT/dh de la tangente en cada límite
+        """
+        if self.tabla.constante:
+            # T(h) ya es lineal por tramos y creciente en toda la recta
+            return -np.inf, 0.0, np.inf, 0.0
+        
+        h_min = h.min()
+        h_max = h.max()
+        for tipo, valor in (self.borde_izquierdo, self.borde_derecho):
+            if tipo == 'temperatura':
+                h_borde = float(self.tabla.entalpia_lote(valor))
+                h_min = min(h_min, h_borde)
+                h_max = max(h_max, h_borde)
+        
+        # Un límite dentro de una meseta se lleva a su borde: en toda ella T
+        # es la misma
+        p = np.searchsorted(self._quiebres, h_min, side='left') - 1
+        h_min = self._quiebres[p] if p % 2 else h_min
+        p = np.searchsorted(self._quiebres, h_max, side='right') - 1
+        h_max = self._quiebres[p + 1] if p % 2 else h_max
+        
+        _, (beta_min, beta_max), _ = self._linealizar(np.array([h_min, h_max]),
+                                                      np.array([False, True]))
+        return h_min, beta_min, h_max, beta_max
+    
+    def _resolver_paso(self, h_anterior, dx, dt, h, limites, tolerancia, max_iteraciones):
+        """
+        Resuelve h + A·T(h) = b en una malla de volúmenes de ancho dx.
+        
+        Args:
+            h_anterior (ndarray): Entalpía al comienzo del paso
+            dx (float): Ancho de cada volumen en m
+            dt (float): Paso de tiempo en s
+            h (ndarray): Punto de partida de la iteración
+            limites (tuple): Resultado de _limites()
+            tolerancia (float): Residuo máximo de la ecuación, en J/kg
+            max_iteraciones (int): Máximo de iteraciones de Newton
+        
+        Returns:
+            tuple: (h al final del paso, iteraciones usadas)
+        
+        Raises:
+            RuntimeError: Si no converge en max_iteraciones
+        """
+        n = len(h_anterior)
+        lam = self.conductividad * dt / (self.densidad * dx ** 2)
+        peso_izq, extra_izq = self._borde(self.borde_izquierdo, lam, dt, dx)
+        peso_der, extra_der = self._borde(self.borde_derecho, lam, dt, dx)
+        
+        # Cuántos vecinos tiene cada nodo (los extremos solo uno)
+        pesos = np.full(n, 2 * lam)
+        pesos[0] -= lam
+        pesos[-1] -= lam
+        pesos[0] += peso_izq
+        pesos[-1] += peso_der
+        vecinos = np.full(n, -lam)
+        
+        b = h_anterior.copy()
+        b[0] += extra_izq
+        b[-1] += extra_der
+        
+        h = h.copy()
+        pesos_fijos = pesos.copy()
+        if peso_izq == 0 and peso_der == 0:
+            # Con los dos bordes de flujo A es singular (A·1 = 0) y la
+            # energía total queda fija en sum(b): se parte de ella y Newton
+            # la conserva. Para resolver A·u = d (con sum(d) = 0) se fija u
+            # en un nodo sumando un peso que no cambia el producto d·u
+            h += (b.sum() - h.sum()) / n
+            pesos_fijos[0] += lam
+        
+        def aplicar_A(T):
+            r = pesos * T
+            r[1:] -= lam * T[:-1]
+            r[:-1] -= lam * T[1:]
+            return r
+        
+        # Fuera de los límites T(h) sigue por la tangente (ver _limites)
+        h_min, beta_min, h_max, beta_max = limites
+        
+        def temperatura(h):
+            h_limitada = np.clip(h, h_min, h_max)
+            T, _, _ = self.tabla.temperatura_lote(h_limitada)
+            T += np.where(h < h_min, beta_min, beta_max) * (h - h_limitada)
+            return T
+        
+        # A⁻¹·(b - h), solo para la búsqueda sobre la dirección de Newton: se
+        # calcula la primera vez que hace falta y después se actualiza junto
+        # con h, sin resolver otro sistema por iteración
+        w = None
+        subiendo = h >= h_anterior
+        for iteracion in range(1, max_iteraciones + 1):
+            h_limitada = np.clip(h, h_min, h_max)
+            alfa, beta, p = self._linealizar(h_limitada, subiendo)
+            T = alfa + beta * h_limitada
+            fuera = h != h_limitada
+            beta[fuera] = np.where(h[fuera] < h_min, beta_min, beta_max)
+            T += beta * (h - h_limitada)
+            residuo = h + aplicar_A(T) - b
+            if np.max(np.abs(residuo)) < tolerancia:
+                return h, iteracion
+            
+            # Newton con T = α + β·h: (I + A·diag(β))·d = -residuo
+            inferior = np.empty(n)
+            superior = np.empty(n)
+            inferior[1:] = -lam * beta[:-1]
+            superior[:-1] = -lam * beta[1:]
+            d = resolver_tridiagonal(inferior, 1 + pesos * beta, superior, -residuo)
+            beta_d = beta * d
+            
+            # La solución del paso es el mínimo de
+            # Φ(h) = Σ∫T dh + ½·(b - h)ᵀ·A⁻¹·(b - h); a lo largo de h + t·d,
+            # usando w = A⁻¹·(b - h) = T + β·d + A⁻¹·d, la derivada es
+            # Φ'(t) = d·(T(h + t·d) - T - β·d) + (t - 1)·d·A⁻¹·d.
+            # Con c constante T es lineal dentro de cada región, así que los
+            # nodos que no salen de la suya aportan (t - 1)·β·d² y solo hace
+            # falta evaluar T en los demás
+            if self.tabla.constante:
+                h_d = h + d
+                cruzan = (h_d < self._quiebres[p]) | (h_d > self._quiebres[p + 1])
+            else:
+                cruzan = np.ones(n, dtype=bool)
+            h_c = h[cruzan]
+            d_c = d[cruzan]
+            resto_c = T[cruzan] + beta_d[cruzan]
+            curvatura = d[~cruzan] @ beta_d[~cruzan]
+            
+            def derivada(t):
+                return d_c @ (temperatura(h_c + t * d_c) - resto_c) + (t - 1) * curvatura
+            
+            t = 1.0
+            g_der = derivada(1.0)
+            if g_der > 0:
+                # Algún nodo cruzó un quiebre que frena el paso completo:
+                # se busca Φ'(t) ≈ 0 en (0, 1) por regula falsi (Illinois)
+                if w is None:
+                    w = resolver_tridiagonal(vecinos, pesos_fijos, vecinos, b - h)
+                curvatura += d @ (w - T - beta_d)
+                t_izq, g_izq = 0.0, derivada(0.0)
+                t_der = 1.0
+                g_inicial = g_izq
+                for _ in range(30):
+                    t = (t_izq * g_der - t_der * g_izq) / (g_der - g_izq)
+                    g = derivada(t)
+                    if abs(g) <= 0.5 * abs(g_inicial):
+                        break
+                    if g < 0:
+                        t_izq, g_izq = t, g
+                        g_der /= 2
+                    else:
+                        t_der, g_der = t, g
+                        g_izq /= 2
+                else:
+                    t = t_izq
+            
+            subiendo = d > 0
+            h += t * d
+            if w is not None:
+                w -= t * (w - T - beta_d)
+        
+        raise RuntimeError(f"El paso de conducción no convergió en {max_iteraciones} "
+                           f"iteraciones (residuo {np.max(np.abs(residuo)):.3g} J/kg)")
+    
+    def _paso_multinivel(self, h_anterior, dx, dt, limites, tolerancia, max_iteraciones):
+        """
+        Resuelve un paso partiendo de la solución en una malla con la mitad de volúmenes.
+        
+        Returns:
+            tuple: (h al final del paso, iteraciones usadas en esta malla)
+        """
+        n = len(h_anterior)
+        if n <= _NODOS_MINIMOS:
+            return self._resolver_paso(h_anterior, dx, dt, h_anterior, limites, tolerancia,
+                                       max_iteraciones)
+        
+        m = (n + 1) // 2
+        grueso_anterior = _remapear(h_anterior, m)
+        grueso, _ = self._paso_multinivel(grueso_anterior, dx * n / m, dt, limites,
+                                          tolerancia, max_iteraciones)
+        # El cambio de h en la malla gruesa se reparte conservando la energía
+        # que entró en el paso
+        h_inicial = h_anterior + _remapear(grueso - grueso_anterior, n)
+        return self._resolver_paso(h_anterior, dx, dt, h_inicial, limites, tolerancia,
+                                   max_iteraciones)
+    
+    def _avanzar(self, h_anterior, dt, tolerancia, max_iteraciones):
+        """
+        Resuelve un paso desde h_anterior, ampliando el rango de _limites si hace falta.
+        
+        Returns:
+            tuple: (h al final del paso, iteraciones usadas en la malla de la barra)
+        """
+        limites = self._limites(h_anterior)
+        h, iteraciones = self._paso_multinivel(h_anterior, self.dx, dt, limites, tolerancia,
+                                               max_iteraciones)
+        h_min, _, h_max, _ = limites
+        while h.min() < h_min or h.max() > h_max:
+            # Un borde de flujo llevó la barra fuera del rango de temperaturas
+            # que tenía: se repite el paso con el rango ampliado (con margen)
+            # hasta que la solución quede dentro
+            limites = self._limites(np.array([min(h_min, 2 * h.min() - h_min),
+                                              max(h_max, 2 * h.max() - h_max)]))
+            h, extra = self._paso_multinivel(h_anterior, self.dx, dt, limites, tolerancia,
+                                             max_iteraciones)
+            iteraciones += extra
+            h_min, _, h_max, _ = limites
+        return h, iteraciones
+    
+    def paso(self, dt, tolerancia=1.0, max_iteraciones=50):
+        """
+        Avanza la barra un paso de tiempo implícito.
+        
+        Si Newton no converge en max_iteraciones (un frente que cruza muchos
+        volúmenes en el paso), el paso se parte en dos mitades, hasta
+        _SUBDIVISIONES veces.
+        
+        Args:
+            dt (float): Paso de tiempo en s
+            tolerancia (float): Residuo máximo del balance de cada nodo, en J/kg
+            max_iteraciones (int): Máximo de iteraciones de Newton en cada malla
+        
+        Returns:
+            int: Iteraciones usadas en la malla de la barra
+        
+        Raises:
+            RuntimeError: Si ni partiendo el paso se llega a la tolerancia
+        """
+        h = self.h
+        iteraciones = 0
+        pendientes = [(dt, 0)]
+        while pendientes:
+            dt_parcial, divisiones = pendientes.pop()
+            try:
+                h, usadas = self._avanzar(h, dt_parcial, tolerancia, max_iteraciones)
+            except RuntimeError as error:
+                if divisiones == _SUBDIVISIONES:
+                    raise RuntimeError(f"El paso de conducción de {dt} s no convergió ni "
+                                       f"partido en pasos de {dt_parcial} s") from error
+                pendientes += [(dt_parcial / 2, divisiones + 1)] * 2
+                continue
+            iteraciones += usadas
+        
+        self.h = h
+        self.t += dt
+        return iteraciones
+    
+    def temperaturas(self):
+        """Temperatura de cada nodo en °C."""
+        T, _, _ = self.tabla.temperatura_lote(self.h)
+        return T
+    
+    def fracciones(self):
+        """
+        Parte transformada por cada cambio de fase.
+        
+        Returns:
+            dict: {fase_latente: ndarray de 0 a 1 por nodo}
+        """
+        return {
+            fase: np.clip((self.h - H_antes) / L, 0.0, 1.0)
+            for fase, H_antes, L in zip(self.tabla.fases_latentes, self.tabla.H_antes,
+                                        self.tabla.latentes)
+        }
+    
+    def frentes(self, fracciones=None):
+        """
+        Posiciones de los frentes de cambio de fase.
+        
+        Un frente está donde la fracción transformada cruza 0.5 entre dos
+        nodos vecinos; su posición se interpola linealmente.
+        
+        Returns:
+            dict: {fase_latente: ndarray de posiciones en m}
+        """
+        fracciones = fracciones if fracciones is not None else self.fracciones()
+        frentes = {}
+        for fase, f in fracciones.items():
+            g = f - 0.5
+            cruces = np.nonzero(g[:-1] * g[1:] < 0)[0]
+            peso = g[cruces] / (g[cruces] - g[cruces + 1])
+            frentes[fase] = self.x[cruces] + peso * self.dx
+        return frentes
+    
+    def energia(self):
+        """Entalpía total por unidad de área de la sección en J/m²."""
+        return self.densidad * self.dx * float(np.sum(self.h))
+    
+    def perfil(self):
+        """Estado actual como PerfilConduccion."""
+        fracciones = self.fracciones()
+        return PerfilConduccion(self.t, self.x, self.temperaturas(), fracciones,
+                                self.frentes(fracciones))
+    
+    def simular(self, dt, pasos, cada=1, **opciones):
+        """
+        Avanza varios pasos y produce perfiles a medida que se calculan.
+        
+        Args:
+            dt (float): Paso de tiempo en s
+            pasos (int): Número de pasos
+            cada (int): Producir un perfil cada tantos pasos
+            **opciones: tolerancia y max_iteraciones de paso()
+        
+        Yields:
+            PerfilConduccion: Perfil inicial, cada `cada` pasos y el final
+        """
+        yield self.perfil()
+        for i in range(1, pasos + 1):
+            self.paso(dt, **opciones)
+            if i % cada == 0 or i == pasos:
+                yield self.perfil()
@@ -1,5 +1,12 @@
 """
 Constantes y propiedades termodinámicas de materiales.
+
+Los calores específicos (c_solido, c_liquido, c_gas) pueden ser un número
+constante en J/(kg·°C) o depender de la temperatura con la forma de Shomate:
+
+    'c_solido': {'shomate': [A, B, C, D, E]}
+    
+    c(T) = A + B·t + C·t² + D·t³ + E/t²  en J/(kg·°C), con t = T[K] / 1000
 """
 
 CONSTANTES_MATERIALES = {
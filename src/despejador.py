@@ -1,10 +1,16 @@
 """
 Módulo para el despejador de variables.
+
+Las fórmulas despejadas están en despejes.py, sin tkinter, para poder
+usarlas y medirlas fuera de la ventana.
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from despejes import (despejar_calor_especifico, despejar_masa,
+                      despejar_temperatura_final, despejar_temperatura_inicial)
+
 
 class VentanaDespejador:
     """Ventana para despejar variables en ecuaciones de calorimetría."""
@@ -128,10 +134,7 @@ class VentanaDespejador:
                 c = float(self.c_var.get())
                 deltaT = float(self.deltaT_var.get())
                 
-                if deltaT == 0:
-                    raise ValueError("ΔT no puede ser cero")
-                
-                m = Q / (c * deltaT)
+                m = despejar_masa(Q, c, deltaT)
                 resultado = f"Cálculo de la Masa:\n"
                 resultado += f"Fórmula: m = Q / (c · ΔT)\n"
                 resultado += f"m = {Q} J / ({c} J/(kg·°C) · {deltaT} °C)\n"
@@ -142,10 +145,7 @@ class VentanaDespejador:
                 m = float(self.m_var.get())
                 deltaT = float(self.deltaT_var.get())
                 
-                if m == 0 or deltaT == 0:
-                    raise ValueError("Masa y ΔT no pueden ser cero")
-                
-                c = Q / (m * deltaT)
+                c = despejar_calor_especifico(Q, m, deltaT)
                 resultado = f"Cálculo del Calor Específico:\n"
                 resultado += f"Fórmula: c = Q / (m · ΔT)\n"
                 resultado += f"c = {Q} J / ({m} kg · {deltaT} °C)\n"
@@ -157,10 +157,7 @@ class VentanaDespejador:
                 c = float(self.c_var.get())
                 Ti = float(self.Ti_var.get())
                 
-                if m == 0 or c == 0:
-                    raise ValueError("Masa y calor específico no pueden ser cero")
-                
-                Tf = Ti + Q / (m * c)
+                Tf = despejar_temperatura_final(Q, m, c, Ti)
                 resultado = f"Cálculo de la Temperatura Final:\n"
                 resultado += f"Fórmula: Tf = Ti + Q / (m · c)\n"
                 resultado += f"Tf = {Ti} + {Q} / ({m} · {c})\n"
@@ -172,10 +169,7 @@ class VentanaDespejador:
                 c = float(self.c_var.get())
                 Tf = float(self.Tf_var.get())
                 
-                if m == 0 or c == 0:
-                    raise ValueError("Masa y calor específico no pueden ser cero")
-                
-                Ti = Tf - Q / (m * c)
+                Ti = despejar_temperatura_inicial(Q, m, c, Tf)
                 resultado = f"Cálculo de la Temperatura Inicial:\n"
                 resultado += f"Fórmula: Ti = Tf - Q / (m · c)\n"
                 resultado += f"Ti = {Tf} - {Q} / ({m} · {c})\n"
@@ -0,0 +1,34 @@
+"""
+Despejes de la ecuación Q = m · c · ΔT.
+
+Funciones puras, sin tkinter: las usan la ventana del despejador, el
+servidor HTTP y los benchmarks.
+"""
+
+
+def despejar_masa(Q, c, deltaT):
+    """Despeja la masa: m = Q / (c · ΔT)."""
+    if c == 0 or deltaT == 0:
+        raise ValueError("Calor específico y ΔT no pueden ser cero")
+    return Q / (c * deltaT)
+
+
+def despejar_calor_especifico(Q, m, deltaT):
+    """Despeja el calor específico: c = Q / (m · ΔT)."""
+    if m == 0 or deltaT == 0:
+        raise ValueError("Masa y ΔT no pueden ser cero")
+    return Q / (m * deltaT)
+
+
+def despejar_temperatura_final(Q, m, c, Ti):
+    """Despeja la temperatura final: Tf = Ti + Q / (m · c)."""
+    if m == 0 or c == 0:
+        raise ValueError("Masa y calor específico no pueden ser cero")
+    return Ti + Q / (m * c)
+
+
+def despejar_temperatura_inicial(Q, m, c, Tf):
+    """Despeja la temperatura inicial: Ti = Tf - Q / (m · c)."""
+    if m == 0 or c == 0:
+        raise ValueError("Masa y calor específico no pueden ser cero")
+    return Tf - Q / (m * c)
@@ -0,0 +1,327 @@
+"""
+Diagramas temperatura-energía en lote, sin ventana.
+
+Dibuja un diagrama por caso con el backend Agg de matplotlib, sin tkinter
+ni pantalla, y lo guarda como PNG, SVG o PDF:
+
+    renderizar_diagramas(casos, 'diagramas/', formato='png', procesos=4)
+
+Cada proceso trabajador crea una sola PlantillaDiagrama y la reutiliza para
+todos sus casos: solo cambian la línea, las anotaciones, el título y los
+límites. En PNG, el fondo (ejes, cuadrícula, marcas y etiquetas) se dibuja
+una vez por cada par de límites y se guarda; los casos con los mismos
+límites redondeados solo pintan sus artistas encima. SVG y PDF son
+vectoriales y se dibujan completos.
+
+Con el formato 'pdf-paginas' cada bloque de casos se guarda como un único
+PDF de varias páginas (una por caso).
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import OrderedDict
+from multiprocessing import Pool
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from PIL import Image
+
+from calculator import CalculadoraCalor
+from cli import leer_caso, leer_filas
+from constants import CONSTANTES_MATERIALES
+from figuras import TITULO_DIAGRAMA, colocar_anotaciones, crear_figura_diagrama, limites_estables
+from materiales import cargar_materiales
+
+
+FORMATOS_DIAGRAMA = ('png', 'svg', 'pdf', 'pdf-paginas')
+
+
+class PlantillaDiagrama:
+    """
+    Figura Agg reutilizable para dibujar muchos diagramas seguidos.
+    
+    Tiene el mismo estilo que DiagramaTemperaturaEnergia. La línea, las
+    anotaciones y el título son artistas animados: el fondo guardado para
+    unos límites sirve para cualquier caso que caiga en esos límites. Con
+    límites fijos todos los casos comparten un único fondo, que es lo más
+    rápido (y deja los diagramas en la misma escala).
+    """
+    
+    def __init__(self, ancho=8.0, alto=4.5, dpi=100, max_fondos=16,
+                 limites_energia=None, limites_temperatura=None):
+        """
+        Args:
+            ancho (float): Ancho de la figura en pulgadas
+            alto (float): Alto de la figura en pulgadas
+            dpi (int): Puntos por pulgada de los PNG
+            max_fondos (int): Fondos guardados (cada uno ocupa ancho×alto×dpi²×4 bytes)
+            limites_energia (tuple): (min, max) fijos del eje de energía en kJ
+            limites_temperatura (tuple): (min, max) fijos del eje de temperatura en °C
+        """
+        self.limites_energia = limites_energia
+        self.limites_temperatura = limites_temperatura
+        self.figura, self.ejes, self.linea = crear_figura_diagrama(ancho, alto, dpi)
+        self.ejes.title.set_animated(True)
+        self.anotaciones = []
+        self._n_anotaciones = 0
+        self.figura.tight_layout()
+        
+        self.canvas = FigureCanvasAgg(self.figura)
+        self.max_fondos = max_fondos
+        self._fondos = OrderedDict()
+        self.fondos_reutilizados = 0
+    
+    def preparar(self, temps, energias, titulo=None):
+        """
+        Cambia los datos del diagrama sin dibujarlo.
+        
+        Args:
+            temps (list): Lista de temperaturas
+            energias (list): Lista de energías en Joules
+            titulo (str): Título del diagrama (por defecto el de la interfaz)
+        """
+        energias_kJ = [e/1000 for e in energias]
+        self.linea.set_data(energias_kJ, temps)
+        
+        self._n_anotaciones = colocar_anotaciones(self.ejes, self.anotaciones, energias_kJ, temps)
+        
+        # Sin histéresis: el mismo caso da el mismo diagrama en cualquier proceso
+        self.ejes.set_xlim(*(self.limites_energia or limites_estables(energias_kJ, None)))
+        self.ejes.set_ylim(*(self.limites_temperatura or limites_estables(temps, None)))
+        self.ejes.set_title(TITULO_DIAGRAMA if titulo is None else titulo,
+                            fontsize=14, fontweight='bold')
+    
+    def _artistas(self):
+        return [self.linea, self.ejes.title] + self.anotaciones[:self._n_anotaciones]
+    
+    def _pintar(self):
+        """Deja el diagrama actual en el búfer del lienzo."""
+        clave = (self.ejes.get_xlim(), self.ejes.get_ylim())
+        fondo = self._fondos.get(clave)
+        if fondo is None:
+            self.canvas.draw()  # Dibuja todo menos los artistas animados
+            fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+            self._fondos[clave] = fondo
+            if len(self._fondos) > self.max_fondos:
+                self._fondos.popitem(last=False)
+        else:
+            self.canvas.restore_region(fondo)
+            self._fondos.move_to_end(clave)
+            self.fondos_reutilizados += 1
+        for artista in self._artistas():
+            self.figura.draw_artist(artista)
+    
+    def guardar(self, destino, formato='png'):
+        """
+        Guarda el diagrama actual.
+        
+        Args:
+            destino: Ruta o archivo binario abierto
+            formato (str): 'png', 'svg' o 'pdf'
+        """
+        if formato == 'png':
+            self._pintar()
+            # La figura es opaca: sin canal alfa y con compresión rápida el PNG
+            # se codifica bastante más rápido y apenas crece
+            imagen = Image.frombytes('RGB', self.canvas.get_width_height(),
+                                     self.canvas.buffer_rgba(), 'raw', 'RGBX')
+            dpi = self.figura.dpi
+            imagen.save(destino, format='png', compress_level=1, dpi=(dpi, dpi))
+        else:
+            # Al guardar, matplotlib también dibuja los artistas animados
+            self.figura.savefig(destino, format=formato)
+    
+    def agregar_pagina(self, pdf):
+        """Agrega el diagrama actual como una página de un PdfPages."""
+        pdf.savefig(self.figura)
+
+
+def titulo_caso(material, masa, temp_inicial, temp_final):
+    return f"{material}: {masa:g} kg, {temp_inicial:g} °C → {temp_final:g} °C"
+
+
+def nombre_archivo(indice, formato):
+    return f"diagrama_{indice:06d}.{formato}"
+
+
+def _renderizar_bloque(calculadora, plantilla, destino, formato, inicio, casos):
+    """
+    Dibuja y guarda un bloque de casos consecutivos.
+    
+    Returns:
+        tuple: (diagramas_guardados, [(indice, mensaje_de_error), ...])
+    """
+    guardados = 0
+    fallidos = []
+    pdf = None
+    if formato == 'pdf-paginas':
+        fin = inicio + len(casos) - 1
+        pdf = PdfPages(os.path.join(destino, f"diagramas_{inicio:06d}-{fin:06d}.pdf"))
+    try:
+        for indice, (material, masa, Ti, Tf) in enumerate(casos, inicio):
+            try:
+                temps, energias = calculadora.calcular_resultado(material, masa, Ti, Tf).puntos_diagrama()
+            except (KeyError, ValueError) as e:
+                fallidos.append((indice, str(e)))
+                continue
+            plantilla.preparar(temps, energias, titulo_caso(material, masa, Ti, Tf))
+            if pdf is not None:
+                plantilla.agregar_pagina(pdf)
+            else:
+                plantilla.guardar(os.path.join(destino, nombre_archivo(indice, formato)), formato)
+            guardados += 1
+    finally:
+        if pdf is not None:
+            pdf.close()
+    return guardados, fallidos
+
+
+# Calculadora y plantilla propias de cada proceso trabajador
+_calculadora_trabajador = None
+_plantilla_trabajador = None
+
+
+def _inicializar_trabajador(constantes, opciones_plantilla):
+    global _calculadora_trabajador, _plantilla_trabajador
+    _calculadora_trabajador = CalculadoraCalor(constantes)
+    _plantilla_trabajador = PlantillaDiagrama(**opciones_plantilla)
+
+
+def _renderizar_tarea(tarea):
+    return _renderizar_bloque(_calculadora_trabajador, _plantilla_trabajador, *tarea)
+
+
+def _bloques(casos, tam_bloque):
+    bloque = []
+    inicio = 0
+    for caso in casos:
+        bloque.append(caso)
+        if len(bloque) == tam_bloque:
+            yield inicio, bloque
+            inicio += len(bloque)
+            bloque = []
+    if bloque:
+        yield inicio, bloque
+
+
+def renderizar_diagramas(casos, destino, formato='png', procesos=None, constantes=None,
+                         tam_bloque=64, **opciones_plantilla):
+    """
+    Dibuja y guarda el diagrama temperatura-energía de cada caso.
+    
+    Los archivos se numeran según la posición del caso en `casos`
+    (diagrama_000000.png, ...); con 'pdf-paginas' se guarda un PDF por
+    bloque de `tam_bloque` casos (diagramas_000000-000063.pdf, ...).
+    
+    Args:
+        casos (iterable): Tuplas (material, masa, temp_inicial, temp_final)
+        destino (str): Directorio de salida (se crea si no existe)
+        formato (str): 'png', 'svg', 'pdf' o 'pdf-paginas'
+        procesos (int): Procesos trabajadores (por defecto, uno por núcleo;
+                        con 1 se dibuja en este mismo proceso)
+        constantes (dict): Constantes de materiales (por defecto las de constants.py)
+        tam_bloque (int): Casos por tarea enviada a un proceso
+        **opciones_plantilla: ancho, alto, dpi, max_fondos, limites_energia y
+                              limites_temperatura de PlantillaDiagrama
+    
+    Returns:
+        tuple: (diagramas_guardados, [(indice, mensaje_de_error), ...])
+    """
+    if formato not in FORMATOS_DIAGRAMA:
+        raise ValueError(f"Formato desconocido: {formato}")
+    if tam_bloque <= 0:
+        raise ValueError("El tamaño de bloque debe ser mayor que cero")
+    
+    os.makedirs(destino, exist_ok=True)
+    constantes = constantes or CONSTANTES_MATERIALES
+    procesos = procesos or os.cpu_count() or 1
+    tareas = ((destino, formato, inicio, bloque) for inicio, bloque in _bloques(casos, tam_bloque))
+    
+    guardados = 0
+    fallidos = []
+    if procesos == 1:
+        calculadora = CalculadoraCalor(constantes)
+        plantilla = PlantillaDiagrama(**opciones_plantilla)
+        resultados = (_renderizar_bloque(calculadora, plantilla, *tarea) for tarea in tareas)
+        for n, errores in resultados:
+            guardados += n
+            fallidos.extend(errores)
+        return guardados, fallidos
+    
+    # imap_unordered lee los casos a medida que los procesos los piden (la
+    # cola de tareas se llena y frena la lectura), así que un archivo enorme
+    # no se carga entero; cada tarea ya es un bloque, de ahí chunksize=1
+    with Pool(procesos, initializer=_inicializar_trabajador,
+              initargs=(constantes, opciones_plantilla)) as pool:
+        for n, errores in pool.imap_unordered(_renderizar_tarea, tareas, chunksize=1):
+            guardados += n
+            fallidos.extend(errores)
+    fallidos.sort()
+    return guardados, fallidos
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py diagramas',
+        description="Guarda el diagrama temperatura-energía de cada fila de un archivo CSV o JSONL."
+    )
+    parser.add_argument('entrada', nargs='?', default='-',
+                        help="Archivo de casos ('-' para la entrada estándar)")
+    parser.add_argument('-d', '--destino', default='diagramas',
+                        help="Directorio de salida")
+    parser.add_argument('-f', '--formato', choices=FORMATOS_DIAGRAMA, default='png',
+                        help="'pdf-paginas' guarda un PDF de varias páginas por bloque")
+    parser.add_argument('--formato-entrada', choices=('auto', 'csv', 'jsonl'), default='auto')
+    parser.add_argument('--materiales',
+                        help="Archivo JSON o CSV con la base de materiales a usar")
+    parser.add_argument('-p', '--procesos', type=int,
+                        help="Procesos trabajadores (por defecto, uno por núcleo)")
+    parser.add_argument('--tam-bloque', type=int, default=64,
+                        help="Casos por tarea (y páginas por PDF con 'pdf-paginas')")
+    parser.add_argument('--ancho', type=float, default=8.0, help="Ancho en pulgadas")
+    parser.add_argument('--alto', type=float, default=4.5, help="Alto en pulgadas")
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--limites-energia', type=float, nargs=2, metavar=('MIN', 'MAX'),
+                        help="Eje de energía fijo en kJ (más rápido: todos los PNG comparten el fondo)")
+    parser.add_argument('--limites-temperatura', type=float, nargs=2, metavar=('MIN', 'MAX'),
+                        help="Eje de temperatura fijo en °C")
+    return parser
+
+
+def main_diagramas(argv=None):
+    """Punto de entrada del modo 'diagramas'."""
+    args = crear_parser().parse_args(argv)
+    constantes = cargar_materiales(args.materiales) if args.materiales else CONSTANTES_MATERIALES
+    calculadora = CalculadoraCalor(constantes)
+    fallidas = 0
+    
+    def casos(entrada):
+        nonlocal fallidas
+        for numero, fila in leer_filas(entrada, args.formato_entrada):
+            try:
+                yield leer_caso(calculadora, fila)
+            except (KeyError, ValueError, TypeError) as e:
+                fallidas += 1
+                sys.stderr.write(f"Línea {numero}: {e}\n")
+    
+    entrada = sys.stdin if args.entrada == '-' else open(args.entrada, encoding='utf-8', newline='')
+    inicio = time.perf_counter()
+    try:
+        guardados, errores = renderizar_diagramas(
+            casos(entrada), args.destino, args.formato, args.procesos, constantes,
+            args.tam_bloque, ancho=args.ancho, alto=args.alto, dpi=args.dpi,
+            limites_energia=args.limites_energia and tuple(args.limites_energia),
+            limites_temperatura=args.limites_temperatura and tuple(args.limites_temperatura)
+        )
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+    segundos = time.perf_counter() - inicio
+    
+    for indice, mensaje in errores:
+        sys.stderr.write(f"Caso {indice}: {mensaje}\n")
+    sys.stderr.write(f"{guardados} diagramas en {segundos:.2f} s "
+                     f"({guardados / segundos if segundos else 0:.0f}/s) en {args.destino}\n")
+    return 1 if fallidas or errores else 0
@@ -0,0 +1,418 @@
+"""
+Tablas de entalpía acumulada por material.
+
+Cada material se compila una sola vez en una tabla ordenada de puntos de
+cambio de fase. La entalpía específica H(T) (J/kg) es lineal por tramos
+dentro de cada fase y da un salto igual al calor latente en cada cambio,
+de modo que el calor entre dos temperaturas es m·(H(Tf) - H(Ti)).
+
+El calor específico de cada fase puede ser constante o depender de la
+temperatura con la forma de Shomate (ver CalorEspecificoShomate); en ambos
+casos el calor sensible se obtiene con la primitiva analítica, sin
+integración numérica.
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+
+def segmentos_fase(const_mat):
+    """
+    Describe las fases de un material como tramos sensibles y latentes.
+    
+    Args:
+        const_mat (dict): Constantes del material
+    
+    Returns:
+        list: Tuplas ('sensible', fase, T_desde, T_hasta, c) y
+              ('latente', fase, T_cambio, L) en orden de temperatura
+    """
+    T_fus = const_mat['T_fusion']
+    segmentos = [
+        ('sensible', 'solido', -np.inf, T_fus, const_mat['c_solido']),
+        ('latente', 'fusion', T_fus, const_mat['Lf']),
+    ]
+    
+    # Solo se modela la fase gaseosa si el material tiene sus constantes
+    if all(k in const_mat for k in ('T_ebullicion', 'Lv', 'c_gas')):
+        T_eb = const_mat['T_ebullicion']
+        segmentos += [
+            ('sensible', 'liquido', T_fus, T_eb, const_mat['c_liquido']),
+            ('latente', 'vaporizacion', T_eb, const_mat['Lv']),
+            ('sensible', 'gas', T_eb, np.inf, const_mat['c_gas']),
+        ]
+    else:
+        segmentos.append(('sensible', 'liquido', T_fus, np.inf, const_mat['c_liquido']))
+    
+    return segmentos
+
+
+def huella_material(const_mat):
+    """
+    Obtiene una huella comparable de las constantes de un material.
+    
+    Sirve para detectar si un diccionario de constantes cambió desde que
+    se compiló su tabla.
+    """
+    return tuple(sorted((k, _congelar(v)) for k, v in const_mat.items()))
+
+
+def _congelar(valor):
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _congelar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+class CalorEspecificoConstante:
+    """Calor específico constante c en J/(kg·°C)."""
+    
+    constante = True
+    
+    def __init__(self, c):
+        self.c = c
+    
+    def valor(self, T):
+        return self.c
+    
+    def calor(self, T_desde, T_hasta):
+        """Calor por kg entre dos temperaturas: ∫ c dT."""
+        return self.c * (T_hasta - T_desde)
+    
+    def temperatura(self, T_desde, q):
+        """Temperatura alcanzada desde T_desde al aportar q J/kg."""
+        return T_desde + q / self.c
+    
+    def describir(self):
+        return f"{self.c:.10g} J/(kg·°C)"
+
+
+class CalorEspecificoShomate:
+    """
+    Calor específico dependiente de la temperatura, forma de Shomate.
+    
+    c(T) = A + B·t + C·t² + D·t³ + E/t²  en J/(kg·°C), con t = T[K] / 1000.
+    
+    El calor sensible usa la primitiva exacta
+    ∫ c dT = 1000 · (A·t + B·t²/2 + C·t³/3 + D·t⁴/4 - E/t).
+    """
+    
+    constante = False
+    
+    def __init__(self, coeficientes):
+        coeficientes = tuple(coeficientes)
+        if not 1 <= len(coeficientes) <= 5:
+            raise ValueError("La forma de Shomate admite de 1 a 5 coeficientes (A..E)")
+        self.coeficientes = coeficientes + (0.0,) * (5 - len(coeficientes))
+    
+    def valor(self, T):
+        A, B, C, D, E = self.coeficientes
+        t = (T + 273.15) / 1000
+        return A + t * (B + t * (C + t * D)) + E / (t * t)
+    
+    def primitiva(self, T):
+        A, B, C, D, E = self.coeficientes
+        t = (T + 273.15) / 1000
+        return 1000 * (t * (A + t * (B / 2 + t * (C / 3 + t * D / 4))) - E / t)
+    
+    def calor(self, T_desde, T_hasta):
+        """Calor por kg entre dos temperaturas: ∫ c(T) dT."""
+        return self.primitiva(T_hasta) - self.primitiva(T_desde)
+    
+    def temperatura(self, T_desde, q, max_iteraciones=50):
+        """
+        Temperatura alcanzada desde T_desde al aportar q J/kg.
+        
+        La primitiva no tiene inversa cerrada, así que se resuelve con Newton
+        partiendo de la estimación con c(T_desde). Acepta escalares o arreglos.
+        """
+        objetivo = self.primitiva(T_desde) + q
+        T = T_desde + q / self.valor(T_desde)
+        for _ in range(max_iteraciones):
+            paso = (self.primitiva(T) - objetivo) / self.valor(T)
+            T = T - paso
+            if np.all(np.abs(paso) <= 1e-10 * (1 + np.abs(T))):
+                break
+        return T
+    
+    def describir(self):
+        nombres = 'ABCDE'
+        terminos = ', '.join(f"{n}={v}" for n, v in zip(nombres, self.coeficientes) if v)
+        return f"Shomate ({terminos}) J/(kg·°C), t = T[K]/1000"
+
+
+def crear_calor_especifico(valor):
+    """
+    Crea el calor específico de una fase a partir de su valor en las constantes.
+    
+    Args:
+        valor: Número (c constante) o dict {'shomate': [A, B, C, D, E]}
+    
+    Returns:
+        CalorEspecificoConstante o CalorEspecificoShomate
+    """
+    if isinstance(valor, dict):
+        if 'shomate' in valor:
+            return CalorEspecificoShomate(valor['shomate'])
+        raise ValueError(f"Calor específico no reconocido: {valor}")
+    return CalorEspecificoConstante(valor)
+
+
+def describir_calor_especifico(valor):
+    """Texto legible del calor específico de una fase tal como está en las constantes."""
+    return crear_calor_especifico(valor).describir()
+
+
+class TablaEntalpia:
+    """
+    Tabla de entalpía acumulada H(T) de un material.
+    
+    La referencia H = 0 es el sólido en su punto de fusión. Los puntos de
+    cambio de fase pertenecen a la fase inferior: H(T_fusion) es la entalpía
+    del sólido y el calor latente se suma en cuanto T supera ese punto.
+    """
+    
+    def __init__(self, const_mat):
+        self.fases_sensibles = []
+        self.fases_latentes = []
+        self.tramos = []
+        self.transiciones = []
+        self.latentes = []
+        
+        for segmento in segmentos_fase(const_mat):
+            if segmento[0] == 'sensible':
+                self.fases_sensibles.append(segmento[1])
+                self.tramos.append(crear_calor_especifico(segmento[4]))
+            else:
+                self.fases_latentes.append(segmento[1])
+                self.transiciones.append(segmento[2])
+                self.latentes.append(segmento[3])
+        
+        # Cada tramo sensible k vale H_base[k] + ∫ c_k dT desde T_ref[k] hasta T
+        self.T_ref = [self.transiciones[0]] + self.transiciones
+        self.H_base = [0.0]
+        self.H_antes = []
+        self.H_despues = []
+        for j, T_cambio in enumerate(self.transiciones):
+            H_antes = self.H_base[j] + self.tramos[j].calor(self.T_ref[j], T_cambio)
+            self.H_antes.append(H_antes)
+            self.H_despues.append(H_antes + self.latentes[j])
+            self.H_base.append(H_antes + self.latentes[j])
+        
+        # Fases en orden de entalpía creciente: sensible, latente, sensible...
+        self.fases = [None] * (len(self.fases_sensibles) + len(self.fases_latentes))
+        self.fases[0::2] = self.fases_sensibles
+        self.fases[1::2] = self.fases_latentes
+        
+        # Puntos de quiebre de la curva inversa T(H): antes y después de cada salto
+        self.H_quiebres = [None] * (2 * len(self.transiciones))
+        self.H_quiebres[0::2] = self.H_antes
+        self.H_quiebres[1::2] = self.H_despues
+        
+        # Etapas completas entre cada par de fases, para no rehacerlas en etapas()
+        self._intermedias = {
+            (k_i, k_f): self._etapas_intermedias(k_i, k_f)
+            for k_i in range(len(self.tramos)) for k_f in range(len(self.tramos)) if k_i != k_f
+        }
+        
+        # Copias en NumPy para las consultas por lotes; si todas las fases
+        # tienen c constante se usa la fórmula lineal sin recorrer tramos
+        self.constante = all(tramo.constante for tramo in self.tramos)
+        self._transiciones = np.array(self.transiciones, dtype=float)
+        self._c = np.array([tramo.c for tramo in self.tramos], dtype=float) if self.constante else None
+        self._T_ref = np.array(self.T_ref, dtype=float)
+        self._H_base = np.array(self.H_base, dtype=float)
+        self._H_quiebres = np.array(self.H_quiebres, dtype=float)
+        self._H_antes = np.array(self.H_antes, dtype=float)
+        self._latentes = np.array(self.latentes, dtype=float)
+    
+    def entalpia(self, T):
+        """Entalpía específica H(T) en J/kg para una temperatura."""
+        k = bisect_left(self.transiciones, T)
+        return self.H_base[k] + self.tramos[k].calor(self.T_ref[k], T)
+    
+    def entalpia_lote(self, T):
+        """Entalpía específica H(T) en J/kg para un arreglo de temperaturas."""
+        T = np.asarray(T, dtype=float)
+        k = np.searchsorted(self._transiciones, T, side='left')
+        if self.constante:
+            return self._H_base[k] + self._c[k] * (T - self._T_ref[k])
+        
+        H = np.empty(T.shape)
+        for i, tramo in enumerate(self.tramos):
+            en_tramo = k == i
+            H[en_tramo] = self.H_base[i] + tramo.calor(self.T_ref[i], T[en_tramo])
+        return H
+    
+    def temperatura(self, h):
+        """
+        Invierte la curva de entalpía para un valor de H.
+        
+        Args:
+            h (float): Entalpía específica en J/kg
+        
+        Returns:
+            tuple: (T, fase, fraccion) donde fraccion es la parte ya
+                   transformada si H cae en una meseta de cambio de fase,
+                   o None si cae en un tramo sensible
+        """
+        p = bisect_left(self.H_quiebres, h)
+        k = p // 2
+        if p % 2:
+            fraccion = (h - self.H_antes[k]) / self.latentes[k]
+            return self.transiciones[k], self.fases[p], fraccion
+        return self.tramos[k].temperatura(self.T_ref[k], h - self.H_base[k]), self.fases[p], None
+    
+    def temperatura_lote(self, h):
+        """
+        Invierte la curva de entalpía para un arreglo de valores de H.
+        
+        Args:
+            h (array_like): Entalpías específicas en J/kg
+        
+        Returns:
+            tuple: (T, codigo_fase, fraccion) como ndarrays; codigo_fase indexa
+                   self.fases y fraccion es NaN fuera de las mesetas
+        """
+        h = np.asarray(h, dtype=float)
+        p = np.searchsorted(self._H_quiebres, h, side='left')
+        k = p // 2
+        en_meseta = (p % 2).astype(bool)
+        
+        if self.constante:
+            T = self._T_ref[k] + (h - self._H_base[k]) / self._c[k]
+        else:
+            T = np.empty(h.shape)
+            for i, tramo in enumerate(self.tramos):
+                en_tramo = p == 2 * i
+                T[en_tramo] = tramo.temperatura(self.T_ref[i], h[en_tramo] - self.H_base[i])
+        fraccion = np.full(h.shape, np.nan)
+        if self.transiciones:
+            j = np.minimum(k, len(self.transiciones) - 1)
+            T = np.where(en_meseta, self._transiciones[j], T)
+            fraccion = np.where(en_meseta, (h - self._H_antes[j]) / self._latentes[j], np.nan)
+        
+        return T, p, fraccion
+    
+    def etapas(self, Ti, Tf):
+        """
+        Recorre las fases atravesadas al ir de Ti a Tf.
+        
+        Args:
+            Ti (float): Temperatura inicial en °C
+            Tf (float): Temperatura final en °C
+        
+        Returns:
+            list: Tuplas (fase, T_inicio, T_fin, constante, q) en orden de
+                  recorrido, con q en J/kg (negativo al enfriar)
+        """
+        k_i = bisect_left(self.transiciones, Ti)
+        k_f = bisect_left(self.transiciones, Tf)
+        if k_i == k_f:
+            return [self._etapa_sensible(k_i, Ti, Tf)] if Tf != Ti else []
+        
+        # Al calentar se sale de la fase k_i por el cambio k_i y se entra a
+        # k_f por el k_f - 1; al enfriar, por los de abajo y de arriba
+        if k_f > k_i:
+            T_salida, T_entrada = self.transiciones[k_i], self.transiciones[k_f - 1]
+        else:
+            T_salida, T_entrada = self.transiciones[k_i - 1], self.transiciones[k_f]
+        etapas = [self._etapa_sensible(k_i, Ti, T_salida)] if Ti != T_salida else []
+        etapas += self._intermedias[k_i, k_f]
+        if Tf != T_entrada:
+            etapas.append(self._etapa_sensible(k_f, T_entrada, Tf))
+        return etapas
+    
+    def _etapas_intermedias(self, k_i, k_f):
+        # Cambios de fase y tramos sensibles completos entre las fases k_i y
+        # k_f, que no dependen de Ti ni de Tf
+        paso = 1 if k_f > k_i else -1
+        etapas = []
+        k = k_i
+        while k != k_f:
+            j = k if paso > 0 else k - 1
+            if k != k_i:
+                desde, hasta = self.transiciones[j - paso], self.transiciones[j]
+                etapas.append(self._etapa_sensible(k, desde, hasta))
+            L = self.latentes[j]
+            etapas.append((self.fases_latentes[j], self.transiciones[j], self.transiciones[j], L, paso * L))
+            k += paso
+        return tuple(etapas)
+    
+    def _etapa_sensible(self, k, T_desde, T_hasta):
+        # Con c(T) variable la constante informada es el c medio del tramo
+        tramo = self.tramos[k]
+        q = tramo.calor(T_desde, T_hasta)
+        c = tramo.c if tramo.constante else q / (T_hasta - T_desde)
+        return self.fases_sensibles[k], T_desde, T_hasta, c, q
+    
+    def etapas_lote(self, Ti, Tf):
+        """
+        Versión vectorizada de etapas para muchos pares (Ti, Tf).
+        
+        Args:
+            Ti (array_like): Temperaturas iniciales en °C
+            Tf (array_like): Temperaturas finales en °C
+        
+        Returns:
+            tuple: (filas, codigos, T_inicio, T_fin, q) como ndarrays planos,
+                   una entrada por etapa, agrupadas por fila y en orden de
+                   recorrido; codigos indexa self.fases y q está en J/kg
+        """
+        Ti = np.ravel(np.asarray(Ti, dtype=float))
+        Tf = np.ravel(np.asarray(Tf, dtype=float))
+        n, R = len(Ti), len(self.fases)
+        T_inicio = np.empty((n, R))
+        T_fin = np.empty((n, R))
+        q = np.empty((n, R))
+        presente = np.empty((n, R), dtype=bool)
+        
+        # Columna r = fase r de self.fases, con los mismos recortes que calores_por_fase_lote
+        limites = [-np.inf] + self.transiciones + [np.inf]
+        for k, tramo in enumerate(self.tramos):
+            desde = np.clip(Ti, limites[k], limites[k + 1])
+            hasta = np.clip(Tf, limites[k], limites[k + 1])
+            T_inicio[:, 2 * k] = desde
+            T_fin[:, 2 * k] = hasta
+            q[:, 2 * k] = tramo.calor(desde, hasta)
+            presente[:, 2 * k] = desde != hasta
+            if k < len(self.transiciones):
+                T_cambio = self.transiciones[k]
+                cruce = (Tf > T_cambio).astype(float) - (Ti > T_cambio).astype(float)
+                T_inicio[:, 2 * k + 1] = T_cambio
+                T_fin[:, 2 * k + 1] = T_cambio
+                q[:, 2 * k + 1] = self.latentes[k] * cruce
+                presente[:, 2 * k + 1] = cruce != 0
+        
+        # Al enfriar las fases se recorren de la última a la primera
+        columnas = np.where((Tf < Ti)[:, None], np.arange(R)[::-1], np.arange(R))
+        filas = np.broadcast_to(np.arange(n)[:, None], (n, R))
+        presente = presente[filas, columnas]
+        return (filas[presente], columnas[presente], T_inicio[filas, columnas][presente],
+                T_fin[filas, columnas][presente], q[filas, columnas][presente])
+    
+    def calores_por_fase_lote(self, Ti, Tf):
+        """
+        Calor específico (J/kg) aportado por cada fase entre Ti y Tf.
+        
+        Args:
+            Ti (ndarray): Temperaturas iniciales en °C
+            Tf (ndarray): Temperaturas finales en °C
+        
+        Returns:
+            dict: {fase: ndarray} en orden de temperatura
+        """
+        calores = {}
+        limites = [-np.inf] + self.transiciones + [np.inf]
+        for k, fase in enumerate(self.fases_sensibles):
+            T_desde, T_hasta = limites[k], limites[k + 1]
+            calores[fase] = self.tramos[k].calor(
+                np.clip(Ti, T_desde, T_hasta), np.clip(Tf, T_desde, T_hasta)
+            )
+            if k < len(self.transiciones):
+                T_cambio = self.transiciones[k]
+                cruce = (Tf > T_cambio).astype(float) - (Ti > T_cambio).astype(float)
+                calores[self.fases_latentes[k]] = self.latentes[k] * cruce
+        return calores
@@ -0,0 +1,85 @@
+"""
+Estilo y dibujo de los gráficos, independientes del backend.
+
+Solo usa matplotlib.figure.Figure: importar este módulo no carga pyplot
+ni tkinter. Lo comparten los gráficos de la interfaz (grapher.py, sobre
+un lienzo TkAgg) y los diagramas sin ventana (diagramas.py, sobre Agg).
+"""
+
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+
+
+TITULO_DIAGRAMA = 'Diagrama Temperatura vs Energía'
+
+
+def limites_estables(valores, actuales):
+    """
+    Elige los límites de un eje con histéresis.
+    
+    Se mantienen los límites actuales mientras los datos quepan y ocupen al
+    menos la mitad del rango; así los cálculos parecidos se redibujan con
+    blitting. Si no, se amplían hasta marcas "redondas" del eje.
+    """
+    bajo, alto = min(valores), max(valores)
+    if actuales is not None:
+        a_bajo, a_alto = actuales
+        if a_bajo <= bajo and alto <= a_alto and (alto - bajo) >= 0.5 * (a_alto - a_bajo):
+            return actuales
+    margen = 0.05 * (alto - bajo) or 1.0
+    marcas = MaxNLocator(nbins=8).tick_values(bajo - margen, alto + margen)
+    return marcas[0], marcas[-1]
+
+
+def configurar_ejes(ax):
+    """Aplica títulos, etiquetas y estilo del diagrama temperatura-energía."""
+    ax.set_xlabel('Energía Total (kJ)', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Temperatura (°C)', fontsize=12, fontweight='bold')
+    ax.set_title(TITULO_DIAGRAMA, fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.set_facecolor('#f8f9fa')
+
+
+def crear_figura_diagrama(ancho=12, alto=5, dpi=100):
+    """
+    Crea la figura del diagrama temperatura-energía, todavía sin lienzo.
+    
+    La línea es un artista animado: no forma parte del fondo que se guarda
+    para redibujar con blitting.
+    
+    Returns:
+        tuple: (figura, ejes, linea)
+    """
+    figura = Figure(figsize=(ancho, alto), dpi=dpi)
+    ejes = figura.add_subplot(111)
+    configurar_ejes(ejes)
+    linea, = ejes.plot([], [], 'o-', color='#667eea', linewidth=2,
+                       markersize=8, markerfacecolor='#764ba2', animated=True)
+    return figura, ejes, linea
+
+
+def colocar_anotaciones(ejes, anotaciones, energias_kJ, temps):
+    """
+    Anota la temperatura de cada quiebre del diagrama (salvo el inicial).
+    
+    Reutiliza las anotaciones existentes, agrega a la lista las que falten
+    y oculta las sobrantes.
+    
+    Returns:
+        int: Cantidad de anotaciones visibles (las primeras de la lista)
+    """
+    puntos = list(zip(energias_kJ, temps))[1:]  # No anotar el punto inicial
+    for i, (e, t) in enumerate(puntos):
+        if i < len(anotaciones):
+            anotacion = anotaciones[i]
+            anotacion.xy = (e, t)
+            anotacion.set_text(f'{t}°C')
+            anotacion.set_visible(True)
+        else:
+            anotaciones.append(ejes.annotate(
+                f'{t}°C', xy=(e, t), xytext=(5, 5),
+                textcoords='offset points', fontsize=9, animated=True
+            ))
+    for anotacion in anotaciones[len(puntos):]:
+        anotacion.set_visible(False)
+    return len(puntos)
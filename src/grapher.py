@@ -2,53 +2,293 @@
 Módulo para generar gráficos de calorimetría.
 """
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+from matplotlib import colormaps
 from matplotlib.figure import Figure
 
+from figuras import colocar_anotaciones, configurar_ejes, crear_figura_diagrama, limites_estables
+
+
+def _lienzo_tk(figura, frame_grafico):
+    """Lienzo TkAgg dentro de un frame (tkinter se importa solo al crearlo)."""
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    canvas = FigureCanvasTkAgg(figura, master=frame_grafico)
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+    return canvas
+
+
+class DiagramaTemperaturaEnergia:
+    """
+    Diagrama temperatura vs energía persistente dentro de un frame de tkinter.
+    
+    La figura, el lienzo, la línea y las anotaciones se crean una sola vez;
+    cada cálculo nuevo solo cambia sus datos. Si los límites de los ejes no
+    cambian se redibuja con blitting (solo la línea y las anotaciones sobre
+    el fondo guardado); si cambian, se pide un redibujado completo con
+    draw_idle. Los límites tienen histéresis para que los cálculos parecidos
+    no obliguen a redibujar todo.
+    """
+    
+    def __init__(self, frame_grafico):
+        # Los artistas animados no forman parte del fondo guardado
+        self.figura, self.ejes, self.linea = crear_figura_diagrama(12, 5, 100)
+        self.anotaciones = []
+        self._limites = None
+        self.figura.tight_layout()
+        
+        self.canvas = self._crear_canvas(frame_grafico)
+        self._fondo = None
+        self.canvas.mpl_connect('draw_event', self._al_dibujar)
+    
+    def _crear_canvas(self, frame_grafico):
+        return _lienzo_tk(self.figura, frame_grafico)
+    
+    def _artistas(self):
+        return [self.linea] + [a for a in self.anotaciones if a.get_visible()]
+    
+    def _al_dibujar(self, event):
+        """Tras un redibujado completo, guarda el fondo y pinta los artistas animados."""
+        self._fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+        for artista in self._artistas():
+            self.figura.draw_artist(artista)
+    
+    def actualizar(self, temps, energias):
+        """
+        Cambia los datos del diagrama y lo redibuja.
+        
+        Args:
+            temps (list): Lista de temperaturas
+            energias (list): Lista de energías en Joules
+        """
+        energias_kJ = [e/1000 for e in energias]
+        self.linea.set_data(energias_kJ, temps)
+        
+        # Reutilizar las anotaciones existentes y crear solo las que falten
+        colocar_anotaciones(self.ejes, self.anotaciones, energias_kJ, temps)
+        
+        actuales = self._limites or (None, None)
+        limites = (limites_estables(energias_kJ, actuales[0]),
+                   limites_estables(temps, actuales[1]))
+        
+        if self._fondo is None or limites != self._limites:
+            self._limites = limites
+            self.ejes.set_xlim(*limites[0])
+            self.ejes.set_ylim(*limites[1])
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self._fondo)
+            for artista in self._artistas():
+                self.figura.draw_artist(artista)
+            self.canvas.blit(self.figura.bbox)
+
+
+def reducir_malla(eje_x, eje_y, Z, max_columnas, max_filas):
+    """
+    Submuestrea una malla para no dibujar más celdas que píxeles.
+    
+    Toma una de cada k filas y columnas, así que los valores mostrados
+    son exactos (no promedios) y el costo no depende del tamaño original.
+    
+    Args:
+        eje_x (ndarray): Valores de las columnas
+        eje_y (ndarray): Valores de las filas
+        Z (ndarray): Malla de forma (len(eje_y), len(eje_x))
+        max_columnas (int): Máximo de columnas a conservar
+        max_filas (int): Máximo de filas a conservar
+    
+    Returns:
+        tuple: (eje_x, eje_y, Z) reducidos
+    """
+    paso_x = max(1, -(-len(eje_x) // max(1, int(max_columnas))))
+    paso_y = max(1, -(-len(eje_y) // max(1, int(max_filas))))
+    return eje_x[::paso_x], eje_y[::paso_y], Z[::paso_y, ::paso_x]
+
+
+class MapaBarrido:
+    """
+    Mapa de calor persistente de Q sobre una malla de dos parámetros.
+    
+    Como el diagrama temperatura-energía, la figura y la imagen se crean
+    una vez y cada barrido nuevo solo reemplaza sus datos. La malla se
+    reduce al tamaño en píxeles de los ejes antes de dibujarla.
+    """
+    
+    NIVELES_CONTORNO = 10
+    
+    def __init__(self, frame_grafico):
+        self.figura = Figure(figsize=(8, 6), dpi=100)
+        self.ejes = self.figura.add_subplot(111)
+        self.imagen = self.ejes.imshow([[0.0]], origin='lower', aspect='auto',
+                                       interpolation='nearest', cmap='inferno')
+        self.barra = self.figura.colorbar(self.imagen, ax=self.ejes, label='Q total (kJ)')
+        self.contornos = None
+        self.canvas = self._crear_canvas(frame_grafico)
+    
+    def _crear_canvas(self, frame_grafico):
+        return _lienzo_tk(self.figura, frame_grafico)
+    
+    def actualizar(self, eje_x, eje_y, Q, etiqueta_x, etiqueta_y, titulo=''):
+        """
+        Dibuja una malla nueva.
+        
+        Args:
+            eje_x (array_like): Valores de las columnas de Q
+            eje_y (array_like): Valores de las filas de Q
+            Q (ndarray): Calor en J, de forma (len(eje_y), len(eje_x))
+            etiqueta_x (str): Nombre del eje x
+            etiqueta_y (str): Nombre del eje y
+            titulo (str): Título del gráfico
+        """
+        extension = self.ejes.get_window_extent()
+        eje_x, eje_y, Q = reducir_malla(np.asarray(eje_x), np.asarray(eje_y), np.asarray(Q),
+                                        extension.width, extension.height)
+        Q_kJ = Q / 1000
+        
+        self.imagen.set_data(Q_kJ)
+        self.imagen.set_extent((eje_x[0], eje_x[-1], eje_y[0], eje_y[-1]))
+        finitos = Q_kJ[np.isfinite(Q_kJ)]
+        if finitos.size:
+            self.imagen.set_clim(finitos.min(), finitos.max())
+        
+        if self.contornos is not None:
+            self.contornos.remove()
+            self.contornos = None
+        if len(eje_x) > 1 and len(eje_y) > 1 and finitos.size and finitos.min() < finitos.max():
+            self.contornos = self.ejes.contour(eje_x, eje_y, Q_kJ, levels=self.NIVELES_CONTORNO,
+                                               colors='white', linewidths=0.6, alpha=0.6)
+        
+        self.ejes.set_xlim(eje_x[0], eje_x[-1])
+        self.ejes.set_ylim(eje_y[0], eje_y[-1])
+        self.ejes.set_xlabel(etiqueta_x, fontsize=12, fontweight='bold')
+        self.ejes.set_ylabel(etiqueta_y, fontsize=12, fontweight='bold')
+        self.ejes.set_title(titulo, fontsize=14, fontweight='bold')
+        self.canvas.draw_idle()
+
+
+class PerfilesConduccion:
+    """
+    Perfiles de temperatura T(x) de una barra en varios instantes.
+    
+    La figura se crea una vez por frame; cada actualización reemplaza las
+    curvas. Con muchos nodos cada curva se reduce al ancho en píxeles de
+    los ejes.
+    """
+    
+    def __init__(self, frame_grafico):
+        self.figura = Figure(figsize=(12, 5), dpi=100)
+        self.ejes = self.figura.add_subplot(111)
+        self.ejes.set_xlabel('Posición (mm)', fontsize=12, fontweight='bold')
+        self.ejes.set_ylabel('Temperatura (°C)', fontsize=12, fontweight='bold')
+        self.ejes.set_title('Perfiles de Temperatura', fontsize=14, fontweight='bold')
+        self.ejes.grid(True, alpha=0.3)
+        self.ejes.set_facecolor('#f8f9fa')
+        self.artistas = []
+        self.canvas = self._crear_canvas(frame_grafico)
+    
+    def _crear_canvas(self, frame_grafico):
+        return _lienzo_tk(self.figura, frame_grafico)
+    
+    def actualizar(self, perfiles):
+        """
+        Dibuja una lista de perfiles.
+        
+        Args:
+            perfiles (list): PerfilConduccion (o tuplas con t, x, T y frentes)
+        """
+        for artista in self.artistas:
+            artista.remove()
+        self.artistas = []
+        
+        ancho = self.ejes.get_window_extent().width
+        colores = colormaps['plasma'](np.linspace(0, 0.9, max(len(perfiles), 1)))
+        for perfil, color in zip(perfiles, colores):
+            paso = max(1, -(-len(perfil.x) // max(1, int(ancho))))
+            linea, = self.ejes.plot(perfil.x[::paso] * 1000, perfil.T[::paso], color=color,
+                                    linewidth=2, label=f't = {perfil.t:g} s')
+            self.artistas.append(linea)
+            # Frentes de cambio de fase como líneas verticales punteadas
+            for posiciones in perfil.frentes.values():
+                for posicion in posiciones:
+                    self.artistas.append(self.ejes.axvline(posicion * 1000, color=color,
+                                                           linestyle=':', linewidth=1))
+        
+        self.ejes.relim()
+        self.ejes.autoscale_view()
+        if perfiles:
+            self.artistas.append(self.ejes.legend(loc='best', fontsize=9))
+        self.canvas.draw_idle()
+
 
 class GraficadorCalor:
     """Clase para crear gráficos de procesos termodinámicos."""
     
+    configurar_ejes = staticmethod(configurar_ejes)
+    
     @staticmethod
     def crear_diagrama_temperatura_energia(frame_grafico, temps, energias):
         """
         Crea un gráfico de temperatura vs energía.
         
+        La primera llamada sobre un frame crea la figura; las siguientes
+        reutilizan la misma figura y solo actualizan sus datos.
+        
         Args:
             frame_grafico: Widget de tkinter donde se mostrará el gráfico
             temps (list): Lista de temperaturas
             energias (list): Lista de energías en Joules
+        
+        Returns:
+            DiagramaTemperaturaEnergia: Diagrama asociado al frame
         """
-        # Limpiar frame anterior
-        for widget in frame_grafico.winfo_children():
-            widget.destroy()
+        diagrama = getattr(frame_grafico, '_diagrama_calor', None)
+        if diagrama is None:
+            diagrama = DiagramaTemperaturaEnergia(frame_grafico)
+            frame_grafico._diagrama_calor = diagrama
         
-        # Crear figura
-        fig = Figure(figsize=(12, 5), dpi=100)
-        ax = fig.add_subplot(111)
+        diagrama.actualizar(temps, energias)
+        return diagrama
+    
+    @staticmethod
+    def crear_mapa_barrido(frame_grafico, eje_x, eje_y, Q, etiqueta_x, etiqueta_y, titulo=''):
+        """
+        Crea o actualiza el mapa de calor de un barrido de parámetros.
         
-        # Convertir energías a kJ
-        energias_kJ = [e/1000 for e in energias]
+        Args:
+            frame_grafico: Widget de tkinter donde se mostrará el gráfico
+            eje_x (array_like): Valores de las columnas de Q
+            eje_y (array_like): Valores de las filas de Q
+            Q (ndarray): Calor en J, de forma (len(eje_y), len(eje_x))
+            etiqueta_x (str): Nombre del eje x
+            etiqueta_y (str): Nombre del eje y
+            titulo (str): Título del gráfico
+        
+        Returns:
+            MapaBarrido: Mapa asociado al frame
+        """
+        mapa = getattr(frame_grafico, '_mapa_barrido', None)
+        if mapa is None:
+            mapa = MapaBarrido(frame_grafico)
+            frame_grafico._mapa_barrido = mapa
+        
+        mapa.actualizar(eje_x, eje_y, Q, etiqueta_x, etiqueta_y, titulo)
+        return mapa
+    
+    @staticmethod
+    def crear_perfiles_conduccion(frame_grafico, perfiles):
+        """
+        Crea o actualiza el gráfico de perfiles T(x) de una barra.
+        
+        Args:
+            frame_grafico: Widget de tkinter donde se mostrará el gráfico
+            perfiles (list): PerfilConduccion de conduccion.BarraConduccion
+        
+        Returns:
+            PerfilesConduccion: Gráfico asociado al frame
+        """
+        grafico = getattr(frame_grafico, '_perfiles_conduccion', None)
+        if grafico is None:
+            grafico = PerfilesConduccion(frame_grafico)
+            frame_grafico._perfiles_conduccion = grafico
         
-        # Graficar
-        ax.plot(energias_kJ, temps, 'o-', color='#667eea', linewidth=2, 
-                markersize=8, markerfacecolor='#764ba2')
-        ax.set_xlabel('Energía Total (kJ)', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Temperatura (°C)', fontsize=12, fontweight='bold')
-        ax.set_title('Diagrama Temperatura vs Energía', fontsize=14, fontweight='bold')
-        ax.grid(True, alpha=0.3)
-        ax.set_facecolor('#f8f9fa')
-        
-        # Agregar anotaciones en puntos clave
-        for i, (e, t) in enumerate(zip(energias_kJ, temps)):
-            if i > 0:  # No anotar el punto inicial
-                ax.annotate(f'{t}°C', xy=(e, t), xytext=(5, 5), 
-                           textcoords='offset points', fontsize=9)
-        
-        fig.tight_layout()
-        
-        # Integrar en tkinter
-        canvas = FigureCanvasTkAgg(fig, master=frame_grafico)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        grafico.actualizar(perfiles)
+        return grafico
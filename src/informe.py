@@ -0,0 +1,181 @@
+"""
+Informes de resultados escritos por partes en cualquier archivo de texto.
+
+Cada informe escribe un resultado a la vez (su encabezado, sus etapas y el
+total) directamente en el archivo, así que un informe de millones de
+resultados nunca se arma completo en memoria:
+
+    with open('informe.html', 'w', encoding='utf-8') as archivo:
+        escribir_informe(archivo, resultados, formato='html')
+
+donde resultados es cualquier iterable (por ejemplo un generador) de
+(titulo, Q_total, etapas). Las etapas pueden ser EtapaCalor o los dicts de
+la interfaz; el titulo puede ser None.
+"""
+
+import csv
+import html
+
+
+def _a_dict(etapa):
+    return etapa.a_dict() if hasattr(etapa, 'a_dict') else etapa
+
+
+class InformeTexto:
+    """Texto plano con el formato de la pestaña Calculadora."""
+    
+    extension = '.txt'
+    
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.cantidad = 0
+    
+    def comenzar(self):
+        pass
+    
+    def escribir(self, Q_total, etapas, titulo=None):
+        """Escribe un resultado completo."""
+        etapas = [_a_dict(r) for r in etapas]
+        partes = []
+        if self.cantidad:
+            partes.append("\n")
+        partes.append("═" * 80 + "\n")
+        partes.append("RESULTADOS DEL CÁLCULO\n" if titulo is None
+                      else f"RESULTADOS DEL CÁLCULO: {titulo}\n")
+        partes.append("═" * 80 + "\n\n")
+        
+        for i, r in enumerate(etapas, 1):
+            partes.append(f"Etapa {i}: {r['fase']}\n")
+            partes.append(f"Rango: {r['rango']}\n")
+            partes.append(f"Fórmula: {r['formula']}\n")
+            partes.append(f"Q{i} = {r['valor']:.2f} J = {r['valor']/1000:.2f} kJ\n")
+            partes.append("-" * 80 + "\n\n")
+        
+        partes.append("═" * 80 + "\n")
+        partes.append("CALOR TOTAL:\n")
+        partes.append(f"Q_total = {' + '.join([f'Q{i+1}' for i in range(len(etapas))])}\n")
+        partes.append(f"Q_total = {Q_total:.2f} J\n")
+        partes.append(f"Q_total = {Q_total/1000:.2f} kJ\n")
+        partes.append(f"Q_total = {Q_total/1000000:.2f} MJ\n")
+        partes.append("═" * 80 + "\n")
+        
+        self.archivo.write("".join(partes))
+        self.cantidad += 1
+    
+    def terminar(self):
+        pass
+
+
+class InformeMarkdown(InformeTexto):
+    """Markdown: una sección con tabla de etapas por resultado."""
+    
+    extension = '.md'
+    
+    def comenzar(self):
+        self.archivo.write("# Resultados del cálculo\n")
+    
+    @staticmethod
+    def _celda(texto):
+        return str(texto).replace("|", "\\|")
+    
+    def escribir(self, Q_total, etapas, titulo=None):
+        self.cantidad += 1
+        partes = [f"\n## {titulo if titulo is not None else f'Resultado {self.cantidad}'}\n\n",
+                  "| Etapa | Fase | Rango | Fórmula | Q (J) | Q (kJ) |\n",
+                  "|---:|---|---|---|---:|---:|\n"]
+        for i, r in enumerate(etapas, 1):
+            r = _a_dict(r)
+            partes.append(f"| {i} | {self._celda(r['fase'])} | {self._celda(r['rango'])} | "
+                          f"{self._celda(r['formula'])} | {r['valor']:.2f} | {r['valor']/1000:.2f} |\n")
+        partes.append(f"\n**Q_total = {Q_total:.2f} J = {Q_total/1000:.2f} kJ = "
+                      f"{Q_total/1000000:.2f} MJ**\n")
+        self.archivo.write("".join(partes))
+
+
+class InformeHTML(InformeTexto):
+    """Documento HTML con una tabla de etapas por resultado."""
+    
+    extension = '.html'
+    
+    def comenzar(self):
+        self.archivo.write(
+            "<!DOCTYPE html>\n<html lang=\"es\">\n<head>\n<meta charset=\"utf-8\">\n"
+            "<title>Resultados del cálculo</title>\n"
+            "<style>\n"
+            "body { font-family: sans-serif; margin: 2em; }\n"
+            "table { border-collapse: collapse; margin-bottom: 0.5em; }\n"
+            "th, td { border: 1px solid #ccc; padding: 4px 8px; }\n"
+            "td.num { text-align: right; font-family: monospace; }\n"
+            "</style>\n</head>\n<body>\n<h1>Resultados del cálculo</h1>\n"
+        )
+    
+    def escribir(self, Q_total, etapas, titulo=None):
+        self.cantidad += 1
+        titulo = titulo if titulo is not None else f"Resultado {self.cantidad}"
+        partes = [f"<section>\n<h2>{html.escape(str(titulo))}</h2>\n<table>\n",
+                  "<tr><th>Etapa</th><th>Fase</th><th>Rango</th><th>Fórmula</th>"
+                  "<th>Q (J)</th><th>Q (kJ)</th></tr>\n"]
+        for i, r in enumerate(etapas, 1):
+            r = _a_dict(r)
+            partes.append(
+                f"<tr><td class=\"num\">{i}</td><td>{html.escape(r['fase'])}</td>"
+                f"<td>{html.escape(r['rango'])}</td><td>{html.escape(r['formula'])}</td>"
+                f"<td class=\"num\">{r['valor']:.2f}</td><td class=\"num\">{r['valor']/1000:.2f}</td></tr>\n"
+            )
+        partes.append(f"</table>\n<p><strong>Q_total = {Q_total:.2f} J = {Q_total/1000:.2f} kJ = "
+                      f"{Q_total/1000000:.2f} MJ</strong></p>\n</section>\n")
+        self.archivo.write("".join(partes))
+    
+    def terminar(self):
+        self.archivo.write("</body>\n</html>\n")
+
+
+class InformeCSV(InformeTexto):
+    """CSV con una fila por etapa y una fila 'total' por resultado."""
+    
+    extension = '.csv'
+    
+    def __init__(self, archivo):
+        super().__init__(archivo)
+        self.escritor = csv.writer(archivo, lineterminator='\n')
+    
+    def comenzar(self):
+        self.escritor.writerow(('resultado', 'titulo', 'etapa', 'fase', 'rango', 'formula', 'Q_J'))
+    
+    def escribir(self, Q_total, etapas, titulo=None):
+        self.cantidad += 1
+        titulo = '' if titulo is None else titulo
+        filas = []
+        for i, r in enumerate(etapas, 1):
+            r = _a_dict(r)
+            filas.append((self.cantidad, titulo, i, r['fase'], r['rango'], r['formula'], r['valor']))
+        filas.append((self.cantidad, titulo, 'total', '', '', '', Q_total))
+        self.escritor.writerows(filas)
+
+
+INFORMES = {
+    'texto': InformeTexto,
+    'markdown': InformeMarkdown,
+    'html': InformeHTML,
+    'csv': InformeCSV,
+}
+
+
+def escribir_informe(archivo, resultados, formato='texto'):
+    """
+    Escribe un informe completo a medida que se consumen los resultados.
+    
+    Args:
+        archivo: Archivo de texto abierto (o cualquier objeto con write)
+        resultados (iterable): Tuplas (titulo, Q_total, etapas)
+        formato (str): 'texto', 'markdown', 'html' o 'csv'
+    
+    Returns:
+        int: Cantidad de resultados escritos
+    """
+    informe = INFORMES[formato](archivo)
+    informe.comenzar()
+    for titulo, Q_total, etapas in resultados:
+        informe.escribir(Q_total, etapas, titulo)
+    informe.terminar()
+    return informe.cantidad
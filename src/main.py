@@ -3,114 +3,57 @@ Calculadora de Calorimetría Completa.
 
 Aplicación interactiva para realizar cálculos de calorimetría con soporte
 para cambios de fase, múltiples materiales y visualización gráfica.
-"""
 
-import tkinter as tk
-from tkinter import ttk, messagebox
+Uso:
+    python main.py [--materiales RUTA] [--perfil]  Abre la interfaz gráfica
+    python main.py lote [opciones]                 Procesa un archivo de casos sin interfaz
+    python main.py servidor [opciones]             Servidor HTTP/JSON local
+    python main.py ajustar MEDICIONES [opciones]   Estima c y L a partir de mediciones
+    python main.py diagramas [opciones]            Guarda un diagrama por caso, sin ventana
+"""
 
-from constants import CONSTANTES_MATERIALES
-from calculator import CalculadoraCalor
-from grapher import GraficadorCalor
-from ui import TabConfigurator
-from despejador import VentanaDespejador
+import argparse
+import sys
 
 
-class CalorimetriaApp:
-    """Aplicación principal de calorimetría."""
+def main(argv=None):
+    """Función principal."""
+    argv = sys.argv[1:] if argv is None else argv
     
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Calculadora de Calorimetría Completa")
-        self.root.geometry("1400x900")
-        self.root.configure(bg='#f0f0f0')
-        
-        # Inicializar módulos
-        self.calculadora = CalculadoraCalor(CONSTANTES_MATERIALES)
-        self.tab_configurator = TabConfigurator(None, CONSTANTES_MATERIALES)
-        
-        # Crear interfaz
-        self.crear_interfaz()
+    # Los modos sin interfaz no deben importar tkinter ni matplotlib
+    if argv and argv[0] == 'lote':
+        from cli import main_lote
+        return main_lote(argv[1:])
+    if argv and argv[0] == 'servidor':
+        from servidor import main_servidor
+        return main_servidor(argv[1:])
+    if argv and argv[0] == 'ajustar':
+        from ajuste import main_ajuste
+        return main_ajuste(argv[1:])
+    if argv and argv[0] == 'diagramas':
+        from diagramas import main_diagramas
+        return main_diagramas(argv[1:])
     
-    def crear_interfaz(self):
-        """Crea la interfaz principal con pestañas."""
-        # Notebook (pestañas)
-        notebook = ttk.Notebook(self.root)
-        notebook.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Crear pestañas
-        tab_calculadora = ttk.Frame(notebook)
-        tab_formulas = ttk.Frame(notebook)
-        tab_constantes = ttk.Frame(notebook)
-        
-        notebook.add(tab_calculadora, text='Calculadora')
-        notebook.add(tab_formulas, text='Fórmulas y Despejes')
-        notebook.add(tab_constantes, text='Constantes')
-        
-        # Configurar cada pestaña
-        self.tab_config = self.tab_configurator.configurar_tab_calculadora(
-            tab_calculadora, 
-            {
-                'calcular': self.calcular,
-                'actualizar': self.actualizar_constantes,
-                'despeje': self.abrir_despeje
-            }
-        )
-        
-        self.tab_configurator.configurar_tab_formulas(tab_formulas)
-        self.tab_configurator.configurar_tab_constantes(tab_constantes)
-        
-        # Actualizar constantes iniciales
-        self.actualizar_constantes()
-        
-    def actualizar_constantes(self, event=None):
-        """Actualiza el texto de constantes para el material seleccionado."""
-        material = self.tab_config['material_var'].get()
-        TabConfigurator.actualizar_texto_constantes(
-            self.tab_config['text_constantes'], 
-            material, 
-            CONSTANTES_MATERIALES
-        )
+    parser = argparse.ArgumentParser(description="Calculadora de Calorimetría Completa")
+    parser.add_argument('--materiales',
+                        help="Archivo JSON o CSV con la base de materiales a usar")
+    parser.add_argument('--perfil', action='store_true',
+                        help="Medir cada etapa del cálculo y mostrar los tiempos en una barra de estado")
+    args = parser.parse_args(argv)
     
-    def calcular(self):
-        """Realiza el cálculo de calor total."""
-        try:
-            material = self.tab_config['material_var'].get()
-            masa = float(self.tab_config['masa_var'].get())
-            Ti = float(self.tab_config['temp_inicial_var'].get())
-            Tf = float(self.tab_config['temp_final_var'].get())
-            
-            # Calcular
-            Q_total, resultados, temperaturas, energias = \
-                self.calculadora.calcular_calor_total(material, masa, Ti, Tf)
-            
-            # Mostrar resultados
-            texto = CalculadoraCalor.formatear_resultados(Q_total, resultados)
-            self.tab_config['text_resultados'].delete('1.0', tk.END)
-            self.tab_config['text_resultados'].insert('1.0', texto)
-            
-            # Graficar
-            GraficadorCalor.crear_diagrama_temperatura_energia(
-                self.tab_config['frame_grafico'], 
-                temperaturas, 
-                energias
-            )
-            
-        except ValueError:
-            messagebox.showerror("Error", "Por favor ingresa valores numéricos válidos.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error en el cálculo: {str(e)}")
+    if args.perfil:
+        from perfilado import PERFILADOR
+        PERFILADOR.activar()
     
-    def abrir_despeje(self):
-        """Abre la ventana para despejar variables."""
-        VentanaDespejador(self.root)
-
-
-def main():
-    """Función principal."""
-    root = tk.Tk()
-    app = CalorimetriaApp(root)
-    root.mainloop()
+    constantes = None
+    if args.materiales:
+        from materiales import cargar_materiales
+        constantes = cargar_materiales(args.materiales)
+    
+    from app import ejecutar_interfaz
+    ejecutar_interfaz(constantes)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+Base de datos de materiales cargada desde archivos externos.
+
+Los materiales se leen de un archivo JSON o CSV y se guardan junto a él en
+una caché binaria (arreglo estructurado de NumPy, .npy) que en los arranques
+siguientes se abre como memoria mapeada, sin volver a interpretar el texto.
+La base se comporta como un diccionario de solo lectura, así que puede
+pasarse como `constantes` a CalculadoraCalor y a TabConfigurator.
+
+Formato JSON (igual que CONSTANTES_MATERIALES, con alias opcionales):
+
+    {"Cobre": {"alias": ["Cu", "copper"], "c_solido": 385, "c_liquido": 510,
+               "Lf": 205000, "T_fusion": 1085}, ...}
+
+Formato CSV (celdas vacías para constantes que no aplican; alias separados
+por '|'; los c(T) de Shomate solo pueden darse en JSON):
+
+    nombre,alias,c_solido,c_liquido,c_gas,Lf,Lv,T_fusion,T_ebullicion
+    Cobre,Cu|copper,385,510,,205000,,1085,
+"""
+
+import csv
+import json
+import os
+import unicodedata
+from collections.abc import Mapping
+
+import numpy as np
+
+
+CAMPOS_ESCALARES = ('Lf', 'Lv', 'T_fusion', 'T_ebullicion')
+CAMPOS_CALOR = ('c_solido', 'c_liquido', 'c_gas')
+CAMPOS_OBLIGATORIOS = ('c_solido', 'c_liquido', 'Lf', 'T_fusion')
+
+SEPARADOR_ALIAS = '|'
+
+CAMPOS_TEXTO = ('nombre', 'alias', 'claves')
+
+# Anchos fijos del formato anterior: recortaban los nombres largos
+_ANCHOS_ANTERIORES = (64, 128, 192)
+
+
+def dtype_cache(ancho_nombre, ancho_alias, ancho_claves):
+    """
+    dtype de la caché. Los textos se guardan en UTF-8 con el ancho en bytes
+    del más largo del catálogo, así que nunca se recortan.
+    """
+    return np.dtype(
+        [('nombre', f'S{ancho_nombre}'), ('alias', f'S{ancho_alias}'), ('claves', f'S{ancho_claves}')]
+        + [(campo, 'f8') for campo in CAMPOS_ESCALARES]
+        # Cada calor específico ocupa los 5 coeficientes de Shomate; si es
+        # constante solo se usa el primero y su bit en 'shomate' vale 0
+        + [(campo, 'f8', (5,)) for campo in CAMPOS_CALOR]
+        + [('shomate', 'u1')]
+    )
+
+
+def _es_dtype_cache(dtype):
+    try:
+        anchos = tuple(dtype[campo].itemsize for campo in CAMPOS_TEXTO)
+    except (KeyError, TypeError):
+        return False
+    return anchos != _ANCHOS_ANTERIORES and dtype == dtype_cache(*anchos)
+
+
+def normalizar(texto):
+    """Normaliza un nombre para buscarlo: sin acentos, subíndices ni mayúsculas."""
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.casefold().split())
+
+
+def _leer_json(ruta):
+    with open(ruta, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    if isinstance(datos, list):
+        # También se acepta una lista de objetos con clave 'nombre'
+        datos = {d.pop('nombre'): d for d in datos}
+    return datos
+
+
+def _leer_csv(ruta):
+    datos = {}
+    with open(ruta, encoding='utf-8', newline='') as archivo:
+        for fila in csv.DictReader(archivo):
+            const_mat = {}
+            alias = (fila.get('alias') or '').strip()
+            if alias:
+                const_mat['alias'] = [a.strip() for a in alias.split(SEPARADOR_ALIAS) if a.strip()]
+            for campo in CAMPOS_ESCALARES + CAMPOS_CALOR:
+                valor = (fila.get(campo) or '').strip()
+                if valor:
+                    const_mat[campo] = float(valor)
+            datos[fila['nombre'].strip()] = const_mat
+    return datos
+
+
+def _a_arreglo(datos):
+    """Convierte {nombre: constantes} al arreglo estructurado de la caché."""
+    textos = []
+    for nombre, const_mat in datos.items():
+        faltantes = [c for c in CAMPOS_OBLIGATORIOS if c not in const_mat]
+        if faltantes:
+            raise ValueError(f"Material '{nombre}': faltan {', '.join(faltantes)}")
+        alias = list(const_mat.get('alias', []))
+        textos.append((
+            nombre.encode('utf-8'),
+            SEPARADOR_ALIAS.join(alias).encode('utf-8'),
+            # Claves ya normalizadas para no repetir ese trabajo en cada arranque
+            SEPARADOR_ALIAS.join(normalizar(c) for c in [nombre] + alias).encode('utf-8'),
+        ))
+    anchos = [max([len(t[k]) for t in textos] + [1]) for k in range(len(CAMPOS_TEXTO))]
+    
+    arreglo = np.zeros(len(datos), dtype=dtype_cache(*anchos))
+    for i, ((nombre, const_mat), texto) in enumerate(zip(datos.items(), textos)):
+        fila = arreglo[i]
+        for campo, valor in zip(CAMPOS_TEXTO, texto):
+            fila[campo] = valor
+        for campo in CAMPOS_ESCALARES:
+            fila[campo] = const_mat.get(campo, np.nan)
+        
+        shomate = 0
+        for bit, campo in enumerate(CAMPOS_CALOR):
+            coeficientes = np.full(5, np.nan)
+            valor = const_mat.get(campo)
+            if isinstance(valor, dict):
+                coeficientes[:] = 0.0
+                coeficientes[:len(valor['shomate'])] = valor['shomate']
+                shomate |= 1 << bit
+            elif valor is not None:
+                coeficientes[0] = valor
+            fila[campo] = coeficientes
+        fila['shomate'] = shomate
+    return arreglo
+
+
+def _fila_a_constantes(fila):
+    """Reconstruye el dict de constantes de una fila de la caché."""
+    const_mat = {}
+    for bit, campo in enumerate(CAMPOS_CALOR):
+        coeficientes = fila[campo]
+        if int(fila['shomate']) >> bit & 1:
+            const_mat[campo] = {'shomate': [float(x) for x in coeficientes]}
+        elif not np.isnan(coeficientes[0]):
+            const_mat[campo] = float(coeficientes[0])
+    for campo in CAMPOS_ESCALARES:
+        if not np.isnan(fila[campo]):
+            const_mat[campo] = float(fila[campo])
+    return const_mat
+
+
+class BaseMateriales(Mapping):
+    """
+    Catálogo de materiales de solo lectura con búsqueda por nombre o alias.
+    
+    Las filas viven en un arreglo estructurado (normalmente memoria mapeada);
+    el diccionario de constantes de cada material se arma la primera vez
+    que se pide.
+    """
+    
+    def __init__(self, arreglo):
+        self._arreglo = arreglo
+        self._nombres = [n.decode('utf-8') for n in arreglo['nombre']]
+        self._constantes = {}
+        
+        # Índice: nombre o alias normalizado -> fila
+        self._indice = {}
+        self._claves_busqueda = []
+        for i, claves in enumerate(arreglo['claves']):
+            claves = claves.decode('utf-8')
+            for clave in claves.split(SEPARADOR_ALIAS):
+                self._indice.setdefault(clave, i)
+            self._claves_busqueda.append(claves)
+    
+    def _fila(self, nombre):
+        fila = self._indice.get(normalizar(nombre))
+        if fila is None:
+            raise KeyError(nombre)
+        return fila
+    
+    def __getitem__(self, nombre):
+        i = self._fila(nombre)
+        const_mat = self._constantes.get(i)
+        if const_mat is None:
+            const_mat = self._constantes[i] = _fila_a_constantes(self._arreglo[i])
+        return const_mat
+    
+    def __contains__(self, nombre):
+        return isinstance(nombre, str) and normalizar(nombre) in self._indice
+    
+    def __iter__(self):
+        return iter(self._nombres)
+    
+    def __len__(self):
+        return len(self._nombres)
+    
+    def nombre_canonico(self, nombre):
+        """Devuelve el nombre principal de un material a partir de un nombre o alias."""
+        return self._nombres[self._fila(nombre)]
+    
+    def buscar(self, texto, limite=100):
+        """
+        Busca materiales cuyo nombre o alias contenga el texto.
+        
+        Args:
+            texto (str): Texto a buscar (sin distinguir mayúsculas ni acentos)
+            limite (int): Máximo de resultados
+        
+        Returns:
+            list: Nombres principales de los materiales encontrados
+        """
+        texto = normalizar(texto)
+        encontrados = []
+        for nombre, claves in zip(self._nombres, self._claves_busqueda):
+            if texto in claves:
+                encontrados.append(nombre)
+                if len(encontrados) >= limite:
+                    break
+        return encontrados
+
+
+def buscar_materiales(constantes, texto, limite=100):
+    """
+    Filtra materiales por texto en una BaseMateriales o en un dict común.
+    
+    Returns:
+        list: Nombres de material que contienen el texto
+    """
+    if isinstance(constantes, BaseMateriales):
+        return constantes.buscar(texto, limite)
+    texto = normalizar(texto)
+    return [nombre for nombre in constantes if texto in normalizar(nombre)][:limite]
+
+
+def ruta_cache(ruta):
+    """Ruta de la caché binaria asociada a un archivo de materiales."""
+    return ruta + '.cache.npy'
+
+
+def guardar_material(ruta, nombre, const_mat):
+    """
+    Agrega o reemplaza un material en un archivo JSON o CSV de materiales.
+    
+    Si el material ya existía se conservan sus alias. La caché binaria se
+    regenera en la próxima carga porque el archivo queda más reciente.
+    
+    Args:
+        ruta (str): Archivo .json o .csv (se crea si no existe)
+        nombre (str): Nombre del material
+        const_mat (dict): Constantes, con el formato de CONSTANTES_MATERIALES
+    """
+    es_csv = ruta.lower().endswith('.csv')
+    datos = {}
+    if os.path.exists(ruta):
+        datos = _leer_csv(ruta) if es_csv else _leer_json(ruta)
+    
+    const_mat = dict(const_mat)
+    if 'alias' not in const_mat and 'alias' in datos.get(nombre, {}):
+        const_mat['alias'] = datos[nombre]['alias']
+    datos[nombre] = const_mat
+    _a_arreglo({nombre: const_mat})  # Valida antes de escribir
+    
+    if es_csv:
+        with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+            escritor = csv.writer(archivo, lineterminator='\n')
+            escritor.writerow(('nombre', 'alias') + CAMPOS_CALOR + CAMPOS_ESCALARES)
+            for nombre_fila, fila in datos.items():
+                escritor.writerow(
+                    [nombre_fila, SEPARADOR_ALIAS.join(fila.get('alias', []))]
+                    + [fila.get(campo, '') for campo in CAMPOS_CALOR + CAMPOS_ESCALARES]
+                )
+    else:
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo, ensure_ascii=False, indent=2)
+
+
+def cargar_materiales(ruta, usar_cache=True):
+    """
+    Carga una base de materiales desde un archivo JSON o CSV.
+    
+    Si existe una caché binaria más reciente que el archivo, se abre como
+    memoria mapeada; si no, se interpreta el archivo y se regenera la caché.
+    
+    Args:
+        ruta (str): Archivo .json o .csv
+        usar_cache (bool): Leer y escribir la caché binaria
+    
+    Returns:
+        BaseMateriales: Catálogo utilizable como `constantes`
+    """
+    cache = ruta_cache(ruta)
+    if usar_cache and os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(ruta):
+        try:
+            arreglo = np.load(cache, mmap_mode='r')
+            if _es_dtype_cache(arreglo.dtype):
+                return BaseMateriales(arreglo)
+        except (ValueError, OSError):
+            pass
+        # Caché dañada o de otra versión: se regenera
+    
+    if ruta.lower().endswith('.csv'):
+        datos = _leer_csv(ruta)
+    else:
+        datos = _leer_json(ruta)
+    arreglo = _a_arreglo(datos)
+    
+    if usar_cache:
+        try:
+            np.save(cache, arreglo)
+            arreglo = np.load(cache, mmap_mode='r')
+        except OSError:
+            pass  # Sin permiso de escritura: se usa el arreglo en memoria
+    
+    return BaseMateriales(arreglo)
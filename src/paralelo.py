@@ -0,0 +1,140 @@
+"""
+Ejecución en paralelo de lotes grandes de cálculos de calorimetría.
+
+Divide el lote en bloques y los reparte entre procesos de un
+concurrent.futures.ProcessPoolExecutor. Las constantes de materiales se
+envían una sola vez a cada proceso al iniciarlo; las tareas solo llevan
+los arreglos de su bloque.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from calculator import CalculadoraCalor
+from constants import CONSTANTES_MATERIALES
+from perfilado import PERFILADOR
+
+
+# Calculadora propia de cada proceso trabajador
+_calculadora_trabajador = None
+
+
+def _inicializar_trabajador(constantes):
+    global _calculadora_trabajador
+    _calculadora_trabajador = CalculadoraCalor(constantes)
+
+
+def _pid_trabajador(espera):
+    # La espera evita que un mismo proceso tome todas las tareas de calentar()
+    time.sleep(espera)
+    return os.getpid()
+
+
+def _calcular_bloque(bloque):
+    materiales, masas, temps_iniciales, temps_finales = bloque
+    Q_total, _ = _calculadora_trabajador.calcular_calor_lote_agrupado(
+        materiales, masas, temps_iniciales, temps_finales
+    )
+    return Q_total
+
+
+class EjecutorParalelo:
+    """
+    Calcula lotes de casos repartiéndolos entre varios procesos.
+    
+    Se usa como gestor de contexto para reutilizar el grupo de procesos
+    entre varias llamadas:
+    
+        with EjecutorParalelo(trabajadores=4) as ejecutor:
+            Q = ejecutor.calcular_calor(materiales, masas, Ti, Tf)
+    """
+    
+    def __init__(self, constantes=None, trabajadores=None, tam_bloque=100_000):
+        """
+        Args:
+            constantes (dict): Constantes de materiales (por defecto las de constants.py)
+            trabajadores (int): Número de procesos (por defecto, uno por núcleo)
+            tam_bloque (int): Filas por tarea enviada a un proceso
+        """
+        if tam_bloque <= 0:
+            raise ValueError("El tamaño de bloque debe ser mayor que cero")
+        
+        self.constantes = constantes or CONSTANTES_MATERIALES
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.tam_bloque = tam_bloque
+        self._pool = None
+    
+    def __enter__(self):
+        self._iniciar()
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+    
+    def _iniciar(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.trabajadores,
+                initializer=_inicializar_trabajador,
+                initargs=(self.constantes,)
+            )
+        return self._pool
+    
+    def calentar(self, espera=0.05):
+        """
+        Arranca todos los procesos trabajadores y espera a que estén listos.
+        
+        El grupo crea los procesos a medida que recibe tareas; sin esto, el
+        primer lote grande paga el arranque (y la inicialización) de cada
+        proceso que todavía no existía.
+        """
+        pool = self._iniciar()
+        listos = set()
+        while len(listos) < self.trabajadores:
+            listos.update(pool.map(_pid_trabajador, [espera] * self.trabajadores))
+    
+    def cerrar(self):
+        """Detiene los procesos trabajadores."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def _bloques(self, materiales, masas, temps_iniciales, temps_finales):
+        for inicio in range(0, len(materiales), self.tam_bloque):
+            fin = inicio + self.tam_bloque
+            yield (materiales[inicio:fin], masas[inicio:fin],
+                   temps_iniciales[inicio:fin], temps_finales[inicio:fin])
+    
+    def calcular_calor(self, materiales, masas, temps_iniciales, temps_finales):
+        """
+        Calcula el calor total de cada fila de un lote en paralelo.
+        
+        Args:
+            materiales (array_like): Nombre del material de cada fila
+            masas (array_like): Masas en kg
+            temps_iniciales (array_like): Temperaturas iniciales en °C
+            temps_finales (array_like): Temperaturas finales en °C
+        
+        Returns:
+            ndarray: Calor total de cada fila en J, en el orden de entrada
+        """
+        # Con todo escalar queda un lote de una fila
+        materiales, masas, Ti, Tf = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(materiales)),
+            np.atleast_1d(np.asarray(masas, dtype=float)),
+            np.atleast_1d(np.asarray(temps_iniciales, dtype=float)),
+            np.atleast_1d(np.asarray(temps_finales, dtype=float))
+        )
+        if len(materiales) == 0:
+            return np.empty(0)
+        
+        with PERFILADOR.tramo('iniciar_procesos', 'lote'):
+            pool = self._iniciar()
+        # map conserva el orden de los bloques aunque terminen desordenados
+        with PERFILADOR.tramo('calcular_bloques', 'lote', filas=len(materiales)):
+            resultados = list(pool.map(_calcular_bloque, self._bloques(materiales, masas, Ti, Tf)))
+        with PERFILADOR.tramo('unir_bloques', 'lote'):
+            return np.concatenate(resultados)
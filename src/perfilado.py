@@ -0,0 +1,159 @@
+"""
+Medición ligera de tiempos por etapa (tramos) y exportación de trazas.
+
+Cada etapa se envuelve en un tramo:
+
+    with PERFILADOR.tramo('formatear_resultados'):
+        texto = CalculadoraCalor.formatear_resultados(Q_total, resultados)
+
+Mientras el perfilador está desactivado, tramo() devuelve siempre el mismo
+gestor de contexto vacío y no mide nada. Activado, guarda los últimos
+tramos en un búfer circular (la memoria no crece) que puede exportarse en
+el formato de eventos de traza de Chrome (chrome://tracing o Perfetto).
+
+Se activa con la variable de entorno CALORIMETRIA_PERFIL=1, con la opción
+--perfil de main.py o llamando a PERFILADOR.activar().
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+
+Tramo = namedtuple('Tramo', 'nombre categoria inicio_ns duracion_ns hilo args')
+
+
+class _TramoNulo:
+    """Gestor de contexto que no hace nada (perfilador desactivado)."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULO = _TramoNulo()
+
+
+class _TramoActivo:
+    __slots__ = ('perfilador', 'nombre', 'categoria', 'args', 'inicio')
+    
+    def __init__(self, perfilador, nombre, categoria, args):
+        self.perfilador = perfilador
+        self.nombre = nombre
+        self.categoria = categoria
+        self.args = args
+    
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc):
+        fin = time.perf_counter_ns()
+        self.perfilador._tramos.append(Tramo(
+            self.nombre, self.categoria, self.inicio, fin - self.inicio,
+            threading.get_ident(), self.args
+        ))
+        return False
+
+
+class Perfilador:
+    """Registro de tramos con tiempo de inicio y duración."""
+    
+    def __init__(self, capacidad=10_000, activo=False):
+        """
+        Args:
+            capacidad (int): Máximo de tramos guardados (se descartan los más viejos)
+            activo (bool): Empezar midiendo
+        """
+        self.activo = activo
+        self._tramos = deque(maxlen=capacidad)
+    
+    def activar(self):
+        self.activo = True
+    
+    def desactivar(self):
+        self.activo = False
+    
+    def limpiar(self):
+        self._tramos.clear()
+    
+    def tramo(self, nombre, categoria='calculo', **args):
+        """
+        Mide el bloque with como un tramo.
+        
+        Args:
+            nombre (str): Nombre de la etapa
+            categoria (str): Grupo de la etapa ('gui', 'calculo', 'lote'...)
+            **args: Datos extra que se guardan con el tramo
+        """
+        if not self.activo:
+            return _NULO
+        return _TramoActivo(self, nombre, categoria, args)
+    
+    def registrar(self, nombre, inicio_ns, fin_ns, categoria='calculo', **args):
+        """Guarda un tramo medido a mano (por ejemplo, entre dos hilos)."""
+        if self.activo:
+            self._tramos.append(Tramo(nombre, categoria, inicio_ns, fin_ns - inicio_ns,
+                                      threading.get_ident(), args))
+    
+    def tramos(self):
+        """Copia de los tramos guardados, del más viejo al más nuevo."""
+        return list(self._tramos)
+    
+    def ultimos(self, nombres):
+        """
+        Duración del último tramo de cada nombre pedido.
+        
+        Returns:
+            dict: {nombre: segundos} solo con los nombres encontrados
+        """
+        pendientes = set(nombres)
+        encontrados = {}
+        for tramo in reversed(self._tramos):
+            if tramo.nombre in pendientes:
+                encontrados[tramo.nombre] = tramo.duracion_ns / 1e9
+                pendientes.discard(tramo.nombre)
+                if not pendientes:
+                    break
+        return encontrados
+    
+    def eventos_chrome(self):
+        """Tramos como eventos completos ('ph': 'X') del formato de traza de Chrome."""
+        pid = os.getpid()
+        return [
+            {
+                'name': tramo.nombre,
+                'cat': tramo.categoria,
+                'ph': 'X',
+                'ts': tramo.inicio_ns / 1000,
+                'dur': tramo.duracion_ns / 1000,
+                'pid': pid,
+                'tid': tramo.hilo,
+                'args': tramo.args,
+            }
+            for tramo in self._tramos
+        ]
+    
+    def exportar_chrome(self, destino):
+        """
+        Escribe la traza en formato JSON de Chrome.
+        
+        Args:
+            destino (str | file): Ruta o archivo de texto abierto
+        """
+        traza = {'traceEvents': self.eventos_chrome(), 'displayTimeUnit': 'ms'}
+        if hasattr(destino, 'write'):
+            json.dump(traza, destino, default=str)
+        else:
+            with open(destino, 'w', encoding='utf-8') as archivo:
+                json.dump(traza, archivo, default=str)
+
+
+# Perfilador compartido por la aplicación, la calculadora y el modo por lotes
+PERFILADOR = Perfilador(activo=os.environ.get('CALORIMETRIA_PERFIL', '') not in ('', '0'))
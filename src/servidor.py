@@ -0,0 +1,445 @@
+"""
+Servidor HTTP/JSON local (asyncio, sin dependencias externas).
+
+Expone la calculadora a otras herramientas de la misma máquina:
+
+    POST /calor      {"material", "masa", "temp_inicial", "temp_final"}
+                     -> {"Q_total", "calores_por_fase"}
+    POST /despejar   {"variable": "masa" | "calor_especifico" |
+                      "temperatura_final" | "temperatura_inicial", ...datos}
+                     -> {"variable", "valor"}
+    POST /lote       {"materiales" (o "material"), "masas",
+                      "temps_iniciales", "temps_finales"} -> {"Q_total": [...]}
+                     (null en las filas con datos no finitos)
+    GET  /metricas   Latencias por ruta, tamaño de los lotes agrupados y cola
+
+Las solicitudes a /calor que llegan dentro de una ventana corta (2 ms por
+defecto) se agrupan en un solo cálculo vectorizado con calcular_calor_lote.
+Los cálculos corren en un único hilo aparte para no bloquear el bucle de
+eventos. Si hay demasiadas solicitudes en curso, las nuevas se rechazan con
+503 y Retry-After en lugar de encolarse sin límite.
+
+Uso:
+    python main.py servidor [--puerto 8765] [--materiales RUTA]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+import despejes
+from calculator import CalculadoraCalor
+from materiales import cargar_materiales
+
+
+PUERTO_POR_DEFECTO = 8765
+
+# Límites por defecto
+VENTANA_AGRUPADO = 0.002      # s que se espera a juntar solicitudes de /calor
+MAX_LOTE_AGRUPADO = 4096      # solicitudes por lote agrupado
+MAX_EN_CURSO = 1000           # solicitudes simultáneas antes de responder 503
+MAX_CUERPO = 16 * 1024 * 1024  # bytes por cuerpo de solicitud
+
+DESPEJES = {
+    # variable: (función, datos que necesita)
+    'masa': (despejes.despejar_masa, ('Q', 'c', 'deltaT')),
+    'calor_especifico': (despejes.despejar_calor_especifico, ('Q', 'm', 'deltaT')),
+    'temperatura_final': (despejes.despejar_temperatura_final, ('Q', 'm', 'c', 'Ti')),
+    'temperatura_inicial': (despejes.despejar_temperatura_inicial, ('Q', 'm', 'c', 'Tf')),
+}
+
+
+class ErrorSolicitud(Exception):
+    """Error atribuible a la solicitud; se responde con su código HTTP."""
+    
+    def __init__(self, mensaje, estado=HTTPStatus.BAD_REQUEST):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class Metricas:
+    """Cantidad, errores y latencias recientes de cada ruta."""
+    
+    def __init__(self, muestras=2048):
+        self.muestras = muestras
+        self._rutas = {}
+    
+    def registrar(self, ruta, segundos, estado):
+        datos = self._rutas.setdefault(ruta, {
+            'solicitudes': 0, 'errores': 0, 'latencias': deque(maxlen=self.muestras)
+        })
+        datos['solicitudes'] += 1
+        if estado >= 400:
+            datos['errores'] += 1
+        datos['latencias'].append(segundos)
+    
+    def resumen(self):
+        """Percentiles de latencia en ms sobre las últimas muestras de cada ruta."""
+        salida = {}
+        for ruta, datos in self._rutas.items():
+            latencias = np.asarray(datos['latencias']) * 1000
+            p50, p95, p99 = np.percentile(latencias, [50, 95, 99])
+            salida[ruta] = {
+                'solicitudes': datos['solicitudes'],
+                'errores': datos['errores'],
+                'latencia_ms': {'p50': p50, 'p95': p95, 'p99': p99, 'max': latencias.max()},
+            }
+        return salida
+
+
+class AgrupadorCalor:
+    """
+    Junta solicitudes individuales de calor total en lotes vectorizados.
+    
+    La primera solicitud de un lote programa su envío tras `ventana`
+    segundos; el lote sale antes si llega a `max_lote` solicitudes.
+    """
+    
+    def __init__(self, calculadora, ejecutor, ventana=VENTANA_AGRUPADO, max_lote=MAX_LOTE_AGRUPADO):
+        self.calculadora = calculadora
+        self.ejecutor = ejecutor
+        self.ventana = ventana
+        self.max_lote = max_lote
+        self._pendientes = []
+        self._temporizador = None
+        self.lotes = 0
+        self.solicitudes = 0
+    
+    def calcular(self, material, masa, temp_inicial, temp_final):
+        """
+        Encola un caso y devuelve un futuro con (Q_total, calores_por_fase).
+        """
+        bucle = asyncio.get_running_loop()
+        futuro = bucle.create_future()
+        self._pendientes.append((material, masa, temp_inicial, temp_final, futuro))
+        if len(self._pendientes) >= self.max_lote:
+            self._enviar()
+        elif self._temporizador is None:
+            self._temporizador = bucle.call_later(self.ventana, self._enviar)
+        return futuro
+    
+    def _enviar(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        lote, self._pendientes = self._pendientes, []
+        if not lote:
+            return
+        self.lotes += 1
+        self.solicitudes += len(lote)
+        
+        casos = [caso[:4] for caso in lote]
+        tarea = asyncio.get_running_loop().run_in_executor(self.ejecutor, self._calcular_lote, casos)
+        tarea.add_done_callback(lambda t: self._repartir(t, lote))
+    
+    def _calcular_lote(self, casos):
+        """Calcula un lote agrupado por material (en el hilo trabajador)."""
+        materiales, masas, Ti, Tf = (np.asarray(columna) for columna in zip(*casos))
+        masas, Ti, Tf = (c.astype(float) for c in (masas, Ti, Tf))
+        resultados = [None] * len(casos)
+        nombres, grupos = np.unique(materiales, return_inverse=True)
+        for i, material in enumerate(nombres):
+            filas = np.flatnonzero(grupos == i)
+            Q_total, por_fase = self.calculadora.calcular_calor_lote(
+                str(material), masas[filas], Ti[filas], Tf[filas]
+            )
+            for j, fila in enumerate(filas):
+                resultados[fila] = (float(Q_total[j]),
+                                    {fase: float(q[j]) for fase, q in por_fase.items() if q[j] != 0})
+        return resultados
+    
+    @staticmethod
+    def _repartir(tarea, lote):
+        error = tarea.exception()
+        resultados = tarea.result() if error is None else [None] * len(lote)
+        for (*_, futuro), resultado in zip(lote, resultados):
+            if futuro.done():
+                continue  # El cliente se desconectó
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(resultado)
+
+
+def _numero(datos, clave):
+    try:
+        valor = float(datos[clave])
+    except KeyError:
+        raise ErrorSolicitud(f"falta el campo '{clave}'")
+    except (TypeError, ValueError):
+        raise ErrorSolicitud(f"el campo '{clave}' debe ser numérico")
+    if not np.isfinite(valor):
+        raise ErrorSolicitud(f"el campo '{clave}' debe ser finito")
+    return valor
+
+
+def _texto(datos, clave):
+    valor = datos.get(clave)
+    if valor is None:
+        raise ErrorSolicitud(f"falta el campo '{clave}'")
+    if not isinstance(valor, str):
+        raise ErrorSolicitud(f"el campo '{clave}' debe ser un texto")
+    return valor
+
+
+class ServidorCalorimetria:
+    """Servidor HTTP/1.1 mínimo con las rutas de la calculadora."""
+    
+    def __init__(self, constantes=None, ventana=VENTANA_AGRUPADO, max_lote=MAX_LOTE_AGRUPADO,
+                 max_en_curso=MAX_EN_CURSO, max_cuerpo=MAX_CUERPO):
+        """
+        Args:
+            constantes (dict): Materiales a usar (por defecto, los incluidos)
+            ventana (float): Segundos que se esperan para agrupar solicitudes de /calor
+            max_lote (int): Máximo de solicitudes por lote agrupado
+            max_en_curso (int): Solicitudes simultáneas antes de rechazar con 503
+            max_cuerpo (int): Tamaño máximo del cuerpo en bytes
+        """
+        self.calculadora = CalculadoraCalor(constantes)
+        # La calculadora solo se usa desde este hilo
+        self.ejecutor = ThreadPoolExecutor(max_workers=1)
+        self.agrupador = AgrupadorCalor(self.calculadora, self.ejecutor, ventana, max_lote)
+        self.metricas = Metricas()
+        self.max_en_curso = max_en_curso
+        self.max_cuerpo = max_cuerpo
+        self.en_curso = 0
+        self.rechazadas = 0
+        self.rutas = {
+            ('POST', '/calor'): self.calor,
+            ('POST', '/despejar'): self.despejar,
+            ('POST', '/lote'): self.lote,
+            ('GET', '/metricas'): self.informe_metricas,
+        }
+    
+    # --- Rutas ---
+    
+    async def calor(self, datos):
+        material = _texto(datos, 'material')
+        if material not in self.calculadora.constantes:
+            raise ErrorSolicitud(f"material desconocido: {material}")
+        masa = _numero(datos, 'masa')
+        if masa <= 0:
+            raise ErrorSolicitud("la masa debe ser mayor que cero")
+        Q_total, por_fase = await self.agrupador.calcular(
+            material, masa, _numero(datos, 'temp_inicial'), _numero(datos, 'temp_final')
+        )
+        return {'Q_total': Q_total, 'calores_por_fase': por_fase}
+    
+    async def despejar(self, datos):
+        variable = _texto(datos, 'variable')
+        if variable not in DESPEJES:
+            raise ErrorSolicitud(f"variable desconocida: {variable} "
+                                 f"(disponibles: {', '.join(DESPEJES)})")
+        funcion, campos = DESPEJES[variable]
+        try:
+            valor = funcion(*(_numero(datos, campo) for campo in campos))
+        except (ValueError, ZeroDivisionError) as e:
+            raise ErrorSolicitud(str(e))
+        if not np.isfinite(valor):
+            raise ErrorSolicitud("el resultado no es finito")
+        return {'variable': variable, 'valor': valor}
+    
+    async def lote(self, datos):
+        try:
+            masas = np.asarray(datos['masas'], dtype=float)
+            Ti = np.asarray(datos['temps_iniciales'], dtype=float)
+            Tf = np.asarray(datos['temps_finales'], dtype=float)
+            materiales = np.asarray(datos['materiales'] if 'materiales' in datos else datos['material'])
+            materiales, masas, Ti, Tf = np.broadcast_arrays(materiales, masas, Ti, Tf)
+        except KeyError as e:
+            raise ErrorSolicitud(f"falta el campo '{e.args[0]}'")
+        except (TypeError, ValueError) as e:
+            raise ErrorSolicitud(f"datos inválidos: {e}")
+        if masas.ndim != 1:
+            raise ErrorSolicitud("los datos deben ser listas de una dimensión")
+        # Mismo criterio que /calor: se aceptan nombres y alias del catálogo
+        nombres, inversa = np.unique(materiales, return_inverse=True)
+        nombres = [str(nombre) for nombre in nombres]
+        desconocidos = [nombre for nombre in nombres if nombre not in self.calculadora.constantes]
+        if desconocidos:
+            raise ErrorSolicitud(f"materiales desconocidos: {', '.join(desconocidos)}")
+        canonico = getattr(self.calculadora.constantes, 'nombre_canonico', None)
+        if canonico is not None:
+            materiales = np.array([canonico(nombre) for nombre in nombres])[inversa]
+        
+        Q_total, _ = await asyncio.get_running_loop().run_in_executor(
+            self.ejecutor, self.calculadora.calcular_calor_lote_agrupado, materiales, masas, Ti, Tf
+        )
+        # JSON no admite NaN ni infinitos: las filas con datos no finitos van como null
+        return {'Q_total': [q if np.isfinite(q) else None for q in Q_total.tolist()]}
+    
+    async def informe_metricas(self, datos):
+        agrupador = self.agrupador
+        return {
+            'rutas': self.metricas.resumen(),
+            'agrupado': {
+                'lotes': agrupador.lotes,
+                'solicitudes': agrupador.solicitudes,
+                'tamano_medio': agrupador.solicitudes / agrupador.lotes if agrupador.lotes else 0.0,
+            },
+            'en_curso': self.en_curso,
+            'rechazadas': self.rechazadas,
+        }
+    
+    # --- HTTP ---
+    
+    async def _leer_solicitud(self, lector):
+        """
+        Lee una solicitud HTTP/1.1.
+        
+        Returns:
+            tuple: (metodo, ruta, encabezados, cuerpo) o None si se cerró la conexión
+        """
+        try:
+            cabecera = await lector.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise ErrorSolicitud("encabezados demasiado grandes",
+                                 HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+        
+        lineas = cabecera.decode('latin-1').split('\r\n')
+        try:
+            metodo, ruta, _ = lineas[0].split(' ', 2)
+        except ValueError:
+            raise ErrorSolicitud("línea de solicitud inválida")
+        encabezados = {}
+        for linea in lineas[1:]:
+            if ':' in linea:
+                nombre, valor = linea.split(':', 1)
+                encabezados[nombre.strip().lower()] = valor.strip()
+        
+        try:
+            largo = int(encabezados.get('content-length', 0))
+        except ValueError:
+            raise ErrorSolicitud("Content-Length inválido")
+        if largo > self.max_cuerpo:
+            raise ErrorSolicitud("cuerpo demasiado grande", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        cuerpo = await lector.readexactly(largo) if largo else b''
+        return metodo, ruta.split('?', 1)[0], encabezados, cuerpo
+    
+    @staticmethod
+    def _respuesta(estado, contenido, mantener=True, extra=()):
+        cuerpo = json.dumps(contenido, ensure_ascii=False).encode('utf-8')
+        encabezados = [
+            f"HTTP/1.1 {estado.value} {estado.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(cuerpo)}",
+            f"Connection: {'keep-alive' if mantener else 'close'}",
+            *extra,
+        ]
+        return ("\r\n".join(encabezados) + "\r\n\r\n").encode('latin-1') + cuerpo
+    
+    async def _atender(self, metodo, ruta, cuerpo):
+        """Ejecuta una ruta y devuelve (estado, contenido, encabezados extra)."""
+        manejador = self.rutas.get((metodo, ruta))
+        if manejador is None:
+            if any(r == ruta for _, r in self.rutas):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"método no permitido: {metodo}"}, ()
+            return HTTPStatus.NOT_FOUND, {'error': f"ruta desconocida: {ruta}"}, ()
+        
+        if self.en_curso >= self.max_en_curso:
+            # Contrapresión: el cliente debe reintentar en lugar de encolar sin límite
+            self.rechazadas += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': "servidor ocupado"}, ("Retry-After: 1",)
+        
+        self.en_curso += 1
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+            if not isinstance(datos, dict):
+                raise ErrorSolicitud("el cuerpo debe ser un objeto JSON")
+            return HTTPStatus.OK, await manejador(datos), ()
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f"JSON inválido: {e}"}, ()
+        except ErrorSolicitud as e:
+            return e.estado, {'error': str(e)}, ()
+        finally:
+            self.en_curso -= 1
+    
+    async def conexion(self, lector, escritor):
+        """Atiende una conexión, con varias solicitudes si el cliente la mantiene abierta."""
+        try:
+            while True:
+                try:
+                    solicitud = await self._leer_solicitud(lector)
+                except ErrorSolicitud as e:
+                    escritor.write(self._respuesta(e.estado, {'error': str(e)}, mantener=False))
+                    await escritor.drain()
+                    break
+                if solicitud is None:
+                    break
+                metodo, ruta, encabezados, cuerpo = solicitud
+                
+                inicio = time.perf_counter()
+                try:
+                    estado, contenido, extra = await self._atender(metodo, ruta, cuerpo)
+                except Exception as e:  # Error interno: se informa sin tumbar el servidor
+                    estado, contenido, extra = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}, ()
+                # Las rutas desconocidas se cuentan juntas para no acumular claves sin límite
+                clave = f"{metodo} {ruta}" if (metodo, ruta) in self.rutas else 'otras'
+                self.metricas.registrar(clave, time.perf_counter() - inicio, estado)
+                
+                mantener = encabezados.get('connection', '').lower() != 'close'
+                escritor.write(self._respuesta(estado, contenido, mantener, extra))
+                # Contrapresión hacia el cliente: no se lee más mientras no consuma lo escrito
+                await escritor.drain()
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+    
+    async def iniciar(self, host='127.0.0.1', puerto=PUERTO_POR_DEFECTO):
+        """Abre el socket y devuelve el asyncio.Server."""
+        return await asyncio.start_server(self.conexion, host, puerto)
+    
+    def cerrar(self):
+        self.ejecutor.shutdown(wait=False, cancel_futures=True)
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py servidor',
+        description="Servidor HTTP/JSON local con la calculadora de calorimetría."
+    )
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Dirección a escuchar (por defecto solo la máquina local)")
+    parser.add_argument('--puerto', type=int, default=PUERTO_POR_DEFECTO)
+    parser.add_argument('--materiales',
+                        help="Archivo JSON o CSV con la base de materiales a usar")
+    parser.add_argument('--ventana-ms', type=float, default=VENTANA_AGRUPADO * 1000,
+                        help="Milisegundos que se esperan para agrupar solicitudes de /calor")
+    parser.add_argument('--max-lote', type=int, default=MAX_LOTE_AGRUPADO,
+                        help="Máximo de solicitudes por lote agrupado")
+    parser.add_argument('--max-en-curso', type=int, default=MAX_EN_CURSO,
+                        help="Solicitudes simultáneas antes de responder 503")
+    return parser
+
+
+def main_servidor(argv=None):
+    """Punto de entrada del modo servidor."""
+    args = crear_parser().parse_args(argv)
+    constantes = cargar_materiales(args.materiales) if args.materiales else None
+    servidor = ServidorCalorimetria(constantes, args.ventana_ms / 1000, args.max_lote,
+                                    args.max_en_curso)
+    
+    async def correr():
+        socket_servidor = await servidor.iniciar(args.host, args.puerto)
+        print(f"Escuchando en http://{args.host}:{args.puerto}", flush=True)
+        async with socket_servidor:
+            await socket_servidor.serve_forever()
+    
+    try:
+        asyncio.run(correr())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.cerrar()
+    return 0
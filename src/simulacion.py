@@ -0,0 +1,246 @@
+"""
+Simulación temporal del calentamiento o enfriamiento de un cuerpo.
+
+Un cuerpo de masa m recibe una potencia P(t) y pierde calor hacia el
+ambiente según la ley de enfriamiento de Newton:
+
+    m · dH/dt = P(t) - k · (T - T_ambiente)
+
+donde H es la entalpía específica del material y k = h·A (W/°C).
+
+La simulación avanza por eventos: dentro de un tramo sensible con c
+constante la ecuación es lineal y se integra en forma cerrada (exponencial
+hacia T_ambiente + P/k), y en una meseta de cambio de fase la potencia neta
+es constante, así que H crece linealmente. Solo se calcula el instante del
+siguiente evento (fin de una fase, cambio de potencia, temperatura objetivo)
+y se salta hasta él, sin pasos de tiempo fijos. Con c(T) de Shomate el tramo
+se divide en celdas de pocos grados con c medio exacto en sus extremos.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+
+class EstadoSimulacion(namedtuple('EstadoSimulacion', 't T fase fraccion calor evento')):
+    """
+    Estado del cuerpo en un instante de la simulación.
+    
+    Atributos: t (s), T (°C), fase, fraccion (parte transformada en una
+    meseta o None), calor (J acumulados desde el inicio) y evento: 'inicio',
+    'fase', 'potencia', 'muestra', 'objetivo' o 'fin'.
+    """
+    
+    __slots__ = ()
+
+
+def _escalones_potencia(potencia):
+    """Normaliza la potencia a una lista ordenada de (t_inicio, P)."""
+    if isinstance(potencia, (int, float)):
+        return [(0.0, float(potencia))]
+    escalones = sorted((float(t), float(P)) for t, P in potencia)
+    if not escalones or escalones[0][0] > 0:
+        escalones.insert(0, (0.0, 0.0))  # Sin potencia hasta el primer escalón
+    return escalones
+
+
+class _Pieza:
+    """
+    Tramo de la curva H(T) donde T es lineal en H.
+    
+    T(h) = T_ancla + (h - h_ancla) / c; en una meseta c es infinito y T es
+    constante. h_bajo y h_alto limitan el tramo.
+    """
+    
+    __slots__ = ('region', 'h_bajo', 'h_alto', 'c', 'T_ancla', 'h_ancla')
+    
+    def __init__(self, region, h_bajo, h_alto, c, T_ancla, h_ancla):
+        self.region = region
+        self.h_bajo = h_bajo
+        self.h_alto = h_alto
+        self.c = c
+        self.T_ancla = T_ancla
+        self.h_ancla = h_ancla
+    
+    def temperatura(self, h):
+        if math.isinf(self.c):
+            return self.T_ancla
+        return self.T_ancla + (h - self.h_ancla) / self.c
+    
+    def entalpia(self, T):
+        return self.h_ancla + (T - self.T_ancla) * self.c
+
+
+def _pieza(tabla, h, T, subiendo, paso_temperatura):
+    """Tramo que contiene h, eligiendo el siguiente en la dirección del movimiento."""
+    quiebres = tabla.H_quiebres
+    p = bisect_right(quiebres, h) if subiendo else bisect_left(quiebres, h)
+    h_bajo = quiebres[p - 1] if p > 0 else -math.inf
+    h_alto = quiebres[p] if p < len(quiebres) else math.inf
+    k = p // 2
+    
+    if p % 2:
+        T_cambio = tabla.transiciones[k]
+        return _Pieza(p, h_bajo, h_alto, math.inf, T_cambio, h_bajo)
+    
+    tramo = tabla.tramos[k]
+    if tramo.constante:
+        return _Pieza(p, h_bajo, h_alto, tramo.c, tabla.T_ref[k], tabla.H_base[k])
+    
+    # c(T) variable: celda [T_a, T_b] alineada a paso_temperatura, con el c
+    # medio que conserva el calor exacto entre sus extremos
+    T_a = math.floor(T / paso_temperatura) * paso_temperatura
+    if T_a > T or (not subiendo and T == T_a):
+        T_a -= paso_temperatura
+    elif subiendo and T_a + paso_temperatura <= T:
+        T_a += paso_temperatura  # Redondeo de floor justo en el borde de la celda
+    T_b = T_a + paso_temperatura
+    if k > 0:
+        T_a = max(T_a, tabla.transiciones[k - 1])
+    if k < len(tabla.transiciones):
+        T_b = min(T_b, tabla.transiciones[k])
+    h_a = tabla.H_base[k] + tramo.calor(tabla.T_ref[k], T_a)
+    h_b = tabla.H_base[k] + tramo.calor(tabla.T_ref[k], T_b)
+    return _Pieza(p, max(h_bajo, h_a), min(h_alto, h_b), (h_b - h_a) / (T_b - T_a), T_a, h_a)
+
+
+def _evolucionar(pieza, masa, T0, h0, P, k, T_amb, dt):
+    """Estado (h, T) tras dt segundos dentro de una pieza, en forma cerrada."""
+    if math.isinf(pieza.c):
+        h = h0 + (P - k * (T0 - T_amb)) * dt / masa
+        return h, T0
+    
+    capacidad = masa * pieza.c
+    if k > 0:
+        T_inf = T_amb + P / k
+        T = T_inf + (T0 - T_inf) * math.exp(-dt * k / capacidad)
+    else:
+        T = T0 + P * dt / capacidad
+    return pieza.entalpia(T), T
+
+
+def _tiempo_salida(pieza, masa, T0, h0, P, k, T_amb, T_limite):
+    """
+    Tiempo hasta alcanzar el borde de la pieza (o T_limite) y ese borde.
+    
+    Returns:
+        tuple: (dt, h_borde, T_borde); dt es infinito si nunca se alcanza
+    """
+    neto = P - k * (T0 - T_amb)
+    if neto == 0:
+        return math.inf, h0, T0
+    
+    if math.isinf(pieza.c):
+        h_borde = pieza.h_alto if neto > 0 else pieza.h_bajo
+        if math.isinf(h_borde):
+            return math.inf, h0, T0
+        return (h_borde - h0) * masa / neto, h_borde, T0
+    
+    h_borde = pieza.h_alto if neto > 0 else pieza.h_bajo
+    T_borde = pieza.temperatura(h_borde) if not math.isinf(h_borde) else h_borde
+    if T_limite is not None and (T0 < T_limite < T_borde or T_borde < T_limite < T0):
+        T_borde = T_limite
+        h_borde = pieza.entalpia(T_limite)
+    if math.isinf(T_borde):
+        return math.inf, h0, T0
+    
+    capacidad = masa * pieza.c
+    if k > 0:
+        T_inf = T_amb + P / k
+        # La exponencial solo cruza T_borde si este queda antes de T_inf
+        if (T_borde - T_inf) * (T0 - T_inf) <= 0:
+            return math.inf, h0, T0
+        return capacidad / k * math.log((T0 - T_inf) / (T_borde - T_inf)), h_borde, T_borde
+    return (T_borde - T0) * capacidad / P, h_borde, T_borde
+
+
+def simular(tabla, masa, temp_inicial, potencia, t_max, coef_perdidas=0.0, T_ambiente=20.0,
+            paso_salida=None, temp_objetivo=None, paso_temperatura=1.0):
+    """
+    Simula T(t) de un cuerpo calentado o enfriado, como generador de estados.
+    
+    Se produce un estado al inicio, en cada cambio de fase y de potencia, cada
+    paso_salida segundos si se pide, y al terminar. La memoria usada no
+    depende de la duración simulada.
+    
+    Args:
+        tabla (TablaEntalpia): Tabla de entalpía del material
+        masa (float): Masa en kg
+        temp_inicial (float): Temperatura inicial en °C
+        potencia (float | list): Potencia en W, constante o como escalones
+                                 [(t_inicio, P), ...] (P = 0 antes del primero)
+        t_max (float): Tiempo máximo a simular en s
+        coef_perdidas (float): k = h·A en W/°C (0 = sin pérdidas)
+        T_ambiente (float): Temperatura ambiente en °C
+        paso_salida (float): Intervalo de muestreo en s (None = solo eventos)
+        temp_objetivo (float): Termina al alcanzar esta temperatura
+        paso_temperatura (float): Ancho en °C de las celdas con c(T) variable
+    
+    Yields:
+        EstadoSimulacion: Estados en orden de tiempo
+    """
+    if masa <= 0:
+        raise ValueError("La masa debe ser mayor que cero")
+    if paso_salida is not None and paso_salida <= 0:
+        raise ValueError("El paso de salida debe ser mayor que cero")
+    
+    escalones = _escalones_potencia(potencia)
+    k = float(coef_perdidas)
+    h_inicial = tabla.entalpia(temp_inicial)
+    
+    def estado(t, h, T, evento, p=None):
+        if p is None:
+            p = bisect_left(tabla.H_quiebres, h)
+        fraccion = None
+        if p % 2:
+            fraccion = (h - tabla.H_antes[p // 2]) / tabla.latentes[p // 2]
+        return EstadoSimulacion(t, T, tabla.fases[p], fraccion, masa * (h - h_inicial), evento)
+    
+    t, h, T = 0.0, h_inicial, float(temp_inicial)
+    i_escalon = bisect_right([e[0] for e in escalones], 0.0) - 1
+    proxima_muestra = paso_salida if paso_salida is not None else math.inf
+    yield estado(t, h, T, 'inicio')
+    if temp_objetivo is not None and T == temp_objetivo:
+        return
+    
+    while t < t_max:
+        P = escalones[i_escalon][1]
+        t_cambio = escalones[i_escalon + 1][0] if i_escalon + 1 < len(escalones) else math.inf
+        subiendo = P - k * (T - T_ambiente) > 0
+        pieza = _pieza(tabla, h, T, subiendo, paso_temperatura)
+        dt, h_borde, T_borde = _tiempo_salida(pieza, masa, T, h, P, k, T_ambiente, temp_objetivo)
+        t_evento = min(t + dt, t_cambio, t_max)
+        
+        # Muestras intermedias evaluadas en forma cerrada, sin integrar
+        while proxima_muestra < t_evento:
+            h_m, T_m = _evolucionar(pieza, masa, T, h, P, k, T_ambiente, proxima_muestra - t)
+            yield estado(proxima_muestra, h_m, T_m, 'muestra')
+            proxima_muestra += paso_salida
+        
+        emitido = False
+        if t + dt <= min(t_cambio, t_max):
+            # Se alcanza el borde: se fija exactamente para no acumular error
+            h, T = h_borde, T_borde
+            t = t + dt
+            if temp_objetivo is not None and T == temp_objetivo:
+                yield estado(t, h, T, 'objetivo')
+                return
+            nueva = _pieza(tabla, h, T, subiendo, paso_temperatura)
+            if nueva.region != pieza.region:
+                # Se informa la fase en la que se entra
+                yield estado(t, h, T, 'fase', nueva.region)
+                emitido = True
+        else:
+            h, T = _evolucionar(pieza, masa, T, h, P, k, T_ambiente, t_evento - t)
+            t = t_evento
+            if t == t_cambio and t < t_max:
+                i_escalon += 1
+                yield estado(t, h, T, 'potencia')
+                emitido = True
+        
+        if proxima_muestra == t:
+            if not emitido and t < t_max:
+                yield estado(t, h, T, 'muestra')
+            proxima_muestra += paso_salida
+    
+    yield estado(t, h, T, 'fin')
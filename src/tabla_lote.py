@@ -0,0 +1,399 @@
+"""
+Tabla de resultados por lotes que solo crea las filas visibles.
+
+Los resultados viven en arreglos de NumPy (DatosLote). Ordenar y filtrar
+producen un arreglo de índices (la vista), y la tabla (TablaVirtual) es
+un ttk.Treeview con tantos ítems como filas entran en pantalla: al
+desplazarse solo se reescriben los valores de esos ítems. Así un lote de
+un millón de filas ocupa unas decenas de MB y se desplaza sin demoras.
+"""
+
+import csv
+import tkinter as tk
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from tkinter import ttk, messagebox, filedialog
+
+import numpy as np
+
+from cli import ALIAS_CAMPOS, leer_filas
+
+
+COLUMNAS_LOTE = (
+    # (columna, encabezado, ancho en píxeles, formato)
+    ('material', "Material", 180, '{}'),
+    ('masa', "Masa (kg)", 90, '{:.4g}'),
+    ('temp_inicial', "Ti (°C)", 90, '{:.2f}'),
+    ('temp_final', "Tf (°C)", 90, '{:.2f}'),
+    ('Q_total', "Q total (J)", 140, '{:,.2f}'),
+)
+
+INTERVALO_REVISION_MS = 50
+
+
+class DatosLote:
+    """
+    Resultados de un lote en arreglos columnares, con orden y filtro.
+    
+    Los materiales se guardan como códigos enteros sobre la lista ordenada
+    `nombres`, así que ordenar por código es ordenar alfabéticamente.
+    """
+    
+    def __init__(self, nombres, codigos, masas, temps_iniciales, temps_finales, Q_total):
+        self.nombres = list(nombres)
+        self.columnas = {
+            'material': np.asarray(codigos, dtype=np.int32),
+            'masa': np.asarray(masas, dtype=float),
+            'temp_inicial': np.asarray(temps_iniciales, dtype=float),
+            'temp_final': np.asarray(temps_finales, dtype=float),
+            'Q_total': np.asarray(Q_total, dtype=float),
+        }
+        self.orden = None  # (columna, descendente)
+        self.vista = np.arange(len(self))
+    
+    def __len__(self):
+        return len(self.columnas['masa'])
+    
+    @classmethod
+    def calcular(cls, calculadora, materiales, masas, temps_iniciales, temps_finales):
+        """
+        Calcula el calor total de cada fila y arma los datos del lote.
+        
+        Args:
+            calculadora (CalculadoraCalor): Calculadora a usar
+            materiales (array_like): Nombre del material de cada fila
+            masas, temps_iniciales, temps_finales (array_like): Datos de cada fila
+        """
+        nombres, codigos = np.unique(np.asarray(materiales), return_inverse=True)
+        return cls.desde_codigos(calculadora, nombres, codigos, masas, temps_iniciales, temps_finales)
+    
+    @classmethod
+    def desde_codigos(cls, calculadora, nombres, codigos, masas, temps_iniciales, temps_finales):
+        """Como calcular, con materiales ya codificados (nombres ordenados)."""
+        codigos = np.asarray(codigos, dtype=np.int32)
+        masas = np.asarray(masas, dtype=float)
+        Ti = np.asarray(temps_iniciales, dtype=float)
+        Tf = np.asarray(temps_finales, dtype=float)
+        Q_total = np.empty(len(codigos))
+        for codigo, nombre in enumerate(nombres):
+            filas = codigos == codigo
+            Q_total[filas], _ = calculadora.calcular_calor_lote(str(nombre), masas[filas], Ti[filas], Tf[filas])
+        return cls(nombres, codigos, masas, Ti, Tf, Q_total)
+    
+    def filtrar(self, material=None, Q_min=None, Q_max=None):
+        """
+        Deja en la vista solo las filas que cumplen el filtro (None = sin límite).
+        
+        Se conserva el orden elegido.
+        """
+        mascara = np.ones(len(self), dtype=bool)
+        if material is not None:
+            codigo = self.nombres.index(material) if material in self.nombres else -1
+            mascara &= self.columnas['material'] == codigo
+        if Q_min is not None:
+            mascara &= self.columnas['Q_total'] >= Q_min
+        if Q_max is not None:
+            mascara &= self.columnas['Q_total'] <= Q_max
+        self.vista = np.flatnonzero(mascara)
+        if self.orden is not None:
+            self.ordenar(*self.orden)
+    
+    def ordenar(self, columna, descendente=False):
+        """Ordena la vista por una columna (orden estable)."""
+        valores = self.columnas[columna][self.vista]
+        # Descendente ordenando los valores negados, para que siga siendo estable
+        orden = np.argsort(-valores if descendente else valores, kind='stable')
+        self.vista = self.vista[orden]
+        self.orden = (columna, descendente)
+    
+    def filas(self, inicio, cantidad):
+        """Valores formateados de las filas [inicio, inicio + cantidad) de la vista."""
+        indices = self.vista[inicio:inicio + cantidad]
+        salida = []
+        for i in indices:
+            fila = []
+            for columna, _, _, formato in COLUMNAS_LOTE:
+                valor = self.columnas[columna][i]
+                if columna == 'material':
+                    valor = self.nombres[valor]
+                fila.append(formato.format(valor))
+            salida.append(fila)
+        return salida
+
+
+def _valores_filas(archivo):
+    """
+    Genera (material, masa, Ti, Tf) de cada fila, con None si falta un campo.
+    
+    Los CSV se leen por posición (las columnas se ubican una vez en el
+    encabezado), varias veces más rápido que con diccionarios por fila.
+    """
+    primera = archivo.readline()
+    if primera.lstrip().startswith('{'):
+        for _, fila in leer_filas(chain([primera], archivo), 'jsonl'):
+            if not isinstance(fila, dict):
+                yield None, None, None, None  # Línea mal formada
+                continue
+            yield tuple(next((fila[a] for a in alias if a in fila), None)
+                        for alias in ALIAS_CAMPOS.values())
+        return
+    
+    encabezado = next(csv.reader([primera]), [])
+    posiciones = [next((encabezado.index(a) for a in alias if a in encabezado), None)
+                  for alias in ALIAS_CAMPOS.values()]
+    if None in posiciones:
+        raise ValueError("faltan columnas: " + ", ".join(
+            campo for campo, p in zip(ALIAS_CAMPOS, posiciones) if p is None))
+    ultima = max(posiciones)
+    for fila in csv.reader(archivo):
+        if len(fila) > ultima:
+            yield tuple(fila[p] for p in posiciones)
+        elif fila:
+            yield None, None, None, None
+
+
+def leer_lote(ruta, constantes, progreso=None):
+    """
+    Lee un archivo de casos (CSV o JSONL, como el modo por lotes) en arreglos.
+    
+    Args:
+        ruta (str): Archivo de entrada
+        constantes (dict): Materiales conocidos
+        progreso (list): Si se pasa, progreso[0] se actualiza con las filas leídas
+    
+    Returns:
+        tuple: (nombres, codigos, masas, Ti, Tf, filas_con_error)
+    """
+    codigos_por_nombre = {}
+    codigos = array('i')
+    masas, Ti, Tf = array('d'), array('d'), array('d')
+    errores = 0
+    
+    with open(ruta, encoding='utf-8', newline='') as archivo:
+        for material, masa, T_inicial, T_final in _valores_filas(archivo):
+            try:
+                if material not in constantes:
+                    raise ValueError(material)
+                datos = float(masa), float(T_inicial), float(T_final)
+            except (ValueError, TypeError):
+                errores += 1
+                continue
+            codigos.append(codigos_por_nombre.setdefault(material, len(codigos_por_nombre)))
+            masas.append(datos[0])
+            Ti.append(datos[1])
+            Tf.append(datos[2])
+            if progreso is not None and len(masas) % 10_000 == 0:
+                progreso[0] = len(masas)
+    
+    # Códigos en orden alfabético de material
+    nombres = sorted(codigos_por_nombre)
+    recodificar = np.empty(max(len(nombres), 1), dtype=np.int32)
+    for nombre, codigo in codigos_por_nombre.items():
+        recodificar[codigo] = nombres.index(nombre)
+    codigos = recodificar[np.frombuffer(codigos, dtype=np.int32)] if len(codigos) else np.empty(0, np.int32)
+    return (nombres, codigos, np.frombuffer(masas), np.frombuffer(Ti),
+            np.frombuffer(Tf), errores)
+
+
+class TablaVirtual:
+    """Treeview que muestra una ventana de filas de un DatosLote."""
+    
+    ALTO_FILA = 20
+    
+    def __init__(self, frame):
+        estilo = ttk.Style(frame)
+        estilo.configure('Lote.Treeview', rowheight=self.ALTO_FILA)
+        
+        self.datos = None
+        self.inicio = 0
+        self.visibles = 1
+        self._items = []
+        
+        self.arbol = ttk.Treeview(frame, columns=[c[0] for c in COLUMNAS_LOTE],
+                                  show='headings', selectmode='browse', style='Lote.Treeview')
+        for columna, encabezado, ancho, _ in COLUMNAS_LOTE:
+            self.arbol.heading(columna, text=encabezado,
+                               command=lambda c=columna: self._ordenar(c))
+            self.arbol.column(columna, width=ancho, anchor='w' if columna == 'material' else 'e')
+        # El desplazamiento lo maneja la tabla, no el Treeview
+        self.barra = ttk.Scrollbar(frame, orient='vertical', command=self._desplazar)
+        self.barra.pack(side='right', fill='y')
+        self.arbol.pack(side='left', fill='both', expand=True)
+        
+        self.arbol.bind('<Configure>', self._redimensionar)
+        self.arbol.bind('<MouseWheel>', self._rueda)
+        self.arbol.bind('<Button-4>', lambda e: self._mover(-3))
+        self.arbol.bind('<Button-5>', lambda e: self._mover(3))
+        self.arbol.bind('<Prior>', lambda e: self._mover(-self.visibles))
+        self.arbol.bind('<Next>', lambda e: self._mover(self.visibles))
+        self.arbol.bind('<Home>', lambda e: self._mover(-len(self._vista())))
+        self.arbol.bind('<End>', lambda e: self._mover(len(self._vista())))
+    
+    def _vista(self):
+        return self.datos.vista if self.datos is not None else ()
+    
+    def mostrar(self, datos):
+        """Muestra otro lote (o el mismo con otra vista) desde el principio."""
+        self.datos = datos
+        self.inicio = 0
+        self.refrescar()
+    
+    def refrescar(self):
+        """Reescribe los ítems visibles a partir de self.inicio."""
+        total = len(self._vista())
+        self.inicio = max(0, min(self.inicio, total - self.visibles))
+        filas = self.datos.filas(self.inicio, self.visibles) if total else []
+        
+        # Se reutilizan los ítems existentes; solo cambia su cantidad al redimensionar
+        while len(self._items) < len(filas):
+            self._items.append(self.arbol.insert('', 'end'))
+        while len(self._items) > len(filas):
+            self.arbol.delete(self._items.pop())
+        for item, valores in zip(self._items, filas):
+            self.arbol.item(item, values=valores)
+        
+        if total:
+            self.barra.set(self.inicio / total, min(1.0, (self.inicio + self.visibles) / total))
+        else:
+            self.barra.set(0, 1)
+    
+    def _redimensionar(self, event):
+        # Alto del encabezado aproximado a una fila
+        visibles = max(1, event.height // self.ALTO_FILA - 1)
+        if visibles != self.visibles:
+            self.visibles = visibles
+            self.refrescar()
+    
+    def _mover(self, filas):
+        self.inicio += filas
+        self.refrescar()
+        return 'break'
+    
+    def _rueda(self, event):
+        return self._mover(-3 if event.delta > 0 else 3)
+    
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == 'moveto':
+            self.inicio = int(float(cantidad) * len(self._vista()))
+            self.refrescar()
+        elif accion == 'scroll':
+            paso = self.visibles if unidad == 'pages' else 1
+            self._mover(int(cantidad) * paso)
+    
+    def _ordenar(self, columna):
+        if self.datos is None:
+            return
+        descendente = self.datos.orden == (columna, False)
+        self.datos.ordenar(columna, descendente)
+        for nombre, encabezado, _, _ in COLUMNAS_LOTE:
+            flecha = (" ▼" if descendente else " ▲") if nombre == columna else ""
+            self.arbol.heading(nombre, text=encabezado + flecha)
+        self.mostrar(self.datos)
+
+
+class VentanaLote:
+    """Ventana para cargar un archivo de casos y explorar sus resultados."""
+    
+    def __init__(self, parent, calculadora):
+        self.parent = parent
+        self.calculadora = calculadora
+        self.datos = None
+        
+        # La lectura y el cálculo corren en un hilo aparte para no congelar la ventana
+        self._trabajador = ThreadPoolExecutor(max_workers=1)
+        self._progreso = [0]
+        
+        self.ventana = tk.Toplevel(parent)
+        self.ventana.title("📋 Resultados por Lote")
+        self.ventana.geometry("800x650")
+        self.ventana.configure(bg='#f0f0f0')
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+        
+        self.material_var = tk.StringVar(value='(todos)')
+        self.Q_min_var = tk.StringVar()
+        self.Q_max_var = tk.StringVar()
+        self.estado_var = tk.StringVar(value="Abre un archivo CSV o JSONL de casos")
+        
+        self.crear_interfaz()
+    
+    def crear_interfaz(self):
+        """Crea la interfaz de la ventana."""
+        frame_datos = ttk.LabelFrame(self.ventana, text="Casos y Filtro", padding=10)
+        frame_datos.pack(fill='x', padx=10, pady=10)
+        
+        self.boton_abrir = ttk.Button(frame_datos, text="Abrir casos…", command=self.abrir)
+        self.boton_abrir.grid(row=0, column=0, sticky='w', pady=3)
+        ttk.Label(frame_datos, textvariable=self.estado_var).grid(row=0, column=1, columnspan=4,
+                                                                 sticky='w', padx=10)
+        
+        ttk.Label(frame_datos, text="Material:").grid(row=1, column=0, sticky='w', pady=3)
+        self.combo_material = ttk.Combobox(frame_datos, textvariable=self.material_var,
+                                           state='readonly', width=25, values=['(todos)'])
+        self.combo_material.grid(row=1, column=1, sticky='w')
+        ttk.Label(frame_datos, text="Q mín/máx (J):").grid(row=1, column=2, sticky='w', padx=(10, 0))
+        ttk.Entry(frame_datos, textvariable=self.Q_min_var, width=12).grid(row=1, column=3, sticky='w')
+        ttk.Entry(frame_datos, textvariable=self.Q_max_var, width=12).grid(row=1, column=4, sticky='w')
+        ttk.Button(frame_datos, text="Filtrar", command=self.filtrar).grid(row=1, column=5, padx=10)
+        
+        frame_tabla = ttk.Frame(self.ventana)
+        frame_tabla.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        self.tabla = TablaVirtual(frame_tabla)
+    
+    def abrir(self):
+        """Lee y calcula un archivo de casos en segundo plano."""
+        ruta = filedialog.askopenfilename(
+            parent=self.ventana,
+            filetypes=[("Casos", "*.csv *.jsonl"), ("Todos los archivos", "*")]
+        )
+        if not ruta:
+            return
+        self.boton_abrir['state'] = 'disabled'
+        self._progreso[0] = 0
+        futuro = self._trabajador.submit(self._cargar, ruta)
+        self.ventana.after(INTERVALO_REVISION_MS, self._revisar, futuro)
+    
+    def _cargar(self, ruta):
+        nombres, codigos, masas, Ti, Tf, errores = leer_lote(
+            ruta, self.calculadora.constantes, self._progreso
+        )
+        datos = DatosLote.desde_codigos(self.calculadora, nombres, codigos, masas, Ti, Tf)
+        return datos, errores
+    
+    def _revisar(self, futuro):
+        if not futuro.done():
+            self.estado_var.set(f"Leyendo… {self._progreso[0]:,} filas")
+            self.ventana.after(INTERVALO_REVISION_MS, self._revisar, futuro)
+            return
+        self.boton_abrir['state'] = 'normal'
+        try:
+            self.datos, errores = futuro.result()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"No se pudo leer el archivo: {e}", parent=self.ventana)
+            return
+        
+        self.combo_material['values'] = ['(todos)'] + self.datos.nombres
+        self.material_var.set('(todos)')
+        self.estado_var.set(f"{len(self.datos):,} filas" +
+                            (f" ({errores:,} con errores omitidas)" if errores else ""))
+        self.tabla.mostrar(self.datos)
+    
+    def filtrar(self):
+        """Aplica el filtro por material y rango de Q."""
+        if self.datos is None:
+            return
+        try:
+            Q_min = float(self.Q_min_var.get()) if self.Q_min_var.get().strip() else None
+            Q_max = float(self.Q_max_var.get()) if self.Q_max_var.get().strip() else None
+        except ValueError:
+            messagebox.showerror("Error", "Por favor ingresa valores numéricos válidos.",
+                                 parent=self.ventana)
+            return
+        material = self.material_var.get()
+        self.datos.filtrar(None if material == '(todos)' else material, Q_min, Q_max)
+        self.estado_var.set(f"{len(self.datos.vista):,} de {len(self.datos):,} filas")
+        self.tabla.mostrar(self.datos)
+    
+    def cerrar(self):
+        self._trabajador.shutdown(wait=False, cancel_futures=True)
+        self.ventana.destroy()
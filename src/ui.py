@@ -5,6 +5,12 @@ Módulo para las pestañas de la interfaz gráfica.
 import tkinter as tk
 from tkinter import ttk
 from constants import FORMULAS_TEXT, CONSTANTES_TEXT
+from entalpia import describir_calor_especifico
+from materiales import buscar_materiales
+
+
+# Máximo de materiales que se cargan en la lista desplegable a la vez
+LIMITE_LISTA_MATERIALES = 200
 
 
 class TabConfigurator:
@@ -20,7 +26,7 @@ class TabConfigurator:
         
         Args:
             tab_calculadora: Widget de la pestaña
-            callbacks: dict con funciones de callback {'calcular': func, 'actualizar': func}
+            callbacks: dict con funciones de callback {'calcular': func, 'actualizar': func, 'despeje': func, 'barrido': func, 'lote': func}
         """
         # Frame principal con dos columnas
         frame_principal = ttk.Frame(tab_calculadora)
@@ -32,12 +38,24 @@ class TabConfigurator:
         
         # Material
         ttk.Label(frame_izq, text="Material:", font=('Arial', 10, 'bold')).grid(row=0, column=0, sticky='w', pady=5)
-        material_var = tk.StringVar(value='Agua (H₂O)')
+        materiales_iniciales = buscar_materiales(self.constantes_materiales, '', LIMITE_LISTA_MATERIALES)
+        material_var = tk.StringVar(value='Agua (H₂O)' if 'Agua (H₂O)' in self.constantes_materiales
+                                    else next(iter(materiales_iniciales), ''))
+        # Editable: lo escrito filtra la lista, para catálogos con miles de materiales
         combo_material = ttk.Combobox(frame_izq, textvariable=material_var, 
-                                       values=list(self.constantes_materiales.keys()), 
-                                       state='readonly', width=25)
+                                       values=materiales_iniciales, width=25)
         combo_material.grid(row=0, column=1, pady=5)
         combo_material.bind('<<ComboboxSelected>>', callbacks['actualizar'])
+        combo_material.bind('<Return>', callbacks['actualizar'])
+        
+        def filtrar_materiales(event):
+            if event.keysym in ('Return', 'Up', 'Down', 'Escape', 'Tab'):
+                return
+            combo_material['values'] = buscar_materiales(
+                self.constantes_materiales, material_var.get(), LIMITE_LISTA_MATERIALES
+            )
+        
+        combo_material.bind('<KeyRelease>', filtrar_materiales)
         
         # Masa
         ttk.Label(frame_izq, text="Masa (kg):", font=('Arial', 10, 'bold')).grid(row=1, column=0, sticky='w', pady=5)
@@ -61,6 +79,17 @@ class TabConfigurator:
         ttk.Button(frame_izq, text="📐 Despejar Variable", 
                   command=callbacks['despeje']).grid(row=5, column=0, columnspan=2, pady=5, sticky='ew')
         
+        ttk.Button(frame_izq, text="🗺️ Barrido de Parámetros", 
+                  command=callbacks['barrido']).grid(row=6, column=0, columnspan=2, pady=5, sticky='ew')
+        
+        ttk.Button(frame_izq, text="📋 Resultados por Lote", 
+                  command=callbacks['lote']).grid(row=7, column=0, columnspan=2, pady=5, sticky='ew')
+        
+        # Recalcular automáticamente al editar los datos
+        en_vivo_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(frame_izq, text="Recalcular al editar", 
+                        variable=en_vivo_var).grid(row=8, column=0, columnspan=2, pady=5, sticky='w')
+        
         # Frame derecho - Constantes
         frame_der = ttk.LabelFrame(frame_principal, text="📈 Constantes del Material", padding=20)
         frame_der.grid(row=0, column=1, padx=10, pady=10, sticky='nsew')
@@ -89,6 +118,7 @@ class TabConfigurator:
             'masa_var': masa_var,
             'temp_inicial_var': temp_inicial_var,
             'temp_final_var': temp_final_var,
+            'en_vivo_var': en_vivo_var,
             'text_constantes': text_constantes,
             'text_resultados': text_resultados,
             'frame_grafico': frame_grafico
@@ -150,11 +180,11 @@ class TabConfigurator:
         texto += f"{'='*50}\n\n"
         
         if 'c_solido' in const_mat:
-            texto += f"Calor específico (sólido)  : {const_mat['c_solido']} J/(kg·°C)\n"
+            texto += f"Calor específico (sólido)  : {describir_calor_especifico(const_mat['c_solido'])}\n"
         if 'c_liquido' in const_mat:
-            texto += f"Calor específico (líquido) : {const_mat['c_liquido']} J/(kg·°C)\n"
+            texto += f"Calor específico (líquido) : {describir_calor_especifico(const_mat['c_liquido'])}\n"
         if 'c_gas' in const_mat:
-            texto += f"Calor específico (gas)     : {const_mat['c_gas']} J/(kg·°C)\n"
+            texto += f"Calor específico (gas)     : {describir_calor_especifico(const_mat['c_gas'])}\n"
         if 'Lf' in const_mat:
             texto += f"\nCalor latente de fusión    : {const_mat['Lf']} J/kg\n"
         if 'Lv' in const_mat:
@@ -0,0 +1,80 @@
+"""
+Balance de energía de BarraConduccion con pasos de tiempo grandes.
+
+Uso:
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from conduccion import BarraConduccion  # noqa: E402
+from constants import CONSTANTES_MATERIALES  # noqa: E402
+from entalpia import TablaEntalpia  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def agua():
+    return TablaEntalpia(CONSTANTES_MATERIALES['Agua (H₂O)'])
+
+
+@pytest.mark.parametrize('dt', [100, 3600])
+def test_flujo_entra_entero(agua, dt):
+    # El frente de fusión cruza cientos de nodos en cada paso
+    q = 5000
+    barra = BarraConduccion(agua, 0.1, 1000, 917, 2.2, -10, borde_izquierdo=('flujo', q))
+    E0 = barra.energia()
+    for _ in range(20):
+        barra.paso(dt)
+
+    aporte = q * dt * 20
+    assert barra.energia() - E0 == pytest.approx(aporte, rel=1e-9)
+
+
+def test_temperatura_fija_balance(agua):
+    # Lo que entra por el borde caliente es k·(T_borde - T[0]) / (dx/2) en
+    # cada paso implícito
+    barra = BarraConduccion(agua, 0.05, 20000, 917, 2.2, -10,
+                            borde_izquierdo=('temperatura', 120))
+    E0 = barra.energia()
+    dt = 5
+    aporte = 0.0
+    for _ in range(5):
+        barra.paso(dt)
+        aporte += barra.conductividad * (120 - barra.temperaturas()[0]) / (barra.dx / 2) * dt
+
+    assert barra.energia() - E0 == pytest.approx(aporte, rel=1e-6)
+    assert barra.frentes()['fusion'].size > 0
+
+
+def test_paso_grande_coincide_con_pasos_chicos(agua):
+    frentes = {}
+    aportes = {}
+    for dt, pasos in ((10, 360), (1800, 2), (3600, 1)):
+        barra = BarraConduccion(agua, 0.1, 200, 917, 2.2, -10,
+                                borde_izquierdo=('temperatura', 40))
+        E0 = barra.energia()
+        for _ in range(pasos):
+            barra.paso(dt)
+        frentes[dt] = barra.frentes()['fusion']
+        aportes[dt] = barra.energia() - E0
+
+    # Solo difieren por el error de Euler implícito: el frente de fusión
+    # queda a menos de medio volumen y a la energía que entró le falta una
+    # parte proporcional a dt (primer orden: con la mitad de dt, la mitad)
+    assert frentes[3600] == pytest.approx(frentes[10], abs=barra.dx / 2)
+    faltante_grande = aportes[10] - aportes[3600]
+    faltante_medio = aportes[10] - aportes[1800]
+    assert 0 < faltante_grande < 0.1 * aportes[10]
+    assert faltante_grande == pytest.approx(2 * faltante_medio, rel=0.1)
+
+
+def test_sin_converger_avisa(agua):
+    barra = BarraConduccion(agua, 0.1, 1000, 917, 2.2, -10, borde_izquierdo=('flujo', 5000))
+    with pytest.raises(RuntimeError):
+        barra.paso(3600, max_iteraciones=1)